@@ -2,12 +2,21 @@
 
 This API is used to make and manage reservations."""
 
-from typing import Sequence
-from fastapi import APIRouter, Depends
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException
 from ..authentication import registered_user
-from ...services.coworking.reservation import ReservationService
+from ...services.coworking.reservation import (
+    AMBASSADOR_PAGE_SIZE,
+    ReservationService,
+)
 from ...models import User
-from ...models.coworking import Reservation, ReservationPartial
+from ...models.coworking import (
+    Reservation,
+    ReservationPage,
+    ReservationPartial,
+    CacheStats,
+    TimeRange,
+)
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -19,13 +28,26 @@ api = APIRouter(prefix="/api/coworking/ambassador")
 
 @api.get("", tags=["Coworking"])
 def active_and_upcoming_reservations(
+    start: str | None = None,
+    end: str | None = None,
+    cursor: str | None = None,
+    limit: int = AMBASSADOR_PAGE_SIZE,
     subject: User = Depends(registered_user),
     reservation_svc: ReservationService = Depends(),
-) -> Sequence[Reservation]:
-    """List active and upcoming reservations.
+) -> ReservationPage:
+    """List a page of active and upcoming reservations.
 
-    This list drives the ambassador's checkin UI."""
-    return reservation_svc.list_all_active_and_upcoming(subject)
+    The window defaults to the next hour. Later pages of the same window are requested with
+    the `next_cursor` of the page before. This list drives the ambassador's checkin UI.
+    """
+    try:
+        window_start = TimeRange.remove_timezone(start) if start else datetime.now()
+        window = TimeRange(
+            start=window_start, end=end or window_start + timedelta(hours=1)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return reservation_svc.list_active_and_upcoming_page(subject, window, cursor, limit)
 
 
 @api.put("/checkin", tags=["Coworking"])
@@ -36,3 +58,14 @@ def checkin_reservation(
 ) -> Reservation:
     """CheckIn a confirmed reservation."""
     return reservation_svc.staff_checkin_reservation(subject, reservation)
+
+
+@api.get("/cache", tags=["Coworking"])
+def seat_availability_cache_stats(
+    subject: User = Depends(registered_user),
+    reservation_svc: ReservationService = Depends(),
+) -> CacheStats:
+    """Hit and miss counters of this process' seat availability cache.
+
+    Used to confirm the cache absorbs the polling load of the status endpoint."""
+    return reservation_svc.seat_availability_cache_stats(subject)
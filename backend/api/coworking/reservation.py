@@ -2,15 +2,29 @@
 
 This API is used to make and manage reservations."""
 
+from datetime import datetime, timedelta
+from typing import Sequence
 from fastapi import APIRouter, Depends, HTTPException
 from ..authentication import registered_user
 from ...services.coworking.reservation import ReservationService
+from ...services.coworking.reservation_archive import (
+    HISTORY_PAGE_SIZE,
+    ReservationArchiveService,
+)
 from ...models import User
+from ...models.user import UserIdentity
 from ...models.coworking import (
     Reservation,
+    ReservationDetails,
+    ReservationDraftResult,
     ReservationRequest,
     ReservationPartial,
     ReservationState,
+    RoomAvailability,
+    SeatAvailability,
+    SeatAvailabilityGrid,
+    SeatSearch,
+    TimeRange,
 )
 
 __authors__ = ["Kris Jordan"]
@@ -35,12 +49,50 @@ def draft_reservation(
     return reservation_svc.draft_reservation(subject, reservation_request)
 
 
+@api.post("/reservation/batch", tags=["Coworking"])
+def draft_reservations(
+    reservation_requests: list[ReservationRequest],
+    subject: User = Depends(registered_user),
+    reservation_svc: ReservationService = Depends(),
+) -> list[ReservationDraftResult]:
+    """Draft a batch of reservation requests, such as for a group being seated together.
+
+    Each request may seat a party of several users together, as a single draft does.
+    Requests that cannot be satisfied are reported in their results without affecting the
+    others."""
+    return reservation_svc.draft_reservations(subject, reservation_requests)
+
+
+@api.get("/reservation/history", tags=["Coworking"])
+def reservation_history(
+    start: str | None = None,
+    end: str | None = None,
+    user_id: int | None = None,
+    limit: int = HISTORY_PAGE_SIZE,
+    subject: User = Depends(registered_user),
+    archive_svc: ReservationArchiveService = Depends(),
+) -> Sequence[Reservation]:
+    """List a user's reservations, most recent first, including archived reservations.
+
+    The window defaults to the 90 days before end, which defaults to now. The subject's own
+    history is listed unless another user_id is given."""
+    try:
+        window_end = TimeRange.remove_timezone(end) if end else datetime.now()
+        window = TimeRange(
+            start=start or window_end - timedelta(days=90), end=window_end
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    focus = UserIdentity(id=user_id if user_id is not None else subject.id)
+    return archive_svc.history(subject, focus, window, limit)
+
+
 @api.get("/reservation/{id}", tags=["Coworking"])
 def get_reservation(
     id: int,
     subject: User = Depends(registered_user),
     reservation_svc: ReservationService = Depends(),
-) -> Reservation:
+) -> ReservationDetails:
     return reservation_svc.get_reservation(subject, id)
 
 
@@ -64,3 +116,72 @@ def cancel_reservation(
     return reservation_svc.change_reservation(
         subject, ReservationPartial(id=id, state=ReservationState.CANCELLED)
     )
+
+
+@api.get("/availability/seats", tags=["Coworking"])
+def search_seat_availability(
+    start: str,
+    end: str,
+    has_monitor: bool | None = None,
+    sit_stand: bool | None = None,
+    reservable: bool | None = None,
+    room: str | None = None,
+    limit: int | None = None,
+    subject: User = Depends(registered_user),
+    reservation_svc: ReservationService = Depends(),
+) -> Sequence[SeatAvailability]:
+    """Search for the best available seats with the given features."""
+    try:
+        bounds = TimeRange(start=start, end=end)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    criteria = SeatSearch(
+        has_monitor=has_monitor,
+        sit_stand=sit_stand,
+        reservable=reservable,
+        room_id=room,
+    )
+    return reservation_svc.search_seat_availability(criteria, bounds, limit)
+
+
+@api.get("/availability/rooms", tags=["Coworking"])
+def room_availability(
+    start: str,
+    end: str,
+    subject: User = Depends(registered_user),
+    reservation_svc: ReservationService = Depends(),
+) -> Sequence[RoomAvailability]:
+    """Availability of every reservable room."""
+    try:
+        bounds = TimeRange(start=start, end=end)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return reservation_svc.room_availability(bounds)
+
+
+@api.get("/availability/grid", tags=["Coworking"])
+def seat_availability_grid(
+    start: str,
+    end: str,
+    slot_minutes: int = 15,
+    has_monitor: bool | None = None,
+    sit_stand: bool | None = None,
+    reservable: bool | None = None,
+    room: str | None = None,
+    subject: User = Depends(registered_user),
+    reservation_svc: ReservationService = Depends(),
+) -> SeatAvailabilityGrid:
+    """Availability of seats with the given features as compact bitsets of time slots."""
+    try:
+        bounds = TimeRange(start=start, end=end)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    criteria = SeatSearch(
+        has_monitor=has_monitor,
+        sit_stand=sit_stand,
+        reservable=reservable,
+        room_id=room,
+    )
+    return reservation_svc.seat_availability_grid(
+        criteria, bounds, timedelta(minutes=slot_minutes)
+    )
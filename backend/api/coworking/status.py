@@ -2,11 +2,22 @@
 
 This API is used to retrieve and update a user's profile."""
 
-from fastapi import APIRouter, Depends
+import asyncio
+from typing import AsyncIterator
+from fastapi import APIRouter, Depends, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 from ..authentication import registered_user
+from ...database import db_session
 from ...services.coworking import StatusService
+from ...services.coworking.availability_publisher import (
+    SeatAvailabilityPublisher,
+    Subscription,
+    seat_availability_publisher,
+)
 from ...models import User
-from ...models.coworking import Status
+from ...models.coworking import Status, SeatAvailabilityDelta
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -14,20 +25,101 @@ __license__ = "MIT"
 
 
 api = APIRouter(prefix="/api/coworking/status")
+
+STREAM_KEEPALIVE_SECONDS = 15.0
+"""Longest time the availability stream goes without sending, so proxies keep it open."""
 openapi_tags = {
     "name": "Coworking",
     "description": "The XL's coworking facilities are reserved and managed via these endpoints.",
 }
 
 
-@api.get("", response_model=Status, tags=["Coworking"])
+@api.get(
+    "",
+    response_model=Status,
+    tags=["Coworking"],
+    responses={304: {"description": "The status is unchanged since the given ETag."}},
+)
 def get_coworking_status(
-    subject: User = Depends(registered_user), status_svc: StatusService = Depends()
+    response: Response,
+    subject: User = Depends(registered_user),
+    status_svc: StatusService = Depends(),
+    if_none_match: str | None = Header(default=None),
 ):
     """Status endpoint supports the primary screen of the coworking features.
 
     It returns information about upcoming, active reservations the subject holds.
     It also fetches the current seat availability of the XL during operating hours.
     Finally, it provides a list of upcoming hours.
+
+    Responses carry an ETag. Pollers sending it back in If-None-Match receive an empty 304
+    response until the status changes.
     """
+    etag = status_svc.etag(subject)
+    if if_none_match is not None and (
+        etag in (tag.strip() for tag in if_none_match.split(","))
+        or if_none_match == "*"
+    ):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     return status_svc.get_coworking_status(subject)
+
+
+@api.get(
+    "/stream",
+    tags=["Coworking"],
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_seat_availability(
+    request: Request,
+    subject: User = Depends(registered_user),
+    status_svc: StatusService = Depends(),
+    publisher: SeatAvailabilityPublisher = Depends(seat_availability_publisher),
+    session: Session = Depends(db_session),
+):
+    """Server-sent event stream of walk-in seat availability.
+
+    The first `availability` event is a snapshot of every available seat. Each subsequent
+    event carries only the seats whose availability changed, as reservations are made,
+    changed or expire. Clients should replace all state upon any event whose `snapshot` is
+    true, which is also sent when a client falls too far behind.
+    """
+    # Resolving the subject's policies may query the request's session, so it is done before
+    # the session's connection is returned to the pool rather than held for the lifetime of
+    # the stream.
+    search_duration = await run_in_threadpool(
+        status_svc.walkin_search_duration, subject
+    )
+    session.close()
+    subscription, snapshot = await run_in_threadpool(
+        publisher.subscribe,
+        search_duration,
+        asyncio.get_running_loop(),
+    )
+    return StreamingResponse(
+        _availability_events(request, publisher, subscription, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _availability_events(
+    request: Request,
+    publisher: SeatAvailabilityPublisher,
+    subscription: Subscription,
+    snapshot: SeatAvailabilityDelta,
+) -> AsyncIterator[str]:
+    try:
+        yield _event(snapshot)
+        while not await request.is_disconnected():
+            delta = await subscription.next(STREAM_KEEPALIVE_SECONDS)
+            yield ": keep-alive\n\n" if delta is None else _event(delta)
+    finally:
+        publisher.unsubscribe(subscription)
+
+
+def _event(delta: SeatAvailabilityDelta) -> str:
+    return (
+        f"id: {delta.version}\nevent: availability\ndata: {delta.model_dump_json()}\n\n"
+    )
@@ -0,0 +1,33 @@
+"""Coworking Utilization API
+
+This API is used by administrators to analyze how full coworking rooms are over time."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from ..authentication import registered_user
+from ...services.coworking.utilization import UtilizationService
+from ...models import User
+from ...models.coworking import TimeRange, UtilizationHour
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+api = APIRouter(prefix="/api/coworking/utilization")
+
+
+@api.get("", tags=["Coworking"])
+def hourly_utilization(
+    start: str,
+    end: str,
+    room_id: str | None = None,
+    subject: User = Depends(registered_user),
+    utilization_svc: UtilizationService = Depends(),
+) -> list[UtilizationHour]:
+    """Seat-minutes reserved, checked in and no-show of each room in each hour between start
+    and end, read from the hourly utilization rollup."""
+    try:
+        window = TimeRange(start=start, end=end)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return utilization_svc.hourly(subject, window, room_id)
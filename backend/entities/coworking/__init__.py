@@ -3,3 +3,6 @@ from .room_entity import RoomEntity
 from .seat_entity import SeatEntity
 from .reservation_entity import ReservationEntity
 from .reservation_seat_table import reservation_seat_table
+from .reservation_archive_entity import ReservationArchiveEntity
+from .utilization_entity import UtilizationHourEntity
+from .role_policy_entity import RolePolicyEntity
@@ -0,0 +1,47 @@
+"""Entity for archived Reservations.
+
+Reservations in terminal states are moved out of `coworking__reservation` once they are old
+enough that only history views read them. The archive is partitioned by month of start, and
+partitions are created as reservations are archived into them, so old semesters can be
+detached or dropped without touching the rest. Users and seats are denormalized into arrays
+rather than join tables since archived reservations never change.
+"""
+
+from datetime import datetime
+from sqlalchemy import Boolean, DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+from ..entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class ReservationArchiveEntity(EntityBase):
+    """Entity for a Reservation archived in a terminal state."""
+
+    __tablename__ = "coworking__reservation_archive"
+    __table_args__ = (
+        Index(
+            "coworking__reservation_archive_user_ids_idx",
+            "user_ids",
+            postgresql_using="gin",
+        ),
+        {"postgresql_partition_by": "RANGE (start)"},
+    )
+
+    # The partition key is required to be part of the primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    end: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    state: Mapped[str] = mapped_column(String, nullable=False)
+    walkin: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    room_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    user_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    seat_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False
+    )
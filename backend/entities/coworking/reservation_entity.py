@@ -1,16 +1,19 @@
 """Entity for Reservations."""
 
 from datetime import datetime
-from sqlalchemy import Integer, String, Boolean, ForeignKey, DateTime, Index
-from sqlalchemy.orm import Mapped, mapped_column, relationship, Session
+from sqlalchemy import Integer, String, Boolean, ForeignKey, DateTime, Index, Computed
+from sqlalchemy.dialects.postgresql import TSRANGE, Range
+from sqlalchemy.orm import Mapped, mapped_column, relationship, Session, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 from ..entity_base import EntityBase
-from ...models.coworking import Reservation, ReservationState
+from ...models import User
+from ...models.coworking import Reservation, ReservationState, Room, SeatDetails
 from .room_entity import RoomEntity
 from .seat_entity import SeatEntity
 from ..user_entity import UserEntity
 from .reservation_user_table import reservation_user_table
 from .reservation_seat_table import reservation_seat_table
-from typing import Self
+from typing import Self, Sequence
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -21,12 +24,18 @@ class ReservationEntity(EntityBase):
     __tablename__ = "coworking__reservation"
     __table_args__ = (
         Index("coworking__reservation_time_idx", "start", "end", "state", unique=False),
+        Index("coworking__reservation_period_idx", "period", postgresql_using="gist"),
     )
 
     # Reservation Model Fields
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     start: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     end: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # Half-open [start, end) range maintained by the database for GiST-indexed overlap
+    # queries. A reservation checked out before its start is an empty range.
+    period: Mapped[Range[datetime]] = mapped_column(
+        TSRANGE, Computed("""tsrange(start, greatest(start, "end"), '[)')""")
+    )
     state: Mapped[ReservationState] = mapped_column(String, nullable=False)
     walkin: Mapped[bool] = mapped_column(Boolean, nullable=False)
     room_id: Mapped[str] = mapped_column(
@@ -62,6 +71,75 @@ class ReservationEntity(EntityBase):
             updated_at=self.updated_at,
         )
 
+    @staticmethod
+    def bulk_load_options() -> list[LoaderOption]:
+        """Loader options fetching everything `to_models` needs in a fixed number of queries.
+
+        Returns:
+            list[LoaderOption]: Options to pass to `Query#options`."""
+        return [
+            selectinload(ReservationEntity.users),
+            selectinload(ReservationEntity.seats).selectinload(SeatEntity.room),
+            selectinload(ReservationEntity.room),
+        ]
+
+    @staticmethod
+    def to_models(entities: Sequence["ReservationEntity"]) -> list[Reservation]:
+        """Converts entities to models in one pass, sharing a single model per user, seat and
+        room across all reservations.
+
+        Entities should be loaded with `bulk_load_options` to avoid lazy loads.
+
+        Args:
+            entities (Sequence[ReservationEntity]): The entities to convert.
+
+        Returns:
+            list[Reservation]: The model representations of the entities, in order."""
+        users: dict[int, User] = {}
+        rooms: dict[str, Room] = {}
+        seats: dict[int, SeatDetails] = {}
+
+        def room_model(room: RoomEntity) -> Room:
+            if room.id not in rooms:
+                rooms[room.id] = room.to_model()
+            return rooms[room.id]
+
+        def seat_model(seat: SeatEntity) -> SeatDetails:
+            if seat.id not in seats:
+                seats[seat.id] = SeatDetails.model_construct(
+                    id=seat.id,
+                    title=seat.title,
+                    shorthand=seat.shorthand,
+                    reservable=seat.reservable,
+                    has_monitor=seat.has_monitor,
+                    sit_stand=seat.sit_stand,
+                    x=seat.x,
+                    y=seat.y,
+                    room=room_model(seat.room),
+                )
+            return seats[seat.id]
+
+        def user_model(user: UserEntity) -> User:
+            if user.id not in users:
+                users[user.id] = user.to_model()
+            return users[user.id]
+
+        return [
+            Reservation.model_construct(
+                id=entity.id,
+                start=entity.start,
+                end=entity.end,
+                state=ReservationState(entity.state),
+                users=[user_model(user) for user in entity.users],
+                seats=[seat_model(seat) for seat in entity.seats],
+                walkin=entity.walkin,
+                room=room_model(entity.room) if entity.room else None,
+                created_at=entity.created_at,
+                updated_at=entity.updated_at,
+            )
+            for entity in entities
+        ]
+
     @classmethod
     def from_model(cls, model: Reservation, session: Session | None = None) -> Self:
         """Create an ReservationEntity from a Reservation model.
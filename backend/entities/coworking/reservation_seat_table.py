@@ -1,15 +1,87 @@
-"""Join table between Reservation and Seat entities."""
+"""Join table between Reservation and Seat entities.
 
-from sqlalchemy import Table, Column, ForeignKey
+Each row carries a copy of its reservation's period and whether the reservation is active, kept
+current by triggers, so that the database itself prevents a seat from being double booked. The
+exclusion constraint rejects two active reservations of the same seat whose periods overlap.
+The int4range wrapping the seat ID lets a plain GiST index compare seats for equality without
+the btree_gist extension.
+"""
+
+from sqlalchemy import DDL, Boolean, Table, Column, ForeignKey, event, func, text
+from sqlalchemy.dialects.postgresql import TSRANGE, ExcludeConstraint
 from ..entity_base import EntityBase
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+ACTIVE_STATES_SQL = "('DRAFT', 'CONFIRMED', 'CHECKED_IN')"
+"""States of reservations that hold their seats, as a SQL list."""
+
 reservation_seat_table = Table(
     "coworking__reservation_seat",
     EntityBase.metadata,
     Column("reservation_id", ForeignKey("coworking__reservation.id"), primary_key=True),
     Column("seat_id", ForeignKey("coworking__seat.id"), primary_key=True),
+    # Maintained by the coworking__reservation_seat_sync trigger
+    Column("period", TSRANGE, nullable=False),
+    Column("active", Boolean, nullable=False),
+    ExcludeConstraint(
+        (func.int4range(text("seat_id"), text("seat_id"), text("'[]'")), "="),
+        ("period", "&&"),
+        name="coworking__reservation_seat_no_overlap",
+        using="gist",
+        where=text("active"),
+    ),
+)
+
+_sync_seat_function = DDL(
+    f"""
+CREATE OR REPLACE FUNCTION coworking__reservation_seat_sync() RETURNS trigger AS $$
+BEGIN
+    SELECT period, state IN {ACTIVE_STATES_SQL}
+    INTO NEW.period, NEW.active
+    FROM coworking__reservation
+    WHERE id = NEW.reservation_id;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+)
+
+_sync_seat_trigger = DDL(
+    """
+CREATE TRIGGER coworking__reservation_seat_sync
+BEFORE INSERT OR UPDATE ON coworking__reservation_seat
+FOR EACH ROW EXECUTE FUNCTION coworking__reservation_seat_sync()
+"""
 )
+
+_sync_reservation_function = DDL(
+    f"""
+CREATE OR REPLACE FUNCTION coworking__reservation_sync_seats() RETURNS trigger AS $$
+BEGIN
+    UPDATE coworking__reservation_seat
+    SET period = NEW.period, active = NEW.state IN {ACTIVE_STATES_SQL}
+    WHERE reservation_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+)
+
+_sync_reservation_trigger = DDL(
+    """
+CREATE TRIGGER coworking__reservation_sync_seats
+AFTER UPDATE OF start, "end", state ON coworking__reservation
+FOR EACH ROW EXECUTE FUNCTION coworking__reservation_sync_seats()
+"""
+)
+
+for ddl in (
+    _sync_seat_function,
+    _sync_seat_trigger,
+    _sync_reservation_function,
+    _sync_reservation_trigger,
+):
+    event.listen(reservation_seat_table, "after_create", ddl)
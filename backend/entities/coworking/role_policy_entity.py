@@ -0,0 +1,42 @@
+"""Entity for the coworking policies granted to the members of a role."""
+
+from datetime import timedelta
+from sqlalchemy import ForeignKey, Integer, Interval
+from sqlalchemy.orm import Mapped, mapped_column
+from ..entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class RolePolicyEntity(EntityBase):
+    """Coworking policies of the members of a role, such as ambassadors or LAs, that differ
+    from the defaults. A null column leaves the default policy in place."""
+
+    __tablename__ = "coworking__role_policy"
+
+    role_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("role.id", ondelete="CASCADE"), primary_key=True
+    )
+    walkin_window: Mapped[timedelta | None] = mapped_column(Interval, nullable=True)
+    walkin_initial_duration: Mapped[timedelta | None] = mapped_column(
+        Interval, nullable=True
+    )
+    reservation_window: Mapped[timedelta | None] = mapped_column(
+        Interval, nullable=True
+    )
+    maximum_party_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    maximum_initial_reservation_duration: Mapped[timedelta | None] = mapped_column(
+        Interval, nullable=True
+    )
+    extend_window: Mapped[timedelta | None] = mapped_column(Interval, nullable=True)
+    extend_duration: Mapped[timedelta | None] = mapped_column(Interval, nullable=True)
+
+    def overrides(self) -> dict[str, timedelta | int]:
+        """The policies of the role that differ from the defaults, by name."""
+        return {
+            column.key: getattr(self, column.key)
+            for column in self.__table__.columns
+            if column.key != "role_id" and getattr(self, column.key) is not None
+        }
@@ -0,0 +1,48 @@
+"""Entity for the hourly utilization rollup of coworking rooms."""
+
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+from ..entity_base import EntityBase
+from ...models.coworking import UtilizationHour
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class UtilizationHourEntity(EntityBase):
+    """Seat-seconds of reservations per room per hour, maintained incrementally as
+    reservations change state so that utilization is read without scanning reservations.
+
+    Seconds rather than minutes are summed so increments and decrements of the same
+    reservation cancel exactly."""
+
+    __tablename__ = "coworking__utilization_hour"
+
+    room_id: Mapped[str] = mapped_column(
+        String, ForeignKey("coworking__room.id"), primary_key=True
+    )
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True, index=True)
+    reserved_seat_seconds: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+    checked_in_seat_seconds: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+    no_show_seat_seconds: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+
+    def to_model(self) -> UtilizationHour:
+        """Converts the entity to a model.
+
+        Returns:
+            UtilizationHour: The model representation of the entity."""
+        return UtilizationHour(
+            room_id=self.room_id,
+            hour=self.hour,
+            reserved_seat_minutes=self.reserved_seat_seconds / 60,
+            checked_in_seat_minutes=self.checked_in_seat_seconds / 60,
+            no_show_seat_minutes=self.no_show_seat_seconds / 60,
+        )
@@ -1,6 +1,7 @@
 """Entrypoint of backend API exposing the FastAPI `app` to be served by an application server such as uvicorn."""
 
 
+from datetime import datetime
 from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
@@ -14,10 +15,15 @@ from .api import (
     user,
 )
 from .api.equipment import checkout
-from .api.coworking import status, reservation, ambassador
+from .api.coworking import status, reservation, ambassador, utilization
 from .api.admin import users as admin_users
 from .api.admin import roles as admin_roles
 from .services.exceptions import UserPermissionException, ResourceNotFoundException
+from .services.coworking.expiry_sweeper import ReservationExpirySweeper
+from .services.coworking.availability_publisher import seat_availability_publisher
+from .services.coworking.operating_hours_index import operating_hours_index
+from .database import engine
+from sqlalchemy.orm import Session
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -56,6 +62,7 @@ feature_apis = [
     organizations,
     health,
     ambassador,
+    utilization,
     authentication,
     admin_users,
     admin_roles,
@@ -65,6 +72,24 @@ feature_apis = [
 for feature_api in feature_apis:
     app.include_router(feature_api.api)
 
+
+# Load upcoming operating hours into memory before serving requests
+def _load_operating_hours_index():
+    with Session(engine) as session:
+        operating_hours_index().load(session, datetime.now())
+
+
+app.add_event_handler("startup", _load_operating_hours_index)
+
+# Expire reservations in the background rather than on read requests
+reservation_expiry_sweeper = ReservationExpirySweeper(lambda: Session(engine))
+app.add_event_handler("startup", reservation_expiry_sweeper.start)
+app.add_event_handler("shutdown", reservation_expiry_sweeper.stop)
+
+# Publish seat availability changes to subscribers of the availability stream
+app.add_event_handler("startup", seat_availability_publisher().start)
+app.add_event_handler("shutdown", seat_availability_publisher().stop)
+
 # Static file mount used for serving Angular front-end in production, as well as static assets
 app.mount("/", static_files.StaticFileMiddleware(directory="./static"))
 
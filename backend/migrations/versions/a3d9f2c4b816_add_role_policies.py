@@ -0,0 +1,35 @@
+"""Add coworking policies per role
+
+Revision ID: a3d9f2c4b816
+Revises: e8c2a5f1b934
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "a3d9f2c4b816"
+down_revision = "e8c2a5f1b934"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coworking__role_policy",
+        sa.Column("role_id", sa.Integer(), nullable=False),
+        sa.Column("walkin_window", sa.Interval(), nullable=True),
+        sa.Column("walkin_initial_duration", sa.Interval(), nullable=True),
+        sa.Column("reservation_window", sa.Interval(), nullable=True),
+        sa.Column("maximum_party_size", sa.Integer(), nullable=True),
+        sa.Column("maximum_initial_reservation_duration", sa.Interval(), nullable=True),
+        sa.Column("extend_window", sa.Interval(), nullable=True),
+        sa.Column("extend_duration", sa.Interval(), nullable=True),
+        sa.ForeignKeyConstraint(["role_id"], ["role.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("role_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("coworking__role_policy")
@@ -0,0 +1,144 @@
+"""Add reservation periods and seat double booking constraint
+
+Revision ID: b7e3a9c1d205
+Revises: 63fc48273e15
+Create Date: 2026-10-18 13:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = "b7e3a9c1d205"
+down_revision = "63fc48273e15"
+branch_labels = None
+depends_on = None
+
+ACTIVE_STATES_SQL = "('DRAFT', 'CONFIRMED', 'CHECKED_IN')"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "coworking__reservation",
+        sa.Column(
+            "period",
+            postgresql.TSRANGE(),
+            sa.Computed("""tsrange(start, greatest(start, "end"), '[)')"""),
+        ),
+    )
+    op.create_index(
+        "coworking__reservation_period_idx",
+        "coworking__reservation",
+        ["period"],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+    op.add_column(
+        "coworking__reservation_seat",
+        sa.Column("period", postgresql.TSRANGE(), nullable=True),
+    )
+    op.add_column(
+        "coworking__reservation_seat",
+        sa.Column("active", sa.Boolean(), nullable=True),
+    )
+    # Reservations already over may not have been swept into their final states, and are
+    # free to overlap since they can no longer conflict with new reservations.
+    op.execute(
+        text(
+            f"""
+            UPDATE coworking__reservation_seat
+            SET period = reservation.period,
+                active = reservation.state IN {ACTIVE_STATES_SQL}
+                         AND reservation."end" > localtimestamp
+            FROM coworking__reservation AS reservation
+            WHERE reservation.id = coworking__reservation_seat.reservation_id
+            """
+        )
+    )
+    op.alter_column("coworking__reservation_seat", "period", nullable=False)
+    op.alter_column("coworking__reservation_seat", "active", nullable=False)
+
+    op.execute(
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION coworking__reservation_seat_sync() RETURNS trigger AS $$
+            BEGIN
+                SELECT period, state IN {ACTIVE_STATES_SQL}
+                INTO NEW.period, NEW.active
+                FROM coworking__reservation
+                WHERE id = NEW.reservation_id;
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE TRIGGER coworking__reservation_seat_sync
+            BEFORE INSERT OR UPDATE ON coworking__reservation_seat
+            FOR EACH ROW EXECUTE FUNCTION coworking__reservation_seat_sync()
+            """
+        )
+    )
+    op.execute(
+        text(
+            f"""
+            CREATE OR REPLACE FUNCTION coworking__reservation_sync_seats() RETURNS trigger AS $$
+            BEGIN
+                UPDATE coworking__reservation_seat
+                SET period = NEW.period, active = NEW.state IN {ACTIVE_STATES_SQL}
+                WHERE reservation_id = NEW.id;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+    )
+    op.execute(
+        text(
+            """
+            CREATE TRIGGER coworking__reservation_sync_seats
+            AFTER UPDATE OF start, "end", state ON coworking__reservation
+            FOR EACH ROW EXECUTE FUNCTION coworking__reservation_sync_seats()
+            """
+        )
+    )
+
+    op.execute(
+        text(
+            """
+            ALTER TABLE coworking__reservation_seat
+            ADD CONSTRAINT coworking__reservation_seat_no_overlap
+            EXCLUDE USING gist (int4range(seat_id, seat_id, '[]') WITH =, period WITH &&)
+            WHERE (active)
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "coworking__reservation_seat_no_overlap", "coworking__reservation_seat"
+    )
+    op.execute(
+        text("DROP TRIGGER coworking__reservation_sync_seats ON coworking__reservation")
+    )
+    op.execute(text("DROP FUNCTION coworking__reservation_sync_seats()"))
+    op.execute(
+        text(
+            "DROP TRIGGER coworking__reservation_seat_sync ON coworking__reservation_seat"
+        )
+    )
+    op.execute(text("DROP FUNCTION coworking__reservation_seat_sync()"))
+    op.drop_column("coworking__reservation_seat", "active")
+    op.drop_column("coworking__reservation_seat", "period")
+
+    op.drop_index(
+        "coworking__reservation_period_idx", table_name="coworking__reservation"
+    )
+    op.drop_column("coworking__reservation", "period")
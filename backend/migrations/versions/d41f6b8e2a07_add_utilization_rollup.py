@@ -0,0 +1,45 @@
+"""Add hourly utilization rollup of coworking rooms
+
+Revision ID: d41f6b8e2a07
+Revises: b7e3a9c1d205
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "d41f6b8e2a07"
+down_revision = "b7e3a9c1d205"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coworking__utilization_hour",
+        sa.Column("room_id", sa.String(), nullable=False),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("reserved_seat_seconds", sa.BigInteger(), nullable=False),
+        sa.Column("checked_in_seat_seconds", sa.BigInteger(), nullable=False),
+        sa.Column("no_show_seat_seconds", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["room_id"],
+            ["coworking__room.id"],
+        ),
+        sa.PrimaryKeyConstraint("room_id", "hour"),
+    )
+    op.create_index(
+        op.f("ix_coworking__utilization_hour_hour"),
+        "coworking__utilization_hour",
+        ["hour"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_coworking__utilization_hour_hour"),
+        table_name="coworking__utilization_hour",
+    )
+    op.drop_table("coworking__utilization_hour")
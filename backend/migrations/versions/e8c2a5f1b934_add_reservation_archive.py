@@ -0,0 +1,51 @@
+"""Add month-partitioned archive of terminal reservations
+
+Revision ID: e8c2a5f1b934
+Revises: d41f6b8e2a07
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "e8c2a5f1b934"
+down_revision = "d41f6b8e2a07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partitions are created by ReservationArchiveService as reservations are archived.
+    op.create_table(
+        "coworking__reservation_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("start", sa.DateTime(), nullable=False),
+        sa.Column("end", sa.DateTime(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("walkin", sa.Boolean(), nullable=False),
+        sa.Column("room_id", sa.String(), nullable=True),
+        sa.Column("user_ids", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("seat_ids", postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id", "start"),
+        postgresql_partition_by="RANGE (start)",
+    )
+    op.create_index(
+        "coworking__reservation_archive_user_ids_idx",
+        "coworking__reservation_archive",
+        ["user_ids"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "coworking__reservation_archive_user_ids_idx",
+        table_name="coworking__reservation_archive",
+    )
+    op.drop_table("coworking__reservation_archive")
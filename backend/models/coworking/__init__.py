@@ -3,6 +3,7 @@ from .room_details import RoomDetails
 
 from .seat import Seat
 from .seat_details import SeatDetails
+from .seat_search import SeatSearch
 
 from .time_range import TimeRange
 
@@ -14,18 +15,28 @@ from .reservation import (
     ReservationState,
     ReservationPartial,
     ReservationIdentity,
+    ReservationDetails,
 )
+from .reservation_page import ReservationPage
+from .reservation_draft_result import ReservationDraftResult
 
 from .availability_list import AvailabilityList
 from .availability import SeatAvailability, RoomAvailability
+from .availability_delta import SeatAvailabilityDelta
+from .availability_grid import SeatAvailabilityGrid
 
 from .status import Status
 
+from .cache_stats import CacheStats
+
+from .utilization import UtilizationHour
+
 __all__ = [
     "Room",
     "RoomDetails",
     "Seat",
     "SeatDetails",
+    "SeatSearch",
     "TimeRange",
     "OperatingHours",
     "Reservation",
@@ -33,8 +44,15 @@ __all__ = [
     "ReservationRequest",
     "ReservationPartial",
     "ReservationIdentity",
+    "ReservationDetails",
+    "ReservationPage",
+    "ReservationDraftResult",
     "AvailabilityList",
     "RoomAvailability",
     "SeatAvailability",
+    "SeatAvailabilityDelta",
+    "SeatAvailabilityGrid",
     "Status",
+    "CacheStats",
+    "UtilizationHour",
 ]
@@ -0,0 +1,18 @@
+"""Change in seat availability pushed to clients subscribed to the availability stream."""
+
+from pydantic import BaseModel
+
+from .time_range import TimeRange
+
+
+class SeatAvailabilityDelta(BaseModel):
+    """Availability of the seats that changed, keyed by seat ID.
+
+    A seat with an empty availability list is no longer available within the walk-in window.
+    When `snapshot` is true, the delta carries every available seat and replaces all prior
+    state, as is the case for the first event of a stream and after a slow consumer fell behind.
+    """
+
+    version: int
+    snapshot: bool
+    seats: dict[int, list[TimeRange]]
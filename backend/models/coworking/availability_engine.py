@@ -0,0 +1,316 @@
+"""Array-backed availability engine used internally by the coworking services.
+
+Availability is tracked as parallel arrays of integer offsets (in microseconds) from the Unix
+epoch rather than lists of pydantic TimeRange models. Microseconds, rather than seconds, are
+used so that round-tripping a datetime through the engine is exact.
+
+Conversion back to TimeRange models should happen only at the API boundary. Intervals in the
+engine are sorted, non-overlapping and non-empty by construction, so that conversion uses
+pydantic's trusted `model_construct` rather than re-running TimeRange's validators.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Iterable, Self
+from .time_range import TimeRange
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(moment: datetime) -> int:
+    """Convert a naive datetime to an integer offset in microseconds from the epoch."""
+    return (moment - EPOCH) // ONE_MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    """Convert an integer offset in microseconds from the epoch to a naive datetime."""
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def duration_micros(duration: timedelta) -> int:
+    """Convert a timedelta to an integer number of microseconds."""
+    return duration // ONE_MICROSECOND
+
+
+class IntervalSet:
+    """A sorted set of non-overlapping, half-open intervals [start, end).
+
+    Starts and ends are stored in two `array('q')` instances of equal length. Because the
+    intervals are sorted and non-overlapping, both arrays are sorted, which allows the
+    constrain and subtract operations to locate affected intervals by bisection and replace
+    them with a single slice assignment.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, starts: array | None = None, ends: array | None = None):
+        self.starts: array = starts if starts is not None else array("q")
+        self.ends: array = ends if ends is not None else array("q")
+
+    @classmethod
+    def from_time_ranges(cls, time_ranges: Iterable[TimeRange]) -> Self:
+        """Create an IntervalSet from TimeRanges sorted by start and not overlapping.
+
+        Args:
+            time_ranges (Iterable[TimeRange]): Sorted, non-overlapping time ranges.
+
+        Returns:
+            IntervalSet: The equivalent interval set."""
+        interval_set = cls()
+        for time_range in time_ranges:
+            interval_set.starts.append(to_micros(time_range.start))
+            interval_set.ends.append(to_micros(time_range.end))
+        return interval_set
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def copy(self) -> Self:
+        """Returns a copy of this interval set that shares no storage with it."""
+        return type(self)(array("q", self.starts), array("q", self.ends))
+
+    def constrain(self, start: int, end: int) -> None:
+        """Constrains all intervals to be within [start, end).
+
+        Args:
+            start (int): Lower bound, in epoch microseconds.
+            end (int): Upper bound, in epoch microseconds."""
+        front = bisect_right(self.ends, start)
+        back = bisect_left(self.starts, end)
+        if front >= back:
+            self.starts = array("q")
+            self.ends = array("q")
+            return
+
+        self.starts = self.starts[front:back]
+        self.ends = self.ends[front:back]
+        if self.starts[0] < start:
+            self.starts[0] = start
+        if self.ends[-1] > end:
+            self.ends[-1] = end
+
+    def subtract(self, start: int, end: int) -> None:
+        """Removes the block [start, end) from the intervals in this set.
+
+        Args:
+            start (int): Start of the block, in epoch microseconds.
+            end (int): End of the block, in epoch microseconds."""
+        front = bisect_right(self.ends, start)
+        back = bisect_left(self.starts, end)
+        if front >= back:
+            return
+
+        starts = array("q")
+        ends = array("q")
+        if self.starts[front] < start:
+            starts.append(self.starts[front])
+            ends.append(start)
+        if self.ends[back - 1] > end:
+            starts.append(end)
+            ends.append(self.ends[back - 1])
+
+        self.starts[front:back] = starts
+        self.ends[front:back] = ends
+
+    def subtract_many(self, blocks: Iterable[tuple[int, int]]) -> None:
+        """Removes every [start, end) block from the intervals in this set.
+
+        Equivalent to calling subtract once per block, but the blocks are sorted and merged
+        once and then removed in a single pass over the intervals.
+
+        Args:
+            blocks (Iterable[tuple[int, int]]): The blocks to remove, in any order."""
+        merged: list[list[int]] = []
+        for start, end in sorted(blocks):
+            if len(merged) > 0 and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        if len(self.starts) == 0 or len(merged) == 0:
+            return
+
+        starts = array("q")
+        ends = array("q")
+        b = 0
+        for start, end in zip(self.starts, self.ends):
+            while b < len(merged) and merged[b][1] <= start:
+                b += 1
+            while b < len(merged) and merged[b][0] < end:
+                if start < merged[b][0]:
+                    starts.append(start)
+                    ends.append(merged[b][0])
+                start = max(start, merged[b][1])
+                if merged[b][1] > end:
+                    break
+                b += 1
+            if start < end:
+                starts.append(start)
+                ends.append(end)
+
+        self.starts = starts
+        self.ends = ends
+
+    def prune(self, minimum: int) -> None:
+        """Removes all intervals shorter than minimum microseconds.
+
+        Args:
+            minimum (int): The threshold, in microseconds, to remove beneath."""
+        keep = [
+            i
+            for i in range(len(self.starts))
+            if self.ends[i] - self.starts[i] >= minimum
+        ]
+        if len(keep) == len(self.starts):
+            return
+        self.starts = array("q", (self.starts[i] for i in keep))
+        self.ends = array("q", (self.ends[i] for i in keep))
+
+    def to_bits(self, origin: int, width: int, length: int) -> int:
+        """Converts the interval set to a row of slots, as in a SlotGrid.
+
+        Args:
+            origin (int): Start of slot 0, in epoch microseconds.
+            width (int): Width of a slot, in microseconds.
+            length (int): The number of slots.
+
+        Returns:
+            int: Bits set for each slot lying entirely within an interval, slot i as bit i.
+        """
+        bits = 0
+        for start, end in zip(self.starts, self.ends):
+            first = max(-((origin - start) // width), 0)
+            last = min((end - origin) // width, length)
+            if first < last:
+                bits |= ((1 << (last - first)) - 1) << first
+        return bits
+
+    def to_time_ranges(
+        self, datetimes: dict[int, datetime] | None = None
+    ) -> list[TimeRange]:
+        """Converts the interval set to a list of TimeRange models.
+
+        Args:
+            datetimes (dict[int, datetime] | None): Optional memo of already converted offsets.
+                Interval sets derived from the same operating hours and reservations share most
+                of their boundaries, so sharing a memo across them avoids creating the same
+                datetime over and over.
+
+        Returns:
+            list[TimeRange]: The intervals as TimeRanges sorted by start."""
+        if datetimes is None:
+            datetimes = {}
+        time_ranges: list[TimeRange] = []
+        for start, end in zip(self.starts, self.ends):
+            if start not in datetimes:
+                datetimes[start] = from_micros(start)
+            if end not in datetimes:
+                datetimes[end] = from_micros(end)
+            time_ranges.append(
+                TimeRange.model_construct(start=datetimes[start], end=datetimes[end])
+            )
+        return time_ranges
+
+
+class SlotGrid:
+    """A bitmap of free time slots for many keys (e.g. seats) over a shared window.
+
+    The window starting at `origin` is divided into `length` slots of `width` microseconds.
+    Each key's row is a Python int whose bit i is set when slot i is free. Python ints are
+    arbitrary precision, so every row operation (masking, shifting, inverting) is carried
+    out a machine word at a time by the interpreter rather than a slot at a time.
+
+    Availability is quantized to slot boundaries: a slot is only free if it is entirely
+    within an open interval and no block overlaps any part of it.
+    """
+
+    __slots__ = ("origin", "width", "length", "rows")
+
+    def __init__(
+        self,
+        origin: int,
+        width: int,
+        length: int,
+        keys: Iterable[int],
+        free: IntervalSet,
+    ):
+        self.origin = origin
+        self.width = width
+        self.length = length
+        open_row = free.to_bits(origin, width, length)
+        self.rows: dict[int, int] = {key: open_row for key in keys}
+
+    @classmethod
+    def covering(cls, free: IntervalSet, width: int, keys: Iterable[int]) -> Self:
+        """Create a grid aligned to multiples of width that covers all of free.
+
+        Args:
+            free (IntervalSet): The intervals every key starts out free during.
+            width (int): Width of a slot, in microseconds.
+            keys (Iterable[int]): The keys (e.g. seat IDs) forming the rows of the grid.
+
+        Returns:
+            SlotGrid: The grid with each row free exactly during free."""
+        if len(free) == 0:
+            return cls(0, width, 0, keys, free)
+        origin = free.starts[0] // width * width
+        length = -((origin - free.ends[-1]) // width)
+        return cls(origin, width, length, keys, free)
+
+    def _mask(self, first: int, last: int) -> int:
+        """Bit mask of slots [first, last), clamped to the grid."""
+        first = max(first, 0)
+        last = min(last, self.length)
+        if first >= last:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    def occupy_many(self, blocks: Iterable[tuple[int, int, int]]) -> None:
+        """Marks every slot touched by each (key, start, end) block as occupied.
+
+        Blocks are first combined into a single mask per row so that each row is
+        rewritten once no matter how many blocks it has.
+
+        Args:
+            blocks (Iterable[tuple[int, int, int]]): Key and [start, end) in epoch microseconds.
+        """
+        masks: dict[int, int] = {}
+        for key, start, end in blocks:
+            if key in self.rows:
+                masks[key] = masks.get(key, 0) | self._mask(
+                    (start - self.origin) // self.width,
+                    -((self.origin - end) // self.width),
+                )
+        for key, mask in masks.items():
+            self.rows[key] &= ~mask
+
+    def free_runs(self, key: int, minimum: int = 1) -> IntervalSet:
+        """Extracts the runs of free slots of at least minimum slots for a key.
+
+        Args:
+            key (int): The row to extract runs from.
+            minimum (int): The fewest consecutive free slots a run may have.
+
+        Returns:
+            IntervalSet: The free runs, in epoch microseconds."""
+        runs = IntervalSet()
+        row = self.rows[key]
+        slot = 0
+        while row:
+            # Skip the occupied slots preceding the next run of free slots
+            occupied = (row & -row).bit_length() - 1
+            row >>= occupied
+            slot += occupied
+            # Count the trailing free slots: adding one carries through all of them
+            free = (~row & (row + 1)).bit_length() - 1
+            if free >= minimum:
+                runs.starts.append(self.origin + slot * self.width)
+                runs.ends.append(self.origin + (slot + free) * self.width)
+            row >>= free
+            slot += free
+        return runs
@@ -0,0 +1,22 @@
+"""Compact availability of many seats over fixed-width time slots."""
+
+from datetime import datetime
+from pydantic import BaseModel
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class SeatAvailabilityGrid(BaseModel):
+    """Availability of seats as bitsets over slots of a shared grid.
+
+    Slot i spans `slot_minutes` minutes starting `i * slot_minutes` minutes after `origin`.
+    Each seat's bitset is base64 encoded bytes in which slot i is bit `i % 8` of byte `i // 8`,
+    set when the seat is free for the entire slot. Seats with no availability are omitted.
+    """
+
+    origin: datetime
+    slot_minutes: int
+    slots: int
+    seats: dict[int, str]
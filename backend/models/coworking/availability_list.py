@@ -4,6 +4,7 @@ Handles logic for constraining availability within a bounds, removing availabili
 """
 
 from datetime import timedelta
+from typing import Iterable
 from pydantic import BaseModel, field_validator
 from .time_range import TimeRange
 
@@ -84,6 +85,10 @@ class AvailabilityList(BaseModel):
         ):
             front += 1
 
+        # The block falls entirely within a gap between availability ranges.
+        if front == len(self.availability):
+            return
+
         end = front + 1
         while end < len(self.availability) and block.overlaps(self.availability[end]):
             end += 1
@@ -95,6 +100,53 @@ class AvailabilityList(BaseModel):
 
         self.availability = availability
 
+    def subtract_many(self, blocks: Iterable[TimeRange]) -> None:
+        """Removes availability that overlaps any of the given blocks.
+
+        Equivalent to calling subtract once per block, but the blocks are sorted and merged
+        once and then removed in a single pass over the availability list.
+
+        Args:
+            blocks (Iterable[TimeRange]): The blocks to remove, in any order.
+
+        Returns:
+            None"""
+        merged = merge_time_ranges(blocks)
+        if len(self.availability) == 0 or len(merged) == 0:
+            return
+
+        # Pieces are cut from already validated ranges and are non-empty by construction,
+        # so validation is skipped when building them.
+        availability: list[TimeRange] = []
+        b = 0
+        for time_range in self.availability:
+            # Blocks are merged, so their ends are sorted too and those ending before this
+            # range cannot overlap any later range.
+            while b < len(merged) and merged[b].end <= time_range.start:
+                b += 1
+
+            if b == len(merged) or merged[b].start >= time_range.end:
+                availability.append(time_range)
+                continue
+
+            start = time_range.start
+            while b < len(merged) and merged[b].start < time_range.end:
+                if start < merged[b].start:
+                    availability.append(
+                        TimeRange.model_construct(start=start, end=merged[b].start)
+                    )
+                start = max(start, merged[b].end)
+                if merged[b].end > time_range.end:
+                    break
+                b += 1
+
+            if start < time_range.end:
+                availability.append(
+                    TimeRange.model_construct(start=start, end=time_range.end)
+                )
+
+        self.availability = availability
+
     def filter_time_ranges_below(self, minimum: timedelta) -> None:
         """Remove all TimeRanges that are not at least the minimum timedelta.
 
@@ -123,3 +175,23 @@ class AvailabilityList(BaseModel):
             total += durations[i]
 
         return total
+
+
+def merge_time_ranges(time_ranges: Iterable[TimeRange]) -> list[TimeRange]:
+    """Sorts time ranges by start and merges any that overlap or touch.
+
+    Args:
+        time_ranges (Iterable[TimeRange]): The time ranges to merge, in any order.
+
+    Returns:
+        list[TimeRange]: Sorted, disjoint time ranges covering the same time."""
+    merged: list[TimeRange] = []
+    for time_range in sorted(time_ranges, key=lambda time_range: time_range.start):
+        if len(merged) > 0 and time_range.start <= merged[-1].end:
+            if time_range.end > merged[-1].end:
+                merged[-1] = TimeRange.model_construct(
+                    start=merged[-1].start, end=time_range.end
+                )
+        else:
+            merged.append(time_range)
+    return merged
@@ -0,0 +1,14 @@
+"""Counters describing the effectiveness of an in-process coworking cache."""
+
+from pydantic import BaseModel
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class CacheStats(BaseModel):
+    hits: int
+    misses: int
+    invalidations: int
+    entries: int
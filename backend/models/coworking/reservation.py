@@ -22,6 +22,7 @@ class ReservationIdentity(BaseModel):
 class ReservationRequest(TimeRange):
     users: list[UserIdentity] = []
     seats: list[SeatIdentity] = []
+    room: Room | None = None
 
 
 class Reservation(ReservationIdentity, TimeRange):
@@ -0,0 +1,16 @@
+"""Outcome of one request in a batch of reservation drafts."""
+
+from pydantic import BaseModel
+
+from .reservation import Reservation
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class ReservationDraftResult(BaseModel):
+    """Either the DRAFT reservation made for a request, or why none could be made."""
+
+    reservation: Reservation | None = None
+    error: str | None = None
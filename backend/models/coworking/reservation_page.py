@@ -0,0 +1,21 @@
+"""Page of reservations retrieved by keyset pagination."""
+
+from pydantic import BaseModel
+
+from .reservation import Reservation
+from .time_range import TimeRange
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class ReservationPage(BaseModel):
+    """Reservations overlapping `window`, ordered by start and then ID.
+
+    When `next_cursor` is not None, more reservations overlap the window and are retrieved by
+    requesting the same window again with the cursor."""
+
+    items: list[Reservation]
+    window: TimeRange
+    next_cursor: str | None = None
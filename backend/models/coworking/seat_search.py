@@ -0,0 +1,34 @@
+"""Criteria for searching the seats of the coworking space."""
+
+from pydantic import BaseModel
+
+from .seat_details import SeatDetails
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class SeatSearch(BaseModel):
+    """Features a seat must have to be searched. Criteria left as None match every seat."""
+
+    has_monitor: bool | None = None
+    sit_stand: bool | None = None
+    reservable: bool | None = None
+    room_id: str | None = None
+
+    def matches(self, seat: SeatDetails) -> bool:
+        """Returns True if the seat meets every criterion.
+
+        Args:
+            seat (SeatDetails): The seat to test, including its room.
+
+        Returns:
+            bool: True if the seat meets every criterion.
+        """
+        return (
+            (self.has_monitor is None or seat.has_monitor == self.has_monitor)
+            and (self.sit_stand is None or seat.sit_stand == self.sit_stand)
+            and (self.reservable is None or seat.reservable == self.reservable)
+            and (self.room_id is None or seat.room.id == self.room_id)
+        )
@@ -3,14 +3,15 @@
 from pydantic import BaseModel
 from typing import Sequence
 
-from .reservation import Reservation
-from .availability import SeatAvailability
+from .reservation import ReservationDetails
+from .availability import RoomAvailability, SeatAvailability
 from .operating_hours import OperatingHours
 
 
 class Status(BaseModel):
     """The status of the XL coworking space, including reservations, for a given user."""
 
-    my_reservations: Sequence[Reservation]
+    my_reservations: Sequence[ReservationDetails]
     seat_availability: Sequence[SeatAvailability]
     operating_hours: Sequence[OperatingHours]
+    room_availability: Sequence[RoomAvailability] = []
@@ -9,6 +9,9 @@ __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+TIMEZONE = ZoneInfo("America/New_York")
+"""Timezone of the XL, which naive datetimes are assumed to be in."""
+
 
 class TimeRange(BaseModel):
     """A time range with a start and end."""
@@ -21,7 +24,7 @@ class TimeRange(BaseModel):
     def remove_timezone(cls, value: datetime):
         if type(value) == str:
             dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-            dt = dt.astimezone(ZoneInfo("America/New_York"))
+            dt = dt.astimezone(TIMEZONE)
             dt = dt.replace(tzinfo=None)
             return dt
         return value
@@ -56,13 +59,15 @@ class TimeRange(BaseModel):
         if not self.overlaps(other):
             return [self]
 
+        # Both pieces are cut from this already validated range and are non-empty
+        # by construction, so validation is skipped.
         results = []
 
         if self.start < other.start:
-            results.append(TimeRange(start=self.start, end=other.start))
+            results.append(TimeRange.model_construct(start=self.start, end=other.start))
 
         if self.end > other.end:
-            results.append(TimeRange(start=other.end, end=self.end))
+            results.append(TimeRange.model_construct(start=other.end, end=self.end))
 
         return results
 
@@ -0,0 +1,22 @@
+"""Hourly utilization of the seats in a coworking room."""
+
+from datetime import datetime
+from pydantic import BaseModel
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class UtilizationHour(BaseModel):
+    """Seat-minutes of a room's reservations falling within the hour starting at `hour`.
+
+    Reserved seat-minutes count confirmed reservations, including those later checked in and
+    those nobody checked in to. Checked in and no-show seat-minutes divide the reserved
+    seat-minutes of reservations whose check-in window has passed."""
+
+    room_id: str
+    hour: datetime
+    reserved_seat_minutes: float
+    checked_in_seat_minutes: float
+    no_show_seat_minutes: float
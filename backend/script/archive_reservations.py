@@ -0,0 +1,38 @@
+"""
+Moves cancelled and checked out reservations into the reservation archive once they are
+older than PolicyService#reservation_archive_age, or than the given number of days.
+
+Intended to be run nightly. Runs are safe to repeat and to interrupt, since each batch of
+reservations is archived in its own transaction.
+
+Usage: python3 -m script.archive_reservations [days]
+"""
+
+import sys
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..services import PermissionService
+from ..services.coworking import (
+    PolicyService,
+    ReservationArchiveService,
+    SeatService,
+)
+from ..services.coworking.policy_cache import policy_cache
+from ..services.coworking.seat_catalog import seat_catalog_cache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+with Session(engine) as session:
+    age = (
+        timedelta(days=int(sys.argv[1]))
+        if len(sys.argv) > 1
+        else PolicyService(session, policy_cache()).reservation_archive_age()
+    )
+    archive_svc = ReservationArchiveService(
+        session, PermissionService(session), SeatService(session, seat_catalog_cache())
+    )
+    count = archive_svc.archive(datetime.now() - age)
+    print(f"Archived {count} reservations that ended more than {age} ago.")
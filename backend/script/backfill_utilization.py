@@ -0,0 +1,25 @@
+"""
+Rebuilds the hourly utilization rollup of coworking rooms from every reservation.
+
+Run once after migrating to the rollup, so that reservations made before it existed are
+counted, and whenever the rollup is suspected to have drifted from the reservations.
+
+Usage: python3 -m script.backfill_utilization
+"""
+
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..services import PermissionService
+from ..services.coworking import PolicyService, UtilizationService
+from ..services.coworking.policy_cache import policy_cache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+with Session(engine) as session:
+    utilization_svc = UtilizationService(
+        session, PermissionService(session), PolicyService(session, policy_cache())
+    )
+    count = utilization_svc.backfill()
+    print(f"Rebuilt utilization rollup from {count} reservations.")
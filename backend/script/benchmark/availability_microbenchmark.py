@@ -0,0 +1,257 @@
+"""Microbenchmark of model allocations and validator calls per seat_availability call.
+
+Compares the original pipeline, which deep copied an AvailabilityList of validated TimeRange
+models per seat and subtracted one reservation at a time, against the current engine-backed
+ReservationService#seat_availability. Operating hours and reservations are synthesized in
+memory so no database is needed.
+
+Usage: python3 -m backend.script.benchmark.availability_microbenchmark [seats] [reservations]
+"""
+
+import sys
+import tracemalloc
+from time import perf_counter
+from datetime import datetime, timedelta
+from random import Random
+from typing import Callable, Sequence
+from pydantic import BaseModel
+
+from ...models.coworking import (
+    AvailabilityList,
+    OperatingHours,
+    Reservation,
+    ReservationState,
+    Seat,
+    SeatAvailability,
+    TimeRange,
+)
+from ...services.coworking import PolicyService, ReservationService
+from ...services.coworking.availability_cache import SeatAvailabilityCache
+from ...services.coworking.policy_cache import policy_cache
+from ...services.coworking.upcoming_reservation_index import UpcomingReservationIndex
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class _OperatingHoursStub:
+    """Stands in for OperatingHoursService with a fixed schedule."""
+
+    def __init__(self, hours: list[OperatingHours]):
+        self.hours = hours
+
+    def schedule(self, _time_range: TimeRange) -> list[OperatingHours]:
+        return self.hours
+
+
+def synthesize(
+    seat_count: int, reservation_count: int, now: datetime
+) -> tuple[list[Seat], list[OperatingHours], list[Reservation]]:
+    """Generate seats, a week of operating hours and reservations spread over them."""
+    rng = Random(0)
+    seats = [
+        Seat(
+            id=i,
+            title=f"Seat {i}",
+            shorthand=f"S{i}",
+            reservable=i % 2 == 0,
+            has_monitor=True,
+            sit_stand=False,
+            x=i,
+            y=0,
+        )
+        for i in range(1, seat_count + 1)
+    ]
+    today = now.replace(hour=10, minute=0, second=0, microsecond=0)
+    hours = [
+        OperatingHours(
+            id=day + 1,
+            start=today + timedelta(days=day),
+            end=today + timedelta(days=day, hours=10),
+        )
+        for day in range(7)
+    ]
+    reservations = []
+    for i in range(reservation_count):
+        day = hours[rng.randrange(len(hours))]
+        start = day.start + timedelta(minutes=15 * rng.randrange(36))
+        reservations.append(
+            Reservation(
+                id=i + 1,
+                start=start,
+                end=start + timedelta(minutes=15 * rng.randint(1, 8)),
+                state=ReservationState.CONFIRMED,
+                seats=[seats[rng.randrange(len(seats))]],
+                created_at=now,
+                updated_at=now,
+            )
+        )
+    return seats, hours, reservations
+
+
+def _legacy_subtract(
+    availability: list[TimeRange], block: TimeRange
+) -> list[TimeRange]:
+    """AvailabilityList#subtract as it was, building validated TimeRanges for every split."""
+    result: list[TimeRange] = []
+    for time_range in availability:
+        if not time_range.overlaps(block):
+            result.append(time_range)
+            continue
+        if time_range.start < block.start:
+            result.append(TimeRange(start=time_range.start, end=block.start))
+        if time_range.end > block.end:
+            result.append(TimeRange(start=block.end, end=time_range.end))
+    return result
+
+
+def legacy_seat_availability(
+    seats: Sequence[Seat],
+    hours: Sequence[OperatingHours],
+    reservations: Sequence[Reservation],
+    bounds: TimeRange,
+    threshold: timedelta,
+) -> list[SeatAvailability]:
+    """The seat_availability pipeline as it was before the availability engine."""
+    open_availability = AvailabilityList(
+        availability=[TimeRange(start=hour.start, end=hour.end) for hour in hours]
+    )
+    open_availability.constrain(bounds)
+    seat_availability_dict = {
+        seat.id: SeatAvailability(
+            availability=open_availability.model_copy(deep=True).availability,
+            **seat.model_dump(),
+        )
+        for seat in seats
+    }
+    for reservation in reservations:
+        for seat in reservation.seats:
+            if seat.id in seat_availability_dict:
+                seat_availability = seat_availability_dict[seat.id]
+                seat_availability.availability = _legacy_subtract(
+                    seat_availability.availability, reservation
+                )
+    available_seats = []
+    for seat in seat_availability_dict.values():
+        seat.filter_time_ranges_below(threshold)
+        if len(seat.availability) > 0:
+            available_seats.append(seat)
+    return available_seats
+
+
+def _validator_code_objects() -> set:
+    """Code objects of every validator defined on the coworking availability models."""
+    functions = [
+        decorator.func
+        for model in (TimeRange, AvailabilityList)
+        for decorator in model.__pydantic_decorators__.field_validators.values()
+    ]
+    return {getattr(function, "__func__", function).__code__ for function in functions}
+
+
+def _model_allocation_code_objects() -> set:
+    """Code objects of the BaseModel methods through which model instances are allocated."""
+    methods = [
+        BaseModel.__init__,
+        BaseModel.__copy__,
+        BaseModel.__deepcopy__,
+        BaseModel.model_construct,
+    ]
+    return {getattr(method, "__func__", method).__code__ for method in methods}
+
+
+def measure(label: str, run: Callable[[], Sequence[SeatAvailability]]) -> dict:
+    """Run once, counting validator calls, model allocations and peak memory."""
+    validators = _validator_code_objects()
+    allocators = _model_allocation_code_objects()
+    validator_calls = 0
+    model_allocations = 0
+
+    def profile(frame, event, _arg):
+        nonlocal validator_calls, model_allocations
+        if event == "call":
+            if frame.f_code in validators:
+                validator_calls += 1
+            elif frame.f_code in allocators:
+                model_allocations += 1
+
+    sys.setprofile(profile)
+    try:
+        run()
+    finally:
+        sys.setprofile(None)
+
+    tracemalloc.start()
+    result = run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = perf_counter()
+    run()
+    elapsed = perf_counter() - start
+
+    return {
+        "label": label,
+        "seats_available": len(result),
+        "validator_calls": validator_calls,
+        "model_allocations": model_allocations,
+        "peak_bytes": peak,
+        "milliseconds": elapsed * 1000,
+    }
+
+
+def main(seat_count: int = 200, reservation_count: int = 2000):
+    now = datetime.now()
+    seats, hours, reservations = synthesize(seat_count, reservation_count, now)
+    # Without a database, only the default policies of a subject-less request are resolved.
+    policy_svc = PolicyService(None, policy_cache())  # type: ignore
+    threshold = policy_svc.minimum_reservation_duration() - timedelta(minutes=1)
+    window = (now, now + policy_svc.reservation_window(None))  # type: ignore
+
+    # The cache is invalidated before every run so the computation itself is measured.
+    cache = SeatAvailabilityCache()
+    reservation_svc = ReservationService(
+        None,  # type: ignore
+        None,  # type: ignore
+        policy_svc,
+        _OperatingHoursStub(hours),  # type: ignore
+        None,  # type: ignore
+        cache,
+        UpcomingReservationIndex(),
+    )
+    reservation_svc.get_seat_reservations = lambda _seats, _range: reservations  # type: ignore
+
+    results = [
+        measure(
+            "legacy",
+            lambda: legacy_seat_availability(
+                seats,
+                hours,
+                reservations,
+                TimeRange(start=window[0], end=window[1]),
+                threshold,
+            ),
+        ),
+        measure(
+            "engine",
+            lambda: cache.invalidate()
+            or reservation_svc.seat_availability(
+                seats, TimeRange(start=window[0], end=window[1])
+            ),
+        ),
+    ]
+
+    print(f"{seat_count} seats, {reservation_count} reservations, one week window")
+    for result in results:
+        print(
+            f"{result['label']:>8}: {result['validator_calls']:>7} validator calls, "
+            f"{result['model_allocations']:>7} models allocated, "
+            f"{result['peak_bytes'] / 1024:>8.1f} KiB peak, "
+            f"{result['milliseconds']:>7.1f} ms, "
+            f"{result['seats_available']} seats available"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
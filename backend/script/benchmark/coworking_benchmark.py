@@ -0,0 +1,329 @@
+"""Benchmark of coworking service operations against a synthetic, semester-sized XL.
+
+Generates an XL with `synthetic_xl` in its own database, `{POSTGRES_DATABASE}_benchmark`, which
+is dropped and recreated on every run, then times the operations behind the coworking pages:
+
+* seat_availability: ReservationService#seat_availability of every seat over the reservation window
+* draft_reservation: ReservationService#draft_reservation of a reservable seat for the next open day
+* get_coworking_status: StatusService#get_coworking_status of a student
+* list_all_active_and_upcoming: ReservationService#list_all_active_and_upcoming of an ambassador
+
+Each iteration uses a new database session, as a request does, and the seat availability cache
+is invalidated beforehand so that the computation, rather than the cache, is measured. The seat
+catalog and operating hours index stay warm across iterations, as they do in production.
+
+Results are printed as JSON, and written to --output if given. Given a --baseline of earlier
+results, the run exits with status 1 when an operation's p50 or p95 is slower than the
+baseline's by more than --threshold, so that CI fails on regressions.
+
+Usage: python3 -m backend.script.benchmark.coworking_benchmark [--reservations N] [--seats N]
+    [--days N] [--iterations N] [--output results.json] [--baseline baseline.json]
+    [--threshold 0.25]
+"""
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import asdict
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Callable
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.orm import Session
+
+from ... import entities
+from ...database import _engine_str
+from ...env import getenv
+from ...models.coworking import (
+    ReservationPartial,
+    ReservationRequest,
+    ReservationState,
+    TimeRange,
+)
+from ...models.coworking.seat import SeatIdentity
+from ...models.user import UserIdentity
+from ...services import PermissionService
+from ...services.coworking import (
+    OperatingHoursService,
+    PolicyService,
+    ReservationService,
+    SeatService,
+    StatusService,
+)
+from ...services.coworking.availability_cache import SeatAvailabilityCache
+from ...services.coworking.operating_hours_index import OperatingHoursIndex
+from ...services.coworking.policy_cache import PolicyCache
+from ...services.coworking.seat_catalog import SeatCatalogCache
+from ...services.coworking.status_snapshot import StatusSnapshotCache
+from ...services.coworking.upcoming_reservation_index import UpcomingReservationIndex
+from .synthetic_xl import SyntheticXL, XLScale, generate
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+POSTGRES_DATABASE = f'{getenv("POSTGRES_DATABASE")}_benchmark'
+
+NOISE_FLOOR_MS = 1.0
+"""Slowdowns smaller than this are never reported as regressions, however large relative
+to the baseline, as they are within the timing noise of a shared CI runner."""
+
+
+class _Caches:
+    """Process-wide caches of the services, shared across iterations as across requests."""
+
+    def __init__(self):
+        self.operating_hours_index = OperatingHoursIndex()
+        self.seat_catalog = SeatCatalogCache()
+        self.seat_availability = SeatAvailabilityCache()
+        self.status_snapshot = StatusSnapshotCache()
+        self.upcoming_reservations = UpcomingReservationIndex()
+        self.policies = PolicyCache()
+
+
+def _reservation_svc(session: Session, caches: _Caches) -> ReservationService:
+    return ReservationService(
+        session,
+        PermissionService(session),
+        PolicyService(session, caches.policies),
+        OperatingHoursService(session, caches.operating_hours_index),
+        SeatService(session, caches.seat_catalog),
+        caches.seat_availability,
+        caches.upcoming_reservations,
+    )
+
+
+def _status_svc(session: Session, caches: _Caches) -> StatusService:
+    return StatusService(
+        PolicyService(session, caches.policies),
+        OperatingHoursService(session, caches.operating_hours_index),
+        SeatService(session, caches.seat_catalog),
+        _reservation_svc(session, caches),
+        caches.seat_availability,
+        caches.status_snapshot,
+    )
+
+
+def reset_database() -> Engine:
+    """Drops and recreates the benchmark database with empty tables."""
+    engine = create_engine(_engine_str(""), isolation_level="AUTOCOMMIT")
+    with engine.connect() as connection:
+        connection.execute(text(f"DROP DATABASE IF EXISTS {POSTGRES_DATABASE}"))
+        connection.execute(text(f"CREATE DATABASE {POSTGRES_DATABASE}"))
+    engine.dispose()
+
+    engine = create_engine(_engine_str(POSTGRES_DATABASE))
+    entities.EntityBase.metadata.create_all(engine)
+    return engine
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """The nearest-rank percentile of samples."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(samples: list[float]) -> dict:
+    """Statistics of an operation's timings, in milliseconds."""
+    return {
+        "iterations": len(samples),
+        "p50_ms": percentile(samples, 0.50),
+        "p95_ms": percentile(samples, 0.95),
+        "mean_ms": sum(samples) / len(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+    }
+
+
+def _time(
+    engine: Engine,
+    iterations: int,
+    warmup: int,
+    run: Callable[[Session, int], object],
+    after: Callable[[Session, object], None] | None = None,
+) -> list[float]:
+    """Milliseconds taken by run in each iteration after the warmup ones.
+
+    Args:
+        engine (Engine): Engine of the benchmark database.
+        iterations (int): Timed iterations.
+        warmup (int): Untimed iterations run first.
+        run (Callable[[Session, int], object]): The operation, given a new session and the
+            iteration's index.
+        after (Callable[[Session, object], None] | None): Untimed clean up of each iteration,
+            given its session and run's result.
+    """
+    samples = []
+    for i in range(warmup + iterations):
+        with Session(engine) as session:
+            start = perf_counter()
+            result = run(session, i)
+            elapsed = perf_counter() - start
+            if after is not None:
+                after(session, result)
+        if i >= warmup:
+            samples.append(elapsed * 1000)
+    return samples
+
+
+def benchmark(
+    engine: Engine, xl: SyntheticXL, iterations: int, warmup: int
+) -> dict[str, dict]:
+    """Times each operation against the synthetic XL."""
+    caches = _Caches()
+    student = xl.students[0]
+
+    def seat_availability(session: Session, _i: int):
+        caches.seat_availability.invalidate()
+        reservation_svc = _reservation_svc(session, caches)
+        now = datetime.now()
+        window = PolicyService(session, caches.policies).reservation_window(student)
+        return reservation_svc.seat_availability(
+            SeatService(session, caches.seat_catalog).list(),
+            TimeRange(start=now, end=now + window),
+        )
+
+    # Drafts are for the first two hours of the next day the XL opens, in any reservable
+    # seat, each by a different student so none conflicts with an earlier draft.
+    now = datetime.now()
+    opens = min(
+        start for start, _ in xl.operating_hours if start > now + timedelta(hours=1)
+    )
+    request = ReservationRequest(
+        start=opens,
+        end=opens + timedelta(hours=2),
+        users=[],
+        seats=[SeatIdentity(id=id) for id in xl.reservable_seat_ids],
+    )
+
+    def draft_reservation(session: Session, i: int):
+        subject = xl.students[i % len(xl.students)]
+        return _reservation_svc(session, caches).draft_reservation(
+            subject,
+            request.model_copy(update={"users": [UserIdentity(id=subject.id)]}),
+        )
+
+    def cancel_draft(session: Session, draft):
+        _reservation_svc(session, caches).change_reservation(
+            draft.users[0],
+            ReservationPartial(id=draft.id, state=ReservationState.CANCELLED),
+        )
+
+    def get_coworking_status(session: Session, _i: int):
+        caches.seat_availability.invalidate()
+        return _status_svc(session, caches).get_coworking_status(student)
+
+    def list_all_active_and_upcoming(session: Session, _i: int):
+        return _reservation_svc(session, caches).list_all_active_and_upcoming(
+            xl.ambassador
+        )
+
+    return {
+        "seat_availability": summarize(
+            _time(engine, iterations, warmup, seat_availability)
+        ),
+        "draft_reservation": summarize(
+            _time(engine, iterations, warmup, draft_reservation, cancel_draft)
+        ),
+        "get_coworking_status": summarize(
+            _time(engine, iterations, warmup, get_coworking_status)
+        ),
+        "list_all_active_and_upcoming": summarize(
+            _time(engine, iterations, warmup, list_all_active_and_upcoming)
+        ),
+    }
+
+
+def regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Descriptions of each operation whose p50 or p95 regressed from the baseline.
+
+    Args:
+        results (dict): Results of this run.
+        baseline (dict): Results of an earlier run to compare against.
+        threshold (float): The fraction by which a statistic may exceed the baseline's.
+
+    Returns:
+        list[str]: One description per regressed statistic, empty if none regressed.
+    """
+    found = []
+    for name, operation in results["operations"].items():
+        expected = baseline.get("operations", {}).get(name)
+        if expected is None:
+            continue
+        for statistic in ("p50_ms", "p95_ms"):
+            limit = max(
+                expected[statistic] * (1 + threshold),
+                expected[statistic] + NOISE_FLOOR_MS,
+            )
+            if operation[statistic] > limit:
+                found.append(
+                    f"{name} {statistic} regressed from {expected[statistic]:.2f} ms "
+                    f"to {operation[statistic]:.2f} ms (limit {limit:.2f} ms)"
+                )
+    return found
+
+
+def main(argv: list[str]) -> int:
+    defaults = XLScale()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reservations", type=int, default=defaults.reservations)
+    parser.add_argument("--seats", type=int, default=defaults.seats)
+    parser.add_argument("--rooms", type=int, default=defaults.rooms)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--days", type=int, default=defaults.days)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", help="File to write the results to.")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare to.")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    scale = XLScale(
+        rooms=args.rooms,
+        seats=args.seats,
+        users=args.users,
+        days=args.days,
+        reservations=args.reservations,
+        seed=args.seed,
+    )
+    engine = reset_database()
+    try:
+        started = perf_counter()
+        with Session(engine) as session:
+            xl = generate(
+                session,
+                scale,
+                datetime.now(),
+                free_students=args.warmup + args.iterations,
+            )
+        generated = perf_counter() - started
+
+        results = {
+            "scale": asdict(scale),
+            "reservations": xl.reservations,
+            "states": {state.value: count for state, count in xl.states.items()},
+            "generate_seconds": generated,
+            "operations": benchmark(engine, xl, args.iterations, args.warmup),
+        }
+    finally:
+        engine.dispose()
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            found = regressions(results, json.load(file), args.threshold)
+        for regression in found:
+            print(regression, file=sys.stderr)
+        if found:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,315 @@
+"""Generator of a synthetic, semester-sized XL for benchmarking coworking services.
+
+The fake data modules used by tests hold a handful of seats and reservations, too few for
+query plans and in-memory passes to behave as they do in production. This module fills a
+database with a configurable XL instead: rooms, hundreds of seats, daily operating hours for
+a semester and a hundred thousand or more reservations whose states follow a realistic mix
+relative to the current moment. The semester is placed around the current moment, so that
+past, underway and upcoming reservations all exist.
+
+Rows are written with bulk inserts, and reservations never double book a seat, so the
+database's own constraints and triggers accept them as they would in production.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from random import Random
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from ...entities import PermissionEntity, UserEntity
+from ...entities.coworking import (
+    OperatingHoursEntity,
+    ReservationEntity,
+    RoomEntity,
+    SeatEntity,
+    reservation_seat_table,
+)
+from ...entities.coworking.reservation_user_table import reservation_user_table
+from ...models import User
+from ...models.coworking import ReservationState
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+_INSERT_BATCH_SIZE = 5000
+"""Rows written per insert statement."""
+
+_SLOT = timedelta(minutes=15)
+"""Reservations start and end on quarter hours, as the reservation UI offers."""
+
+
+@dataclass(frozen=True)
+class XLScale:
+    """Size of a synthetic XL."""
+
+    rooms: int = 8
+    """Rooms, the first of which is the common area of walk-in seats."""
+
+    seats: int = 400
+    """Seats, a quarter of which are in the common area."""
+
+    users: int = 5000
+    """Students making reservations."""
+
+    days: int = 120
+    """Days of operating hours in the semester."""
+
+    elapsed: float = 0.6
+    """Fraction of the semester already past."""
+
+    reservations: int = 120_000
+    """Reservations generated, if the seats' operating hours can hold them."""
+
+    seed: int = 0
+    """Seed of the random choices, so that a scale always generates the same XL."""
+
+
+@dataclass(frozen=True)
+class SyntheticXL:
+    """What was generated, for use by benchmarks."""
+
+    ambassador: User
+    """A user permitted to read every reservation."""
+
+    students: list[User]
+    """Users without any reservations, for benchmarks that draft reservations."""
+
+    seat_ids: list[int]
+    reservable_seat_ids: list[int]
+    operating_hours: list[tuple[datetime, datetime]]
+    reservations: int
+    states: dict[ReservationState, int]
+
+
+def generate(
+    session: Session,
+    scale: XLScale,
+    now: datetime,
+    free_students: int = 100,
+) -> SyntheticXL:
+    """Inserts a synthetic XL into an empty database and commits it.
+
+    Args:
+        session (Session): Session of a database whose tables exist and are empty.
+        scale (XLScale): Size of the XL.
+        now (datetime): The moment the semester is placed around.
+        free_students (int): Students left without reservations, beyond scale.users.
+
+    Returns:
+        SyntheticXL: The ambassador, students and seats benchmarks need.
+    """
+    rng = Random(scale.seed)
+
+    users = _insert_users(session, scale.users + free_students + 1)
+    ambassador, busy, free = (
+        users[0],
+        users[1 : scale.users + 1],
+        users[-free_students:],
+    )
+    session.add(
+        PermissionEntity(
+            user_id=ambassador.id, action="coworking.reservation.*", resource="*"
+        )
+    )
+
+    room_ids = _insert_rooms(session, scale.rooms)
+    seats = _insert_seats(session, scale.seats, room_ids)
+    operating_hours = _insert_operating_hours(session, scale, now)
+    states = _insert_reservations(
+        session, rng, scale, now, seats, operating_hours, [user.id for user in busy]
+    )
+    session.commit()
+    session.execute(text("ANALYZE"))
+
+    return SyntheticXL(
+        ambassador=ambassador,
+        students=free,
+        seat_ids=[id for id, _ in seats],
+        reservable_seat_ids=[id for id, reservable in seats if reservable],
+        operating_hours=operating_hours,
+        reservations=sum(states.values()),
+        states=states,
+    )
+
+
+def _insert_users(session: Session, count: int) -> list[User]:
+    rows = [
+        {
+            "pid": 700000000 + i,
+            "onyen": f"xl{i}",
+            "email": f"xl{i}@unc.edu",
+            "first_name": "Student",
+            "last_name": str(i),
+            "pronouns": "they / them",
+        }
+        for i in range(count)
+    ]
+    entities: list[UserEntity] = []
+    for i in range(0, count, _INSERT_BATCH_SIZE):
+        entities.extend(
+            session.scalars(
+                insert(UserEntity).returning(UserEntity),
+                rows[i : i + _INSERT_BATCH_SIZE],
+            )
+        )
+    return [entity.to_model() for entity in entities]
+
+
+def _insert_rooms(session: Session, count: int) -> list[str]:
+    rooms = [
+        {
+            "id": "SN156" if i == 0 else f"SN{200 + i}",
+            "building": "Sitterson",
+            "room": "156" if i == 0 else str(200 + i),
+            "nickname": "The XL Colab" if i == 0 else f"Group Room {i}",
+            "capacity": 0,
+            "reservable": i != 0,
+        }
+        for i in range(count)
+    ]
+    session.execute(insert(RoomEntity), rooms)
+    return [room["id"] for room in rooms]
+
+
+def _insert_seats(
+    session: Session, count: int, room_ids: list[str]
+) -> list[tuple[int, bool]]:
+    """Inserts seats, returning each seat's ID and whether it is reservable."""
+    common = max(1, count // 4)
+    rows = []
+    for i in range(count):
+        in_common_area = i < common or len(room_ids) == 1
+        rows.append(
+            {
+                "title": f"{'Common Area' if in_common_area else 'Sitting Desk'} {i}",
+                "shorthand": f"{'C' if in_common_area else 'S'}{i}",
+                "reservable": not in_common_area,
+                "has_monitor": i % 2 == 0,
+                "sit_stand": i % 5 == 0,
+                "x": i % 40,
+                "y": i // 40,
+                "room_id": (
+                    room_ids[0]
+                    if in_common_area
+                    else room_ids[1 + (i - common) % (len(room_ids) - 1)]
+                ),
+            }
+        )
+    entities = session.scalars(insert(SeatEntity).returning(SeatEntity), rows)
+    return [(entity.id, entity.reservable) for entity in entities]
+
+
+def _insert_operating_hours(
+    session: Session, scale: XLScale, now: datetime
+) -> list[tuple[datetime, datetime]]:
+    """Weekdays open 9am to 9pm and weekends noon to 6pm, across the semester."""
+    first_day = (now - timedelta(days=int(scale.days * scale.elapsed))).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    hours = []
+    for day in (first_day + timedelta(days=i) for i in range(scale.days)):
+        if day.weekday() < 5:
+            hours.append((day + timedelta(hours=9), day + timedelta(hours=21)))
+        else:
+            hours.append((day + timedelta(hours=12), day + timedelta(hours=18)))
+    session.execute(
+        insert(OperatingHoursEntity),
+        [{"start": start, "end": end} for start, end in hours],
+    )
+    return hours
+
+
+def _state(rng: Random, start: datetime, end: datetime, now: datetime):
+    """A reservation state typical of a reservation with the given bounds."""
+    if end <= now:
+        return (
+            ReservationState.CHECKED_OUT
+            if rng.random() < 0.75
+            else ReservationState.CANCELLED
+        )
+    if start <= now:
+        # Confirmed reservations past their check-in window would have been expired.
+        if start > now - timedelta(minutes=10) and rng.random() < 0.2:
+            return ReservationState.CONFIRMED
+        return ReservationState.CHECKED_IN
+    return (
+        ReservationState.CONFIRMED if rng.random() < 0.9 else ReservationState.CANCELLED
+    )
+
+
+def _insert_reservations(
+    session: Session,
+    rng: Random,
+    scale: XLScale,
+    now: datetime,
+    seats: list[tuple[int, bool]],
+    operating_hours: list[tuple[datetime, datetime]],
+    user_ids: list[int],
+) -> dict[ReservationState, int]:
+    """Lays reservations end to end, with random gaps, along each seat's open hours.
+
+    Reservations are placed one seat and day at a time, so that no two reservations of a
+    seat overlap. A user's reservations are not checked for overlap, which the reservation
+    service would reject but nothing in the database does."""
+    seat_days = len(seats) * len(operating_hours)
+    per_seat_day = scale.reservations / seat_days if seat_days else 0
+    states: dict[ReservationState, int] = {}
+    reservations: list[dict] = []
+    joins: list[tuple[int, int]] = []
+    for opens, closes in operating_hours:
+        for seat_id, reservable in seats:
+            # Spread a seat-day's reservations across its hours by scaling the gaps
+            # between them to the hours left over.
+            count = int(per_seat_day) + (rng.random() < per_seat_day % 1)
+            cursor = opens
+            for _ in range(count):
+                if len(reservations) >= scale.reservations:
+                    break
+                slots_left = int((closes - cursor) / _SLOT)
+                duration = rng.randint(2, 8) if reservable else rng.randint(2, 12)
+                if slots_left < duration:
+                    break
+                gap = rng.randint(0, (slots_left - duration) // count)
+                start = cursor + gap * _SLOT
+                end = start + duration * _SLOT
+                cursor = end
+                state = _state(rng, start, end, now)
+                states[state] = states.get(state, 0) + 1
+                reservations.append(
+                    {
+                        "start": start,
+                        "end": end,
+                        "state": state,
+                        "walkin": not reservable,
+                        "room_id": None,
+                        "created_at": start - timedelta(days=rng.randint(0, 7)),
+                        "updated_at": min(end, now),
+                    }
+                )
+                joins.append((seat_id, rng.choice(user_ids)))
+
+    for i in range(0, len(reservations), _INSERT_BATCH_SIZE):
+        ids = session.scalars(
+            insert(ReservationEntity).returning(
+                ReservationEntity.id, sort_by_parameter_order=True
+            ),
+            reservations[i : i + _INSERT_BATCH_SIZE],
+        ).all()
+        batch = joins[i : i + _INSERT_BATCH_SIZE]
+        session.execute(
+            insert(reservation_seat_table),
+            [
+                {"reservation_id": id, "seat_id": seat_id}
+                for id, (seat_id, _) in zip(ids, batch)
+            ],
+        )
+        session.execute(
+            insert(reservation_user_table),
+            [
+                {"reservation_id": id, "user_id": user_id}
+                for id, (_, user_id) in zip(ids, batch)
+            ],
+        )
+    return states
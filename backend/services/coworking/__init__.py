@@ -4,3 +4,5 @@ from .operating_hours import OperatingHoursService
 from .room import RoomService
 from .seat import SeatService
 from .reservation import ReservationService
+from .utilization import UtilizationService
+from .reservation_archive import ReservationArchiveService
@@ -0,0 +1,175 @@
+"""In-process cache of computed seat availability shared across requests.
+
+Every client of the coworking status endpoint polls for seat availability, yet reservations only
+change a few times per minute. Entries hold per-seat availability, as computed by the availability
+engine, for a window of time rounded out to whole buckets. Entries for reservable rooms, keyed
+apart from those for seats, hold per-room availability the same way. Entries are dropped whenever a
+reservation changes in this process and otherwise expire no later than the next moment the
+result could change on its own: a reservation expiring under policy or an operating hours
+boundary passing.
+
+The generation of the cache, which advances on every invalidation, doubles as the version of
+coworking state in this process and backs the ETag of the status endpoint. Edits to operating
+hours invalidate the cache once committed, wherever in the process they are made, as arranged
+in the operating_hours_index module.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Callable, Sequence
+from ...models.coworking import TimeRange, CacheStats
+from ...models.coworking.availability_engine import (
+    IntervalSet,
+    to_micros,
+    from_micros,
+    duration_micros,
+)
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+Availability = dict[int, IntervalSet] | dict[str, IntervalSet]
+"""Availability by seat ID or by room ID."""
+
+
+@dataclass
+class _Entry:
+    availability: Availability
+    expires_at: datetime
+
+
+class SeatAvailabilityCache:
+    """Thread-safe cache of per-seat IntervalSets keyed by seats, time bucket and slot width,
+    and of per-room IntervalSets keyed by rooms and time bucket."""
+
+    def __init__(
+        self,
+        bucket: timedelta = timedelta(minutes=1),
+        max_age: timedelta = timedelta(minutes=1),
+        max_entries: int = 256,
+    ):
+        """Initializes a new SeatAvailabilityCache.
+
+        Args:
+            bucket (timedelta): Requested bounds are widened to multiples of this duration so
+                that requests made moments apart share an entry.
+            max_age (timedelta): The longest an entry is used for, even if nothing changes.
+            max_entries (int): Upper bound on the number of entries retained.
+        """
+        self._bucket = duration_micros(bucket)
+        self._max_age = max_age
+        self._max_entries = max_entries
+        self._lock = Lock()
+        self._entries: dict[tuple, _Entry] = {}
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._listeners: list[Callable[[], None]] = []
+
+    def window(self, bounds: TimeRange) -> TimeRange:
+        """The bucket-aligned window an entry for the given bounds covers."""
+        start = to_micros(bounds.start) // self._bucket * self._bucket
+        end = -(-to_micros(bounds.end) // self._bucket) * self._bucket
+        return TimeRange.model_construct(start=from_micros(start), end=from_micros(end))
+
+    def key(
+        self, seat_ids: Sequence[int], window: TimeRange, slot_width: timedelta | None
+    ) -> tuple:
+        """Key of the entry for a set of seats, a window from `window` and a slot width."""
+        return (tuple(sorted(seat_ids)), window.start, window.end, slot_width)
+
+    def room_key(self, room_ids: Sequence[str], window: TimeRange) -> tuple:
+        """Key of the entry for a set of rooms and a window from `window`."""
+        return ("rooms", tuple(sorted(room_ids)), window.start, window.end)
+
+    def generation(self) -> int:
+        """Generation of the cache, which increases every time it is invalidated. It serves
+        as the version of coworking state in this process.
+
+        Read the generation before computing a value and pass it to `put` so that a value
+        computed concurrently with an invalidation is never stored."""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: tuple, now: datetime) -> Availability | None:
+        """Returns the cached availability for key, or None if absent or expired.
+
+        The returned interval sets are shared and must be copied before modification."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._hits += 1
+                return entry.availability
+            if entry is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+    def put(
+        self,
+        key: tuple,
+        availability: Availability,
+        now: datetime,
+        expires_at: datetime,
+        generation: int,
+    ) -> None:
+        """Stores availability under key until expires_at, bounded by the maximum age."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            if len(self._entries) >= self._max_entries:
+                self._evict_expired(now)
+            if len(self._entries) >= self._max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = _Entry(
+                availability, min(expires_at, now + self._max_age)
+            )
+
+    def invalidate(self) -> None:
+        """Drops all entries and notifies listeners. Called whenever reservations change."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._invalidations += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener()
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Registers a callback invoked after every invalidation. Listeners must not block."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]) -> None:
+        """Unregisters a callback registered with `add_listener`."""
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def stats(self) -> CacheStats:
+        """Hit, miss and invalidation counters since the process started."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                invalidations=self._invalidations,
+                entries=len(self._entries),
+            )
+
+    def _evict_expired(self, now: datetime) -> None:
+        expired = [
+            key for key, entry in self._entries.items() if entry.expires_at <= now
+        ]
+        for key in expired:
+            del self._entries[key]
+
+
+_seat_availability_cache = SeatAvailabilityCache()
+"""Process-wide cache instance shared by all requests."""
+
+
+def seat_availability_cache() -> SeatAvailabilityCache:
+    """Dependency injection of the process-wide SeatAvailabilityCache."""
+    return _seat_availability_cache
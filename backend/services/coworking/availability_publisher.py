@@ -0,0 +1,273 @@
+"""Publisher of live seat availability to subscribers of the availability stream.
+
+Rather than each client polling the status endpoint, subscribers receive a SeatAvailabilityDelta
+whenever the walk-in availability of any seat changes. Availability is computed once per change
+per walk-in search duration, on a background thread with its own database session, and fanned
+out to every subscriber with that duration.
+
+Changes are driven by invalidations of the seat availability cache, which ReservationService
+performs after every reservation write and expiry sweep. Availability is also recomputed every
+`refresh` interval to reflect reservations that lapse as time passes.
+
+Each subscriber has a bounded queue. A subscriber that falls behind by more than its queue holds
+has its pending deltas replaced by a single snapshot, so slow consumers cost the publisher
+a bounded amount of memory and never delay other subscribers.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from threading import Event, Lock, Thread
+from typing import Callable
+from sqlalchemy.orm import Session
+from ...models.coworking import SeatAvailabilityDelta, TimeRange
+from ...database import engine
+from .availability_cache import SeatAvailabilityCache, seat_availability_cache
+from .reservation import background_reservation_service
+from .seat import SeatService
+from .seat_catalog import seat_catalog_cache
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """A subscriber's view of the stream, consumed on the subscriber's event loop."""
+
+    def __init__(
+        self,
+        walkin_search_duration: timedelta,
+        loop: asyncio.AbstractEventLoop,
+        queue_size: int,
+    ):
+        self.walkin_search_duration = walkin_search_duration
+        self._loop = loop
+        self._queue: asyncio.Queue[SeatAvailabilityDelta] = asyncio.Queue(queue_size)
+        self.dropped = 0
+
+    async def next(self, timeout: float) -> SeatAvailabilityDelta | None:
+        """Waits for the next delta, returning None if none arrives within timeout seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def offer(self, delta: SeatAvailabilityDelta, snapshot: SeatAvailabilityDelta):
+        """Thread-safe delivery of a delta, or of snapshot if the subscriber fell behind."""
+        self._loop.call_soon_threadsafe(self._offer, delta, snapshot)
+
+    def _offer(self, delta: SeatAvailabilityDelta, snapshot: SeatAvailabilityDelta):
+        if not self._queue.full():
+            self._queue.put_nowait(delta)
+            return
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(snapshot)
+
+
+@dataclass
+class _Channel:
+    """Latest availability and subscribers for one walk-in search duration."""
+
+    seats: dict[int, list[TimeRange]] = field(default_factory=dict)
+    window_end: datetime = datetime.min
+    subscribers: list[Subscription] = field(default_factory=list)
+
+
+class SeatAvailabilityPublisher:
+    """Computes walk-in seat availability on change and fans deltas out to subscribers."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        availability_cache: SeatAvailabilityCache,
+        refresh: timedelta = timedelta(minutes=1),
+        queue_size: int = 8,
+    ):
+        """Initializes a new SeatAvailabilityPublisher.
+
+        Args:
+            session_factory (Callable[[], Session]): Opens a database session per computation.
+            availability_cache (SeatAvailabilityCache): Cache whose invalidations signal change.
+            refresh (timedelta): Longest time between computations while there are subscribers.
+            queue_size (int): Deltas buffered per subscriber before it is resynchronized.
+        """
+        self._session_factory = session_factory
+        self._availability_cache = availability_cache
+        self._refresh = refresh
+        self._queue_size = queue_size
+        self._lock = Lock()
+        self._channels: dict[timedelta, _Channel] = {}
+        self._version = 0
+        self._changed = Event()
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    def subscribe(
+        self, walkin_search_duration: timedelta, loop: asyncio.AbstractEventLoop
+    ) -> tuple[Subscription, SeatAvailabilityDelta]:
+        """Subscribes to changes in availability, computing it if no one else has.
+
+        Blocks on the database when availability for the duration has not been computed, so
+        call from a worker thread.
+
+        Returns:
+            tuple[Subscription, SeatAvailabilityDelta]: The subscription and a snapshot of
+                current availability to send first.
+        """
+        subscription = Subscription(walkin_search_duration, loop, self._queue_size)
+        with self._lock:
+            channel = self._channels.get(walkin_search_duration)
+        if channel is None:
+            now = datetime.now()
+            seats = self._compute(walkin_search_duration, now)
+            with self._lock:
+                channel = self._channels.setdefault(
+                    walkin_search_duration,
+                    _Channel(seats, now + walkin_search_duration),
+                )
+        with self._lock:
+            channel.subscribers.append(subscription)
+            return subscription, self._snapshot(channel)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stops delivery to subscription. Channels without subscribers are discarded."""
+        with self._lock:
+            channel = self._channels.get(subscription.walkin_search_duration)
+            if channel is None or subscription not in channel.subscribers:
+                return
+            channel.subscribers.remove(subscription)
+            if len(channel.subscribers) == 0:
+                del self._channels[subscription.walkin_search_duration]
+
+    def subscriber_count(self) -> int:
+        """The number of subscriptions across all walk-in search durations."""
+        with self._lock:
+            return sum(len(channel.subscribers) for channel in self._channels.values())
+
+    def notify(self) -> None:
+        """Signals that availability may have changed. Safe to call from any thread."""
+        self._changed.set()
+
+    def publish(self) -> None:
+        """Recomputes the availability of every channel and delivers what changed."""
+        now = datetime.now()
+        with self._lock:
+            durations = list(self._channels)
+        for duration in durations:
+            seats = self._compute(duration, now)
+            # Availability underway starts from the moment it was computed, which is
+            # slightly after now.
+            computed_at = datetime.now()
+            with self._lock:
+                channel = self._channels.get(duration)
+                if channel is None:
+                    continue
+                window_end = now + duration
+                changed = {
+                    seat_id: availability
+                    for seat_id, availability in seats.items()
+                    if _normalized(availability, computed_at, window_end)
+                    != _normalized(
+                        channel.seats.get(seat_id, []), computed_at, channel.window_end
+                    )
+                }
+                changed.update(
+                    {seat_id: [] for seat_id in channel.seats if seat_id not in seats}
+                )
+                channel.seats = seats
+                channel.window_end = window_end
+                if len(changed) == 0:
+                    continue
+                self._version += 1
+                delta = SeatAvailabilityDelta(
+                    version=self._version, snapshot=False, seats=changed
+                )
+                snapshot = self._snapshot(channel)
+                subscribers = list(channel.subscribers)
+            for subscription in subscribers:
+                subscription.offer(delta, snapshot)
+
+    def start(self) -> None:
+        """Starts publishing in the background."""
+        if self._thread is not None:
+            return
+        self._availability_cache.add_listener(self.notify)
+        self._stopped.clear()
+        self._thread = Thread(
+            target=self._run, name="seat-availability-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops publishing and waits for an in-progress computation to finish."""
+        if self._thread is None:
+            return
+        self._availability_cache.remove_listener(self.notify)
+        self._stopped.set()
+        self._changed.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._changed.wait(self._refresh.total_seconds())
+            self._changed.clear()
+            if self._stopped.is_set():
+                return
+            try:
+                self.publish()
+            except Exception:
+                logger.exception("Seat availability publish failed")
+
+    def _compute(
+        self, walkin_search_duration: timedelta, now: datetime
+    ) -> dict[int, list[TimeRange]]:
+        with self._session_factory() as session:
+            reservation_svc = background_reservation_service(
+                session, self._availability_cache
+            )
+            seats = SeatService(session, seat_catalog_cache()).list()
+            return {
+                seat.id: seat.availability
+                for seat in reservation_svc.seat_availability(
+                    seats, TimeRange(start=now, end=now + walkin_search_duration)
+                )
+                if seat.id is not None
+            }
+
+    def _snapshot(self, channel: _Channel) -> SeatAvailabilityDelta:
+        return SeatAvailabilityDelta(
+            version=self._version, snapshot=True, seats=dict(channel.seats)
+        )
+
+
+def _normalized(
+    availability: list[TimeRange], now: datetime, window_end: datetime
+) -> list[tuple]:
+    """Availability for comparison. The walk-in window slides forward with time, so ranges
+    already underway are equivalent regardless of start and ranges through the end of the
+    window are equivalent regardless of end."""
+    return [
+        (
+            None if time_range.start <= now else time_range.start,
+            None if time_range.end >= window_end else time_range.end,
+        )
+        for time_range in availability
+    ]
+
+
+_seat_availability_publisher = SeatAvailabilityPublisher(
+    lambda: Session(engine), seat_availability_cache()
+)
+"""Process-wide publisher, started and stopped with the application."""
+
+
+def seat_availability_publisher() -> SeatAvailabilityPublisher:
+    """Dependency injection of the process-wide SeatAvailabilityPublisher."""
+    return _seat_availability_publisher
@@ -0,0 +1,50 @@
+"""Callbacks run after a session commits writes to particular entities.
+
+In-memory structures derived from rarely edited tables, such as operating hours and seats, must
+be refreshed once an edit to them is committed, wherever in the process the edit is made.
+Mapper events note which sessions flushed writes to the entities of interest, and the callback
+runs after such a session commits. Rolled back writes are forgotten.
+"""
+
+from itertools import count
+from typing import Callable
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapper, Session, object_session
+from ...entities import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+_flags = count()
+
+
+def after_commit_of(
+    entities: list[type[EntityBase]], callback: Callable[[], None]
+) -> None:
+    """Runs callback after any session commits inserts, updates or deletes of entities.
+
+    Args:
+        entities (list[type[EntityBase]]): The entity classes whose writes are of interest.
+        callback (Callable[[], None]): Invoked once per commit including such writes.
+    """
+    flag = f"coworking.commit_hooks.{next(_flags)}"
+
+    def written(_mapper: Mapper, _connection: Connection, target: EntityBase) -> None:
+        session = object_session(target)
+        if session is not None:
+            session.info[flag] = True
+
+    def committed(session: Session) -> None:
+        if session.info.pop(flag, False):
+            callback()
+
+    def rolled_back(session: Session) -> None:
+        session.info.pop(flag, None)
+
+    for entity in entities:
+        for identifier in ("after_insert", "after_update", "after_delete"):
+            event.listen(entity, identifier, written)
+    event.listen(Session, "after_commit", committed)
+    event.listen(Session, "after_rollback", rolled_back)
@@ -0,0 +1,76 @@
+"""Background sweeper that transitions expired reservations out of active states.
+
+Read paths exclude expired reservations without writing to the database, so the stored state
+of a reservation lags its effective state until the sweeper runs. The sweeper applies the
+time-based transitions of ReservationService#expire_reservations on a fixed interval using its
+own database session.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from threading import Event, Thread
+from typing import Callable
+from sqlalchemy.orm import Session
+from .reservation import background_reservation_service
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationExpirySweeper:
+    """Periodically expires reservations on a daemon thread."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        interval: timedelta = timedelta(seconds=30),
+    ):
+        """Initializes a new ReservationExpirySweeper.
+
+        Args:
+            session_factory (Callable[[], Session]): Opens a new database session for each sweep.
+            interval (timedelta): Time between the end of one sweep and the start of the next.
+        """
+        self._session_factory = session_factory
+        self._interval = interval
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    def sweep(self, cutoff: datetime | None = None) -> int:
+        """Expires reservations as of cutoff, defaulting to now.
+
+        Returns:
+            int: The number of reservations transitioned.
+        """
+        with self._session_factory() as session:
+            reservation_svc = background_reservation_service(session)
+            return reservation_svc.expire_reservations(cutoff or datetime.now())
+
+    def start(self) -> None:
+        """Starts sweeping in the background, beginning immediately."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = Thread(
+            target=self._run, name="reservation-expiry-sweeper", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops sweeping and waits for an in-progress sweep to finish."""
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("Reservation expiry sweep failed")
+            self._stopped.wait(self._interval.total_seconds())
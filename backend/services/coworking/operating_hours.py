@@ -1,10 +1,12 @@
 """Service that manages operating hours of the XL."""
 
 from fastapi import Depends
+from datetime import datetime
 from sqlalchemy.orm import Session
 from ...database import db_session
 from ...models.coworking import OperatingHours, TimeRange
 from ...entities.coworking import OperatingHoursEntity
+from .operating_hours_index import OperatingHoursIndex, operating_hours_index
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -14,13 +16,19 @@ __license__ = "MIT"
 class OperatingHoursService:
     """OperatingHoursService is the access layer to the operating hours data model."""
 
-    def __init__(self, session: Session = Depends(db_session)):
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        index: OperatingHoursIndex = Depends(operating_hours_index),
+    ):
         """Initializes a new OperatingHoursService.
 
         Args:
             session (Session, optional): The database session to use, typically injected by FastAPI.
+            index (OperatingHoursIndex, optional): The in-memory index answering most schedule lookups.
         """
         self._session = session
+        self._index = index
 
     def schedule(self, time_range: TimeRange) -> list[OperatingHours]:
         """Returns all operating hours of the XL for a given date range.
@@ -31,6 +39,14 @@ class OperatingHoursService:
         Returns:
             list[OperatingHours]: All operating hours the XL within the given time_range, including overlaps.
         """
+        now = datetime.now()
+        if not self._index.is_fresh(now):
+            self._index.load(self._session, now)
+        schedule = self._index.schedule(time_range, now)
+        if schedule is not None:
+            return schedule
+
+        # The index does not cover the past, nor reflect an edit committed while loading.
         entities = (
             self._session.query(OperatingHoursEntity)
             .filter(
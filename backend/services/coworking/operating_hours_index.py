@@ -0,0 +1,126 @@
+"""In-memory index of upcoming operating hours.
+
+Operating hours change perhaps weekly, yet every status request and reservation draft looks
+them up. The index holds every operating hours entry ending after a recent moment, sorted by
+start, and answers schedule lookups by bisection. Committed edits to operating hours made
+anywhere in this process mark the index stale, as does age, bounding how long edits made by
+other processes go unseen. Lookups the index cannot answer fall back to the database.
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from sqlalchemy.orm import Session
+from ...entities.coworking import OperatingHoursEntity
+from ...models.coworking import OperatingHours, TimeRange
+from .availability_cache import seat_availability_cache
+from .commit_hooks import after_commit_of
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    version: int
+    loaded_at: datetime
+    covers_from: datetime
+    starts: list[datetime]
+    hours: list[OperatingHours]
+    longest: timedelta
+
+
+class OperatingHoursIndex:
+    """Thread-safe, sorted index of operating hours answering schedule lookups by bisection."""
+
+    def __init__(
+        self,
+        history: timedelta = timedelta(days=1),
+        max_age: timedelta = timedelta(minutes=5),
+    ):
+        """Initializes a new, empty OperatingHoursIndex.
+
+        Args:
+            history (timedelta): How far before the moment of loading the index covers.
+            max_age (timedelta): How long a load is trusted without a local edit.
+        """
+        self._history = history
+        self._max_age = max_age
+        self._lock = Lock()
+        self._version = 0
+        self._snapshot: _Snapshot | None = None
+
+    def schedule(
+        self, time_range: TimeRange, now: datetime
+    ) -> list[OperatingHours] | None:
+        """Operating hours overlapping time_range, ordered by start, or None if the index is
+        stale or does not cover time_range."""
+        snapshot = self._snapshot
+        if not self._is_fresh(snapshot, now) or time_range.start < snapshot.covers_from:
+            return None
+        # No entry starting before the range by more than the longest entry can overlap it.
+        low = bisect_left(snapshot.starts, time_range.start - snapshot.longest)
+        high = bisect_right(snapshot.starts, time_range.end)
+        return [
+            hours for hours in snapshot.hours[low:high] if hours.end >= time_range.start
+        ]
+
+    def is_fresh(self, now: datetime) -> bool:
+        """Whether the index reflects every committed edit made in this process."""
+        return self._is_fresh(self._snapshot, now)
+
+    def load(self, session: Session, now: datetime) -> None:
+        """Loads all operating hours ending after `history` before now into the index."""
+        with self._lock:
+            version = self._version
+        covers_from = now - self._history
+        hours = [
+            entity.to_model()
+            for entity in session.query(OperatingHoursEntity)
+            .filter(OperatingHoursEntity.end >= covers_from)
+            .order_by(OperatingHoursEntity.start)
+            .all()
+        ]
+        snapshot = _Snapshot(
+            version,
+            now,
+            covers_from,
+            [entry.start for entry in hours],
+            hours,
+            max((entry.end - entry.start for entry in hours), default=timedelta(0)),
+        )
+        with self._lock:
+            # An edit committed during the load may be missing from it.
+            if version == self._version:
+                self._snapshot = snapshot
+
+    def invalidate(self) -> None:
+        """Marks the index stale. Called after operating hours edits are committed."""
+        with self._lock:
+            self._version += 1
+
+    def _is_fresh(self, snapshot: _Snapshot | None, now: datetime) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.version == self._version
+            and snapshot.loaded_at <= now < snapshot.loaded_at + self._max_age
+        )
+
+
+_operating_hours_index = OperatingHoursIndex()
+"""Process-wide index shared by all requests."""
+
+
+def operating_hours_index() -> OperatingHoursIndex:
+    """Dependency injection of the process-wide OperatingHoursIndex."""
+    return _operating_hours_index
+
+
+def _operating_hours_committed() -> None:
+    _operating_hours_index.invalidate()
+    seat_availability_cache().invalidate()
+
+
+after_commit_of([OperatingHoursEntity], _operating_hours_committed)
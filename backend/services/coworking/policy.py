@@ -1,10 +1,21 @@
 """Service that manages policies around the reservation system."""
 
+from dataclasses import fields
 from fastapi import Depends
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from datetime import timedelta
+from datetime import datetime, timedelta
 from ...database import db_session
+from ...entities import user_role_table
+from ...entities.coworking import RolePolicyEntity
 from ...models import User
+from .policy_cache import (
+    DEFAULT_POLICY,
+    CoworkingPolicy,
+    PolicyCache,
+    RoleSet,
+    policy_cache,
+)
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -12,45 +23,122 @@ __license__ = "MIT"
 
 
 class PolicyService:
-    """RoleService is the access layer to the role data model, its members, and permissions.
+    """PolicyService is the access layer to the policies of the reservation system.
 
-    We are carving out a simple service for looking up policies in anticipation of having different policies
-    for different groups of users (e.g. majors, ambassadors, LAs, etc).
+    Policies differ for different groups of users (e.g. majors, ambassadors, LAs, etc). Each role
+    may grant its members policies that differ from the defaults. A member of several roles is
+    granted the most generous of each policy among them.
+
+    A subject's policies are resolved once per request, into an immutable CoworkingPolicy, and
+    every policy lookup after is a dictionary lookup. Resolved policies are shared across requests
+    by users with the same roles through the process-wide PolicyCache.
     """
 
-    def __init__(self):
-        ...
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        cache: PolicyCache = Depends(policy_cache),
+    ):
+        """Initializes a new PolicyService.
+
+        Args:
+            session (Session): The database session to use, typically injected by FastAPI.
+            cache (PolicyCache): Process-wide cache of users' roles and the policies resolved
+                for them.
+        """
+        self._session = session
+        self._cache = cache
+        self._resolved: dict[int, CoworkingPolicy] = {}
+
+    def policy(self, subject: User | None) -> CoworkingPolicy:
+        """The policies applying to the subject, resolved once per service and so per request.
+
+        Args:
+            subject (User | None): The user whose policies are resolved, None for the defaults.
+
+        Returns:
+            CoworkingPolicy: The subject's policies.
+        """
+        if subject is None or subject.id is None:
+            return DEFAULT_POLICY
+        policy = self._resolved.get(subject.id)
+        if policy is None:
+            now = datetime.now()
+            roles = self._cache.roles(
+                subject.id, now, lambda: self._load_roles(subject.id)
+            )
+            policy = self._cache.policy(roles, now, lambda: self._resolve(roles))
+            self._resolved[subject.id] = policy
+        return policy
 
-    def walkin_window(self, _subject: User) -> timedelta:
+    def _load_roles(self, user_id: int) -> RoleSet:
+        return frozenset(
+            self._session.scalars(
+                select(user_role_table.c.role_id).where(
+                    user_role_table.c.user_id == user_id
+                )
+            )
+        )
+
+    def _resolve(self, roles: RoleSet) -> CoworkingPolicy:
+        """The most generous of each policy granted by the roles, or the default."""
+        if len(roles) == 0:
+            return DEFAULT_POLICY
+        granted: dict[str, list] = {}
+        for role_policy in self._session.scalars(
+            select(RolePolicyEntity).where(RolePolicyEntity.role_id.in_(roles))
+        ):
+            for name, value in role_policy.overrides().items():
+                granted.setdefault(name, []).append(value)
+        if len(granted) == 0:
+            return DEFAULT_POLICY
+        return CoworkingPolicy(
+            **{
+                field.name: max(
+                    granted.get(field.name, [getattr(DEFAULT_POLICY, field.name)])
+                )
+                for field in fields(CoworkingPolicy)
+            }
+        )
+
+    def walkin_window(self, subject: User) -> timedelta:
         """How far into the future can walkins be reserved?"""
-        return timedelta(minutes=30)
+        return self.policy(subject).walkin_window
 
-    def walkin_initial_duration(self, _subject: User) -> timedelta:
+    def walkin_initial_duration(self, subject: User) -> timedelta:
         """When making a walkin, this sets how long the initial reservation is for."""
-        return timedelta(hours=2)
+        return self.policy(subject).walkin_initial_duration
 
-    def reservation_window(self, _subject: User) -> timedelta:
+    def reservation_window(self, subject: User) -> timedelta:
         """Returns the number of days in advance the user can make reservations."""
-        return timedelta(weeks=1)
+        return self.policy(subject).reservation_window
+
+    def maximum_party_size(self, subject: User) -> int:
+        """The most users a single reservation can seat together, such as at a table."""
+        return self.policy(subject).maximum_party_size
 
     def minimum_reservation_duration(self) -> timedelta:
         """The minimum amount of time a reservation can be made for."""
         return timedelta(minutes=10)
 
-    def maximum_initial_reservation_duration(self, _subject: User) -> timedelta:
+    def maximum_initial_reservation_duration(self, subject: User) -> timedelta:
         """The maximum amount of time a reservation can be made for before extending."""
-        return timedelta(hours=2)
+        return self.policy(subject).maximum_initial_reservation_duration
 
-    # Implement and involve in testing once extending a reservation functionality is added.
-    # def extend_window(self, _subject: User) -> timedelta:
-    #     """When no reservation follows a given reservation, within this period preceeding the end of a reservation the user is able to extend their reservation by an hour."""
-    #     return timedelta(minutes=15 * -1)
+    def extend_window(self, subject: User) -> timedelta:
+        """When no reservation follows a given reservation, within this period preceeding the end of a reservation the user is able to extend their reservation."""
+        return self.policy(subject).extend_window
 
-    # def extend_duration(self, _subject: User) -> timedelta:
-    #     return timedelta(hours=1)
+    def extend_duration(self, subject: User) -> timedelta:
+        """The most a reservation can be extended by at once."""
+        return self.policy(subject).extend_duration
 
     def reservation_draft_timeout(self) -> timedelta:
         return timedelta(minutes=5)
 
     def reservation_checkin_timeout(self) -> timedelta:
         return timedelta(minutes=10)
+
+    def reservation_archive_age(self) -> timedelta:
+        """How long after ending a cancelled or checked out reservation is archived."""
+        return timedelta(days=30)
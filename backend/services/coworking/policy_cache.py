@@ -0,0 +1,123 @@
+"""Process-wide cache of the coworking policies resolved for each user's roles.
+
+Drafting a reservation, computing seat availability or a user's status consults policies many
+times per request. Policies are granted per role, so resolving them means reading a user's roles
+and the policies of those roles. Both are cached: the role set of each user, and the policy
+resolved for each distinct role set, which users with the same roles share. Both are dropped once
+a committed edit to users, roles or role policies in this process, or age, makes them stale.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Callable, TypeVar
+from ...entities import RoleEntity, UserEntity
+from ...entities.coworking import RolePolicyEntity
+from .commit_hooks import after_commit_of
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+RoleSet = frozenset[int]
+"""The IDs of the roles a user is a member of."""
+
+
+@dataclass(frozen=True)
+class CoworkingPolicy:
+    """The policies applying to a user, resolved from their roles."""
+
+    walkin_window: timedelta = timedelta(minutes=30)
+    walkin_initial_duration: timedelta = timedelta(hours=2)
+    reservation_window: timedelta = timedelta(weeks=1)
+    maximum_party_size: int = 6
+    maximum_initial_reservation_duration: timedelta = timedelta(hours=2)
+    extend_window: timedelta = timedelta(minutes=15)
+    extend_duration: timedelta = timedelta(hours=1)
+
+
+DEFAULT_POLICY = CoworkingPolicy()
+"""Policies of users without a role granting different ones."""
+
+_V = TypeVar("_V")
+
+
+class PolicyCache:
+    """Thread-safe cache of the role sets of users and the policies resolved for role sets."""
+
+    def __init__(
+        self, max_age: timedelta = timedelta(minutes=5), max_users: int = 10_000
+    ):
+        """Initializes a new, empty PolicyCache.
+
+        Args:
+            max_age (timedelta): How long cached roles and policies are trusted without a local
+                edit, bounding how long edits made by other processes go unseen.
+            max_users (int): The most users whose role sets are cached.
+        """
+        self._max_age = max_age
+        self._max_users = max_users
+        self._lock = Lock()
+        self._version = 0
+        self._loaded_at: datetime | None = None
+        self._roles: dict[int, RoleSet] = {}
+        self._policies: dict[RoleSet, CoworkingPolicy] = {}
+
+    def roles(
+        self, user_id: int, now: datetime, load: Callable[[], RoleSet]
+    ) -> RoleSet:
+        """The role set of a user, loaded if not cached."""
+        return self._get(self._roles, user_id, now, load, self._max_users)
+
+    def policy(
+        self, roles: RoleSet, now: datetime, load: Callable[[], CoworkingPolicy]
+    ) -> CoworkingPolicy:
+        """The policy resolved for a role set, loaded if not cached."""
+        return self._get(self._policies, roles, now, load)
+
+    def invalidate(self) -> None:
+        """Drops every cached role set and policy. Called after edits to users, roles or role
+        policies are committed."""
+        with self._lock:
+            self._version += 1
+            self._roles.clear()
+            self._policies.clear()
+
+    def _get(
+        self,
+        entries: dict,
+        key,
+        now: datetime,
+        load: Callable[[], _V],
+        max_entries: int | None = None,
+    ) -> _V:
+        with self._lock:
+            if self._loaded_at is None or now >= self._loaded_at + self._max_age:
+                self._loaded_at = now
+                self._roles.clear()
+                self._policies.clear()
+            value = entries.get(key)
+            version = self._version
+        if value is not None:
+            return value
+
+        value = load()
+        with self._lock:
+            # A value loaded while an edit committed is used only for this request.
+            if version == self._version and (
+                max_entries is None or len(entries) < max_entries
+            ):
+                entries[key] = value
+        return value
+
+
+_policy_cache = PolicyCache()
+"""Process-wide cache shared by all requests."""
+
+
+def policy_cache() -> PolicyCache:
+    """Dependency injection of the process-wide PolicyCache."""
+    return _policy_cache
+
+
+after_commit_of([UserEntity, RoleEntity, RolePolicyEntity], _policy_cache.invalidate)
@@ -1,35 +1,101 @@
 """Service that manages reservations in the coworking space."""
 
+from base64 import b64encode, urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
 from fastapi import Depends
 from datetime import datetime, timedelta
+from heapq import nsmallest
 from random import random
-from typing import Sequence
-from sqlalchemy.orm import Session, joinedload
+from typing import Callable, Iterable, Sequence
+from sqlalchemy import ColumnElement, and_, not_, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import Range
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
 from ...database import db_session
 from ...models.user import User, UserIdentity
 from ..exceptions import UserPermissionException, ResourceNotFoundException
 from ...models.coworking import (
+    Room,
+    RoomAvailability,
+    RoomDetails,
     Seat,
     Reservation,
+    ReservationDetails,
     ReservationRequest,
     ReservationPartial,
+    ReservationPage,
+    ReservationDraftResult,
     TimeRange,
     SeatAvailability,
+    SeatAvailabilityGrid,
+    SeatSearch,
     ReservationState,
     AvailabilityList,
     OperatingHours,
+    CacheStats,
+)
+from ...models.coworking.availability_engine import (
+    IntervalSet,
+    SlotGrid,
+    to_micros,
+    from_micros,
+    duration_micros,
 )
 from ...entities import UserEntity
-from ...entities.coworking import ReservationEntity, SeatEntity
+from ...entities.coworking import (
+    ReservationEntity,
+    RoomEntity,
+    SeatEntity,
+    reservation_seat_table,
+)
 from .seat import SeatService
 from .policy import PolicyService
+from .policy_cache import policy_cache
 from .operating_hours import OperatingHoursService
+from .operating_hours_index import operating_hours_index
+from .seat_catalog import seat_catalog_cache
+from .availability_cache import SeatAvailabilityCache, seat_availability_cache
+from .upcoming_reservation_index import (
+    Booked,
+    UpcomingReservationIndex,
+    upcoming_reservation_index,
+)
+from .utilization import record_utilization, reservation_utilization, utilization
 from ..permission import PermissionService
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+MINUMUM_RESERVATION_EPSILON = timedelta(minutes=1)
+"""Fudge factor allowed when comparing availability against the minimum reservation duration."""
+
+AMBASSADOR_PAGE_SIZE = 25
+"""Default number of reservations in a page of the ambassador's reservation list."""
+
+MAXIMUM_PAGE_SIZE = 100
+"""Largest page of reservations a client may request."""
+
+_AMBASSADOR_STATES = (
+    ReservationState.CONFIRMED,
+    ReservationState.CHECKED_IN,
+    ReservationState.CHECKED_OUT,
+)
+"""States of the reservations listed for ambassadors."""
+
+MINIMUM_SLOT_WIDTH = timedelta(minutes=5)
+"""Narrowest slot of a seat availability grid."""
+
+MAXIMUM_GRID_SLOTS = 4096
+"""Most slots in a seat availability grid, about two weeks of five minute slots."""
+
+MAXIMUM_BATCH_SIZE = 50
+"""Most reservations drafted in one batch, enough to seat a class."""
+
+_EXCLUSION_VIOLATION = "23P01"
+"""SQLSTATE of a write that would double book a seat."""
+
 
 class ReservationException(Exception):
     def __init__(self, message: str):
@@ -46,19 +112,27 @@ class ReservationService:
         policy_svc: PolicyService = Depends(),
         operating_hours_svc: OperatingHoursService = Depends(),
         seats_svc: SeatService = Depends(),
+        availability_cache: SeatAvailabilityCache = Depends(seat_availability_cache),
+        upcoming_index: UpcomingReservationIndex = Depends(upcoming_reservation_index),
     ):
         """Initializes a new ReservationService.
 
         Args:
             session (Session): The database session to use, typically injected by FastAPI.
+            availability_cache (SeatAvailabilityCache): Process-wide cache of seat availability,
+                invalidated by this service whenever it changes reservations.
+            upcoming_index (UpcomingReservationIndex): Process-wide index of upcoming
+                reservation starts, consulted to find until when reservations can be extended.
         """
         self._session = session
         self._permission_svc = permission_svc
         self._policy_svc = policy_svc
         self._operating_hours_svc = operating_hours_svc
         self._seat_svc = seats_svc
+        self._availability_cache = availability_cache
+        self._upcoming_index = upcoming_index
 
-    def get_reservation(self, subject: User, id: int) -> Reservation:
+    def get_reservation(self, subject: User, id: int) -> ReservationDetails:
         """Lookup a reservation by ID.
 
         Args:
@@ -66,7 +140,7 @@ class ReservationService:
             id (int): The ID of the reservation being retrieved
 
         Returns:
-            Reservation: Reservation with the requested ID.
+            ReservationDetails: Reservation with the requested ID and whether it can be extended.
 
         Raises:
             UserPermissionException
@@ -89,11 +163,11 @@ class ReservationService:
         if not has_permission:
             raise UserPermissionException("coworking.reservation.read", "user/")
 
-        return reservation.to_model()
+        return self._details(reservation.to_model(), subject, datetime.now())
 
     def get_current_reservations_for_user(
         self, subject: User, focus: User
-    ) -> Sequence[Reservation]:
+    ) -> Sequence[ReservationDetails]:
         """Find current and upcoming reservations for a given user.
         The subject must either also be the focus or have permission to view reservations of
         the given user. The permission needed is action "coworking.reservation.read" and
@@ -104,7 +178,8 @@ class ReservationService:
             focus (User): The user whose reservations are being retrieved
 
         Returns:
-            Sequence[Reservation]: Upcoming reservations for the user.
+            Sequence[ReservationDetails]: Upcoming reservations for the user, and whether each
+                can be extended.
 
         Raises:
             UserPermissionException"""
@@ -120,34 +195,183 @@ class ReservationService:
             start=now - timedelta(days=1),
             end=now + self._policy_svc.reservation_window(focus),
         )
-        return self._get_active_reservations_for_user(focus, time_range)
+        return [
+            self._details(reservation, focus, now)
+            for reservation in self._get_active_reservations_for_user(focus, time_range)
+        ]
+
+    def _details(
+        self, reservation: Reservation, subject: User, now: datetime
+    ) -> ReservationDetails:
+        """The reservation with whether, from when and until when it can be extended."""
+        extendable_at, extendable_until = self._extension(reservation, subject, now)
+        return ReservationDetails(
+            **dict(reservation),
+            extendable=extendable_until is not None,
+            extendable_at=extendable_at,
+            extendable_until=extendable_until,
+        )
+
+    def _extension(
+        self,
+        reservation: Reservation,
+        subject: User,
+        now: datetime,
+        fresh: bool = False,
+    ) -> tuple[datetime | None, datetime | None]:
+        """When a reservation becomes extendable and, if it is now, the latest it may be
+        extended until.
+
+        A confirmed or checked-in reservation is extendable within the policy's extend window
+        before it ends, by up to the policy's extend duration, until the XL closes or its seats
+        or room are next reserved, whichever is first.
+
+        Args:
+            reservation (Reservation): The reservation to extend.
+            subject (User): The user whose policies apply.
+            now (datetime): The current moment.
+            fresh (bool): Whether to read the next reservation from the database rather than
+                the upcoming reservation index, as when writing the extension.
+
+        Returns:
+            tuple[datetime | None, datetime | None]: When the reservation becomes extendable,
+                None if it never will, and the latest end it may be extended to, None unless
+                it is extendable now.
+        """
+        if (
+            reservation.state
+            not in (ReservationState.CONFIRMED, ReservationState.CHECKED_IN)
+            or now >= reservation.end
+        ):
+            return None, None
+        extendable_at = reservation.end - self._policy_svc.extend_window(subject)
+        if now < extendable_at:
+            return extendable_at, None
+
+        until = reservation.end + self._policy_svc.extend_duration(subject)
+        for hours in self._operating_hours_svc.schedule(
+            TimeRange(start=reservation.end, end=until)
+        ):
+            if hours.start <= reservation.end < hours.end:
+                until = min(until, hours.end)
+                break
+        else:
+            return extendable_at, None
+
+        booked: list[Booked] = [seat.id for seat in reservation.seats]
+        if reservation.room is not None:
+            booked.append(reservation.room.id)
+        until = self._next_start(booked, reservation.end, until, now, fresh)
+        return extendable_at, until if until > reservation.end else None
+
+    def _next_start(
+        self,
+        booked: Sequence[Booked],
+        after: datetime,
+        until: datetime,
+        now: datetime,
+        fresh: bool = False,
+    ) -> datetime:
+        """The earliest start from after of an active reservation of any of the seats or
+        rooms booked, or until if none starts before it.
+
+        The upcoming reservation index answers by bisection, and is reloaded with one query
+        when reservations have changed since it loaded. Should a change race the reload, or
+        fresh be requested, the database is queried instead."""
+        if not fresh:
+            generation = self._availability_cache.generation()
+            if not self._upcoming_index.is_fresh(now, generation):
+                self._load_upcoming_index(now, generation)
+            next_start = self._upcoming_index.next_start(
+                booked, after, until, now, generation
+            )
+            if next_start is not None:
+                return next_start
+
+        seat_ids = [id for id in booked if isinstance(id, int)]
+        room_ids = [id for id in booked if isinstance(id, str)]
+        next_start = self._session.scalar(
+            select(ReservationEntity.start)
+            .where(
+                ReservationEntity.start >= after,
+                ReservationEntity.start < until,
+                or_(
+                    ReservationEntity.id.in_(
+                        select(reservation_seat_table.c.reservation_id).where(
+                            reservation_seat_table.c.seat_id.in_(seat_ids)
+                        )
+                    ),
+                    ReservationEntity.room_id.in_(room_ids),
+                ),
+                self._unexpired_criteria(now),
+            )
+            .order_by(ReservationEntity.start)
+            .limit(1)
+        )
+        return until if next_start is None else next_start
+
+    def _load_upcoming_index(self, now: datetime, generation: int) -> None:
+        """Loads the starts of the active reservations of every seat and room beginning
+        within the index's horizon, in one query."""
+        rows = self._session.execute(
+            select(
+                reservation_seat_table.c.seat_id,
+                ReservationEntity.room_id,
+                ReservationEntity.start,
+            )
+            .select_from(ReservationEntity)
+            .outerjoin(
+                reservation_seat_table,
+                reservation_seat_table.c.reservation_id == ReservationEntity.id,
+            )
+            .where(
+                ReservationEntity.start >= now,
+                ReservationEntity.start < now + self._upcoming_index.horizon,
+                self._unexpired_criteria(now),
+            )
+        )
+        self._upcoming_index.load(
+            now,
+            generation,
+            (
+                (seat_id if seat_id is not None else room_id, start)
+                for seat_id, room_id, start in rows
+            ),
+        )
 
     def _get_active_reservations_for_user(
         self, focus: UserIdentity, time_range: TimeRange
     ) -> Sequence[Reservation]:
+        return self._get_active_reservations_for_users([focus.id], time_range).get(
+            focus.id, []
+        )
+
+    def _get_active_reservations_for_users(
+        self, user_ids: Iterable[int], time_range: TimeRange
+    ) -> dict[int, list[Reservation]]:
+        """Active reservations overlapping time_range of any of the users, retrieved in one
+        query and grouped by user. Users without reservations are omitted."""
+        ids = set(user_ids)
+        now = datetime.now()
         reservations = (
             self._session.query(ReservationEntity)
-            .join(ReservationEntity.users)
             .filter(
                 ReservationEntity.start < time_range.end,
                 ReservationEntity.end > time_range.start,
-                ReservationEntity.state.not_in(
-                    [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
-                ),
-                UserEntity.id == focus.id,
-            )
-            .options(
-                joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
+                self._unexpired_criteria(now),
+                ReservationEntity.users.any(UserEntity.id.in_(ids)),
             )
+            .options(*ReservationEntity.bulk_load_options())
             .order_by(ReservationEntity.start)
             .all()
         )
 
-        reservations = self._state_transition_reservation_entities_by_time(
-            datetime.now(), reservations
-        )
-
-        return [reservation.to_model() for reservation in reservations]
+        reservations_by_user: dict[int, list[Reservation]] = {}
+        for reservation in ReservationEntity.to_models(reservations):
+            for user in reservation.users:
+                if user.id in ids:
+                    reservations_by_user.setdefault(user.id, []).append(reservation)
+        return reservations_by_user
 
     def get_seat_reservations(
         self, seats: Sequence[Seat], time_range: TimeRange
@@ -161,34 +385,42 @@ class ReservationService:
         Returns:
             Sequence[Reservation]: All reservations for the seats within the given time_range, including overlaps.
         """
+        now = datetime.now()
+        # Served by the GiST index of the seat exclusion constraint, which covers the
+        # periods of every active reservation's seats.
+        seat_reservations = self._seat_reservation_ids(
+            [seat.id for seat in seats], time_range
+        )
         reservations = (
             self._session.query(ReservationEntity)
-            .join(ReservationEntity.seats)
             .filter(
-                ReservationEntity.start < time_range.end,
-                ReservationEntity.end > time_range.start,
-                ReservationEntity.state.not_in(
-                    [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
-                ),
-                SeatEntity.id.in_([seat.id for seat in seats]),
-            )
-            .options(
-                joinedload(ReservationEntity.seats), joinedload(ReservationEntity.users)
+                ReservationEntity.id.in_(seat_reservations),
+                self._unexpired_criteria(now),
             )
+            .options(*ReservationEntity.bulk_load_options())
             .all()
         )
 
-        reservations = self._state_transition_reservation_entities_by_time(
-            datetime.now(), reservations
+        return ReservationEntity.to_models(reservations)
+
+    @staticmethod
+    def _seat_reservation_ids(seat_ids: Sequence[int], time_range: TimeRange):
+        """Subquery of the IDs of reservations of the seats whose stored state is active
+        and that overlap time_range."""
+        return select(reservation_seat_table.c.reservation_id).where(
+            reservation_seat_table.c.active,
+            reservation_seat_table.c.period.overlaps(
+                Range(time_range.start, time_range.end, bounds="[)")
+            ),
+            reservation_seat_table.c.seat_id.in_(seat_ids),
         )
 
-        return [reservation.to_model() for reservation in reservations]
+    def expire_reservations(self, cutoff: datetime) -> int:
+        """Transitions reservations whose time has passed into their final states.
 
-    def _state_transition_reservation_entities_by_time(
-        self, cutoff: datetime, reservations: Sequence[ReservationEntity]
-    ) -> Sequence[ReservationEntity]:
-        """Private, internal helper method for transitioning reservation entities
-        based on time. Three transitions are time-based:
+        Called periodically by the ReservationExpirySweeper rather than on read paths, which
+        instead exclude expired reservations using the same rules. Three transitions are
+        time-based:
 
         1. Draft -> Cancelled following PolicyService#reservation_draft_timeout() after
            the reservation's created at.
@@ -197,139 +429,537 @@ class ReservationService:
         3. Checked In -> Checked Out following the reservation's end.
 
         Args:
-            moment (datetime): The time in which checks of expiration are made against. In
+            cutoff (datetime): The time in which checks of expiration are made against. In
                 production, this is the current time.
-            reservations (Sequence[ReservationEntity]): The list of entities to state transition.
 
         Returns:
-            Sequence[ReservationEntity] - All ReservationEntities that were not state transitioned.
+            int: The number of reservations transitioned.
         """
-        valid: list[ReservationEntity] = []
-        dirty = False
-        for reservation in reservations:
-            if (
-                reservation.state == ReservationState.DRAFT
-                and reservation.created_at
-                + self._policy_svc.reservation_draft_timeout()
-                < cutoff
-            ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
-            elif (
-                reservation.state == ReservationState.CONFIRMED
-                and reservation.start + self._policy_svc.reservation_checkin_timeout()
-                < cutoff
-            ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
-            elif (
-                reservation.state == ReservationState.CHECKED_IN
-                and reservation.end <= cutoff
-            ):
-                reservation.state = ReservationState.CHECKED_OUT
-                dirty = True
-            else:
-                valid.append(reservation)
-
-        if dirty:
-            self._session.commit()
+        expired = self._expire(cutoff)
+        self._session.commit()
+        if expired > 0:
+            self._availability_cache.invalidate()
+
+        return expired
+
+    def _expire(self, cutoff: datetime, seat_ids: Sequence[int] | None = None) -> int:
+        """Applies the time-based transitions as of cutoff without committing, limited to
+        reservations of seat_ids when given."""
+        criteria = []
+        if seat_ids is not None:
+            criteria.append(ReservationEntity.seats.any(SeatEntity.id.in_(seat_ids)))
+        expired = 0
+        for state, is_expired, final_state in self._expiry_rules(cutoff):
+            rows = self._session.execute(
+                update(ReservationEntity)
+                .where(ReservationEntity.state == state, is_expired, *criteria)
+                .values(state=final_state)
+                .returning(
+                    ReservationEntity.id, ReservationEntity.start, ReservationEntity.end
+                )
+                .execution_options(synchronize_session="fetch")
+            ).all()
+            expired += len(rows)
+            # Confirmed reservations nobody checked in to are no-shows.
+            if state == ReservationState.CONFIRMED and len(rows) > 0:
+                self._record_no_shows(rows)
+        return expired
+
+    def _record_no_shows(self, rows: Sequence[tuple[int, datetime, datetime]]):
+        """Records reservations cancelled by the sweeper as no-shows in the utilization
+        rollup, given the (id, start, end) of each."""
+        room_ids: dict[int, list[str]] = {}
+        for reservation_id, room_id in self._session.execute(
+            select(reservation_seat_table.c.reservation_id, SeatEntity.room_id)
+            .join(SeatEntity, SeatEntity.id == reservation_seat_table.c.seat_id)
+            .where(
+                reservation_seat_table.c.reservation_id.in_([row[0] for row in rows])
+            )
+        ):
+            room_ids.setdefault(reservation_id, []).append(room_id)
+        record_utilization(
+            self._session,
+            [
+                (
+                    utilization(
+                        ReservationState.CONFIRMED, start, end, room_ids.get(id, [])
+                    ),
+                    utilization(
+                        ReservationState.CANCELLED,
+                        start,
+                        end,
+                        room_ids.get(id, []),
+                        no_show=True,
+                    ),
+                )
+                for id, start, end in rows
+            ],
+        )
 
-        return valid
+    def _expiry_rules(
+        self, cutoff: datetime
+    ) -> list[tuple[ReservationState, ColumnElement[bool], ReservationState]]:
+        """The time-based transitions as of cutoff, as (state, expired criteria, final state)."""
+        return [
+            (
+                ReservationState.DRAFT,
+                ReservationEntity.created_at
+                < cutoff - self._policy_svc.reservation_draft_timeout(),
+                ReservationState.CANCELLED,
+            ),
+            (
+                ReservationState.CONFIRMED,
+                ReservationEntity.start
+                < cutoff - self._policy_svc.reservation_checkin_timeout(),
+                ReservationState.CANCELLED,
+            ),
+            (
+                ReservationState.CHECKED_IN,
+                ReservationEntity.end <= cutoff,
+                ReservationState.CHECKED_OUT,
+            ),
+        ]
+
+    def _unexpired_criteria(self, cutoff: datetime) -> ColumnElement[bool]:
+        """Criteria matching reservations that are active as of cutoff, whether or not the
+        sweeper has yet transitioned those that expired."""
+        return or_(
+            *(
+                and_(ReservationEntity.state == state, not_(is_expired))
+                for state, is_expired, _ in self._expiry_rules(cutoff)
+            )
+        )
 
     def seat_availability(
-        self, seats: Sequence[Seat], bounds: TimeRange
+        self,
+        seats: Sequence[Seat],
+        bounds: TimeRange,
+        slot_width: timedelta | None = None,
+        cached: bool = True,
+        limit: int | None = None,
     ) -> Sequence[SeatAvailability]:
         """Returns a list of all seat availability for specific seats within a given timerange.
 
         Args:
             bounds (TimeRange): The time range of interest.
             seats (list[Seat]): The seats to check the availability of.
+            slot_width (timedelta | None): When given, availability is computed on a grid of
+                slots of this width, aligned to multiples of it, rather than exactly. The cost of
+                the grid mode is independent of the number of reservations.
+            cached (bool): Whether availability may be served from the shared cache. Writes
+                that must not conflict with other reservations read through to the database.
+            limit (int | None): When given, only this many of the best available seats are
+                returned, selected without sorting every available seat.
 
         Returns:
             Sequence[SeatAvailability]: All seat availability ordered by nearest and longest available.
         """
-        # No seats are available in the past
         now = datetime.now()
+        seat_availability_dict = self._bounded_seat_availability_dict(
+            seats, bounds, slot_width, cached, now
+        )
+
+        # Remove seats with availability below threshold
+        available_seats = self._prune_seats_below_availability_threshold(
+            seats,
+            seat_availability_dict,
+            self._policy_svc.minimum_reservation_duration()
+            - MINUMUM_RESERVATION_EPSILON,
+        )
+
+        if limit is None:
+            available_seats.sort(key=_seat_preference)
+        else:
+            available_seats = nsmallest(limit, available_seats, key=_seat_preference)
+
+        # Conversion to pydantic models happens only once the computation is complete.
+        return self._seat_availability_models(available_seats)
+
+    def _bounded_seat_availability_dict(
+        self,
+        seats: Sequence[Seat],
+        bounds: TimeRange,
+        slot_width: timedelta | None,
+        cached: bool,
+        now: datetime,
+    ) -> dict[int, IntervalSet]:
+        """The availability of each seat constrained to bounds, prior to pruning, served from
+        the shared cache when cached. Moves the start of bounds up to now."""
+        seat_ids = [seat.id for seat in seats if seat.id is not None]
+        return self._bounded_availability_dict(
+            bounds,
+            lambda window: self._availability_cache.key(seat_ids, window, slot_width),
+            lambda window: self._compute_seat_availability_dict(
+                seats, window, slot_width, now
+            ),
+            slot_width,
+            cached,
+            now,
+        )
+
+    def _bounded_availability_dict(
+        self,
+        bounds: TimeRange,
+        key: Callable[[TimeRange], tuple],
+        compute: Callable[[TimeRange], tuple[dict, datetime]],
+        slot_width: timedelta | None,
+        cached: bool,
+        now: datetime,
+    ) -> dict:
+        """The availability of each seat or room constrained to bounds, prior to pruning,
+        served from the shared cache when cached. Moves the start of bounds up to now.
+
+        Args:
+            bounds (TimeRange): The time range of interest.
+            key (Callable[[TimeRange], tuple]): The cache key of a window.
+            compute (Callable[[TimeRange], tuple[dict, datetime]]): Computes the availability
+                within a window and the moment it expires.
+            slot_width (timedelta | None): The slot width availability is computed on, if any.
+            cached (bool): Whether availability may be served from the shared cache.
+            now (datetime): The current moment.
+        """
+        # No seats are available in the past
         if bounds.end <= now:
-            return []
+            return {}
 
         # Ensure the start of the bounds is at least right now
         if bounds.start < now:
             bounds.start = now
 
         # Ensure the bounds is at least as long as a minimum reservation length, with a fudge factor
-        MINUMUM_RESERVATION_EPSILON = timedelta(minutes=1)
         if (
             bounds.duration()
             < self._policy_svc.minimum_reservation_duration()
             - MINUMUM_RESERVATION_EPSILON
         ):
+            return {}
+
+        # Availability over a bucket-aligned window around the bounds is shared across
+        # requests until reservations change or it expires.
+        window = self._availability_cache.window(bounds)
+        window_key = key(window)
+        availability_by_id = (
+            self._availability_cache.get(window_key, now) if cached else None
+        )
+        if availability_by_id is None:
+            generation = self._availability_cache.generation()
+            availability_by_id, expires_at = compute(window)
+            self._availability_cache.put(
+                window_key, availability_by_id, now, expires_at, generation
+            )
+
+        # Constrain each cached availability to the requested bounds. In slot grid mode the
+        # bounds are narrowed to whole slots.
+        start, end = to_micros(bounds.start), to_micros(bounds.end)
+        if slot_width is not None:
+            width = duration_micros(slot_width)
+            start, end = -(-start // width) * width, end // width * width
+        bounded: dict = {}
+        for id, availability in availability_by_id.items():
+            bounded[id] = availability.copy()
+            bounded[id].constrain(start, end)
+        return bounded
+
+    def seat_availability_grid(
+        self, criteria: SeatSearch, bounds: TimeRange, slot_width: timedelta
+    ) -> SeatAvailabilityGrid:
+        """Returns the availability of seats meeting criteria as bitsets of fixed-width slots.
+
+        A week of availability for every seat, which as TimeRange lists is large to transfer
+        and render, becomes a few dozen bytes per seat. The grid is aligned to multiples of
+        slot_width and begins at the first slot starting at or after the start of bounds.
+        Slots in the past are never available.
+
+        Args:
+            criteria (SeatSearch): Features the seats must have.
+            bounds (TimeRange): The time range of interest.
+            slot_width (timedelta): The width of each slot.
+
+        Returns:
+            SeatAvailabilityGrid: The grid of available seats.
+
+        Raises:
+            ReservationException: If slot_width is too narrow or the grid has too many slots.
+        """
+        if slot_width < MINIMUM_SLOT_WIDTH:
+            raise ReservationException(
+                f"Slots must be at least {MINIMUM_SLOT_WIDTH} wide."
+            )
+        width = duration_micros(slot_width)
+        origin = -(-to_micros(bounds.start) // width) * width
+        length = max((to_micros(bounds.end) // width * width - origin) // width, 0)
+        if length > MAXIMUM_GRID_SLOTS:
+            raise ReservationException(
+                f"Availability grids may have at most {MAXIMUM_GRID_SLOTS} slots."
+            )
+
+        seats = self._seat_svc.catalog().search(criteria)
+        seat_availability_dict = self._bounded_seat_availability_dict(
+            seats, bounds, slot_width, True, datetime.now()
+        )
+        minimum = duration_micros(
+            self._policy_svc.minimum_reservation_duration()
+            - MINUMUM_RESERVATION_EPSILON
+        )
+        size = (length + 7) // 8
+        encoded: dict[int, str] = {}
+        for seat_id, availability in seat_availability_dict.items():
+            availability.prune(minimum)
+            bits = availability.to_bits(origin, width, length)
+            if bits != 0:
+                encoded[seat_id] = b64encode(bits.to_bytes(size, "little")).decode()
+
+        return SeatAvailabilityGrid(
+            origin=from_micros(origin),
+            slot_minutes=slot_width // timedelta(minutes=1),
+            slots=length,
+            seats=encoded,
+        )
+
+    def search_seat_availability(
+        self, criteria: SeatSearch, bounds: TimeRange, limit: int | None = None
+    ) -> Sequence[SeatAvailability]:
+        """Returns the best available seats meeting criteria within a given timerange.
+
+        Seats are filtered before any availability is computed, so only reservations of the
+        matching seats are queried.
+
+        Args:
+            criteria (SeatSearch): Features the seats must have.
+            bounds (TimeRange): The time range of interest.
+            limit (int | None): The largest number of seats to return, or None for all.
+
+        Returns:
+            Sequence[SeatAvailability]: Matching seat availability ordered by nearest and
+                longest available.
+
+        Raises:
+            ReservationException: If limit is not positive.
+        """
+        if limit is not None and limit < 1:
+            raise ReservationException("Seat search limit must be positive.")
+        seats = self._seat_svc.catalog().search(criteria)
+        if len(seats) == 0:
             return []
+        return self.seat_availability(seats, bounds, limit=limit)
 
-        # Find operating hours schedule during the requested bounds
-        open_hours = self._operating_hours_svc.schedule(bounds)
-        if len(open_hours) == 0:
+    def room_availability(
+        self,
+        bounds: TimeRange,
+        rooms: Sequence[Room] | None = None,
+        cached: bool = True,
+    ) -> Sequence[RoomAvailability]:
+        """Returns the availability of reservable rooms within a given timerange.
+
+        Availability is computed by the same engine as seat availability, from the reservations
+        of every room retrieved in one query, and is shared through the seat availability cache.
+
+        Args:
+            bounds (TimeRange): The time range of interest.
+            rooms (Sequence[Room] | None): The rooms to check the availability of, or None for
+                every reservable room.
+            cached (bool): Whether availability may be served from the shared cache.
+
+        Returns:
+            Sequence[RoomAvailability]: Rooms available for at least the minimum reservation
+                duration, in the order given, or by increasing capacity.
+        """
+        if rooms is None:
+            rooms = self._seat_svc.catalog().reservable_rooms()
+        if len(rooms) == 0:
             return []
 
-        # Convert the operating hours during the bounds into an availability list
-        # and constrain the availability list within the bounds.
-        open_availability_list = self._operating_hours_to_bounded_availability_list(
-            open_hours, bounds
+        now = datetime.now()
+        room_ids = [room.id for room in rooms]
+        room_availability_dict: dict[
+            str, IntervalSet
+        ] = self._bounded_availability_dict(
+            bounds,
+            lambda window: self._availability_cache.room_key(room_ids, window),
+            lambda window: self._compute_room_availability_dict(room_ids, window, now),
+            None,
+            cached,
+            now,
         )
-        if len(open_availability_list.availability) == 0:
-            return []
 
-        # Start from a position where all seats begin with same availability as
-        # open_availability_list. From there, reservations will subtract availability
-        # from the given seat.
-        seat_availability_dict = self._initialize_seat_availability_dict(
-            seats, open_availability_list
+        minimum = duration_micros(
+            self._policy_svc.minimum_reservation_duration()
+            - MINUMUM_RESERVATION_EPSILON
         )
+        datetimes: dict[int, datetime] = {}
+        available_rooms: list[RoomAvailability] = []
+        for room in rooms:
+            availability = room_availability_dict.get(room.id)
+            if availability is None:
+                continue
+            availability.prune(minimum)
+            if len(availability) > 0:
+                available_rooms.append(
+                    RoomAvailability.model_construct(
+                        id=room.id,
+                        nickname=room.nickname,
+                        availability=availability.to_time_ranges(datetimes),
+                    )
+                )
+        return available_rooms
+
+    def _compute_room_availability_dict(
+        self, room_ids: Sequence[str], window: TimeRange, now: datetime
+    ) -> tuple[dict[str, IntervalSet], datetime]:
+        """Computes the availability of each room within window, prior to pruning.
+
+        Returns:
+            tuple[dict[str, IntervalSet], datetime]: Availability by room ID and the moment
+                after which it may no longer be accurate even if no reservation changes.
+        """
+        open_hours = self._operating_hours_svc.schedule(window)
+        if len(open_hours) == 0:
+            return {}, datetime.max
+        open_availability = self._operating_hours_to_bounded_interval_set(
+            open_hours, window
+        )
+        if len(open_availability) == 0:
+            return {}, datetime.max
+
+        reservations = self._get_room_reservations(
+            room_ids,
+            TimeRange.model_construct(
+                start=from_micros(open_availability.starts[0]),
+                end=from_micros(open_availability.ends[-1]),
+            ),
+            now,
+        )
+        expires_at = self._availability_expiry(open_hours, reservations, now)
+
+        blocks_by_room: dict[str, list[tuple[int, int]]] = {}
+        for reservation in reservations:
+            blocks_by_room.setdefault(reservation.room_id, []).append(
+                (to_micros(reservation.start), to_micros(reservation.end))
+            )
+        room_availability_dict = {
+            room_id: open_availability.copy() for room_id in room_ids
+        }
+        for room_id, blocks in blocks_by_room.items():
+            room_availability_dict[room_id].subtract_many(blocks)
+        return room_availability_dict, expires_at
+
+    def _get_room_reservations(
+        self, room_ids: Sequence[str], time_range: TimeRange, now: datetime
+    ) -> Sequence[Row]:
+        """The room ID, bounds, state and creation time of the active reservations of any of
+        the rooms overlapping time_range, retrieved in one query."""
+        return self._session.execute(
+            select(
+                ReservationEntity.room_id,
+                ReservationEntity.start,
+                ReservationEntity.end,
+                ReservationEntity.state,
+                ReservationEntity.created_at,
+            ).where(
+                ReservationEntity.room_id.in_(room_ids),
+                ReservationEntity.period.overlaps(
+                    Range(time_range.start, time_range.end, bounds="[)")
+                ),
+                self._unexpired_criteria(now),
+            )
+        ).all()
+
+    def _compute_seat_availability_dict(
+        self,
+        seats: Sequence[Seat],
+        window: TimeRange,
+        slot_width: timedelta | None,
+        now: datetime,
+    ) -> tuple[dict[int, IntervalSet], datetime]:
+        """Computes the availability of each seat within window, prior to pruning.
+
+        Returns:
+            tuple[dict[int, IntervalSet], datetime]: Availability by seat ID and the moment
+                after which it may no longer be accurate even if no reservation changes.
+        """
+        # Find operating hours schedule during the requested window
+        open_hours = self._operating_hours_svc.schedule(window)
+        if len(open_hours) == 0:
+            return {}, datetime.max
+
+        # Convert the operating hours during the window into an interval set
+        # and constrain the interval set within the window.
+        open_availability = self._operating_hours_to_bounded_interval_set(
+            open_hours, window
+        )
+        if len(open_availability) == 0:
+            return {}, datetime.max
 
         # Get all active reservations during the availability bounds for the seats.
         reservation_range = TimeRange(
-            start=open_availability_list.availability[0].start,
-            end=open_availability_list.availability[-1].end,
+            start=from_micros(open_availability.starts[0]),
+            end=from_micros(open_availability.ends[-1]),
         )
         reservations = self.get_seat_reservations(seats, reservation_range)
+        expires_at = self._availability_expiry(open_hours, reservations, now)
+
+        if slot_width is None:
+            # Start from a position where all seats begin with same availability as
+            # open_availability. From there, reservations will subtract availability
+            # from the given seat.
+            seat_availability_dict = self._initialize_seat_availability_dict(
+                seats, open_availability
+            )
 
-        # Subtract all seat reservations from their availability
-        self._remove_reservations_from_availability(
-            seat_availability_dict, reservations
-        )
-
-        # Remove seats with availability below threshold
-        available_seats: list[SeatAvailability] = list(
-            self._prune_seats_below_availability_threshold(
-                list(seat_availability_dict.values()),
+            # Subtract all seat reservations from their availability
+            self._remove_reservations_from_availability(
+                seat_availability_dict, reservations
+            )
+        else:
+            # Stamp all seat reservations into a seats-by-slots bitmap and read back
+            # each seat's runs of free slots.
+            seat_availability_dict = self._slot_grid_seat_availability_dict(
+                seats,
+                open_availability,
+                reservations,
+                slot_width,
                 self._policy_svc.minimum_reservation_duration()
                 - MINUMUM_RESERVATION_EPSILON,
             )
-        )
 
-        # Sort by nearest available ASC, duration DESC, reservable (False before True), with entropy
-        # The rationale for entropy is when XL is wide open for walkins, within the given seat search
-        # we'd like to mix up the order in which seats are assigned rather than always giving away
-        # the same sequence of seats (and causing more consisten wear and tear to it).
-        available_seats.sort(
-            key=lambda sa: (
-                sa.availability[0].start,
-                -1 * sa.availability[0].duration(),
-                sa.reservable,
-                random(),
-            )
-        )
+        return seat_availability_dict, expires_at
 
-        return available_seats
+    def _availability_expiry(
+        self,
+        open_hours: Sequence[OperatingHours],
+        reservations: Sequence[Reservation] | Sequence[Row],
+        now: datetime,
+    ) -> datetime:
+        """The next moment computed availability could change without a reservation being
+        written: an operating hours boundary or a reservation timing out under policy.
+        """
+        boundaries = [
+            moment for hours in open_hours for moment in (hours.start, hours.end)
+        ]
+        for reservation in reservations:
+            if reservation.state == ReservationState.DRAFT:
+                boundaries.append(
+                    reservation.created_at
+                    + self._policy_svc.reservation_draft_timeout()
+                )
+            elif reservation.state == ReservationState.CONFIRMED:
+                boundaries.append(
+                    reservation.start + self._policy_svc.reservation_checkin_timeout()
+                )
+        return min(
+            (moment for moment in boundaries if moment > now), default=datetime.max
+        )
 
     def draft_reservation(
         self, subject: User, request: ReservationRequest
     ) -> Reservation:
         """When a user begins the process of making a reservation, a draft holds its place until confired.
 
-        For launch, reservations are limited to a single user. Reservations must either be made by and for
-        the subject initiating the request, or by an admin with permission to complete the action
-        "coworking.reservation.manage" for resource "user/{user.id}".
+        Reservations must either be made by and for the subject initiating the request, or by an admin
+        with permission to complete the action "coworking.reservation.manage" for resource "user/{user.id}".
+        A reservation for several users, up to the policy's maximum party size, seats each of them in one
+        of the requested seats for the same time, which is trimmed to avoid all of their reservations.
+        A request for a reservable room, rather than seats, reserves the whole room for up to its capacity.
 
         Args:
             subject (User): The user initiating the draft request.
@@ -343,26 +973,320 @@ class ReservationService:
 
         Future work:
             * Think about errors/validations of drafts that can be edited rather than raising exceptions.
-            * Multi-user reservations
-                * Check for equality between users and available seats
-                * Limit users and seats counts to policy
             * Clean-up / Refactor Implementation
         """
-        # For the time being, reservations are limited to one user. As soon as
-        # possible, we'd like to add multi-user reservations so that pairs and teams
-        # can be simplified.
-        if len(request.users) > 1:
-            raise NotImplementedError("Multi-user reservations not yet supproted.")
+        room = self._requested_room(request)
+        party_size = (
+            room.capacity
+            if room is not None
+            else self._policy_svc.maximum_party_size(subject)
+        )
+        if len(request.users) > party_size:
+            raise ReservationException(
+                f"Reservations are limited to {party_size} users."
+            )
 
-        # Enforce Reservation Draft Permissions
+        self._enforce_draft_permissions(subject, request)
+        now = datetime.now()
+        bounds, is_walkin = self._draft_bounds(subject, request, now)
+
+        # Fetch User entities for all requested in reservation
+        user_entities = (
+            self._session.query(UserEntity)
+            .filter(UserEntity.id.in_([user.id for user in request.users]))
+            .all()
+        )
+        if len(user_entities) == 0:
+            raise ReservationException(
+                "At least one valid user is required to make a reservation."
+            )
+
+        # Every member of the party must be free for the reservation. Their reservations are
+        # found in one query, and one shared by several members is only considered once.
+        conflicts_by_user = self._get_active_reservations_for_users(
+            [user.id for user in user_entities], bounds
+        )
+        conflicts = list(
+            {
+                conflict.id: conflict
+                for user_conflicts in conflicts_by_user.values()
+                for conflict in user_conflicts
+            }.values()
+        )
+        bounds = self._nonconflicting_bounds(bounds, is_walkin, conflicts)
+
+        if room is not None:
+            room_bounds = self._claim_room(room, bounds, now)
+            if room_bounds is None:
+                raise ReservationException("The requested room is no longer available.")
+            draft = ReservationEntity(
+                state=ReservationState.DRAFT,
+                start=room_bounds.start,
+                end=room_bounds.end,
+                users=user_entities,
+                walkin=is_walkin,
+                room_id=room.id,
+                seats=[],
+            )
+        else:
+            # Look at the seats - match bounds of assigned seat's availability
+            seats: list[Seat] = self._seat_svc.catalog().lookup(request.seats)
+            seat_availability = self.seat_availability(seats, bounds, cached=False)
+
+            if not is_walkin:
+                seat_availability = [
+                    seat for seat in seat_availability if seat.reservable
+                ]
+
+            if len(seat_availability) < len(user_entities):
+                raise ReservationException(
+                    "The requested seat(s) are no longer available."
+                )
+
+            # Here we constrain the reservation start/end to that of the best available seat requested.
+            # This matters as walk-in availability becomes scarce (may start in the near future even though request
+            # start is for right now), alternatively may end early due to reserved seat on backend.
+            claimed = self._claim_seats(seat_availability, len(user_entities), now)
+            if claimed is None:
+                raise ReservationException(
+                    "The requested seat(s) are no longer available."
+                )
+            seat_entities, bounds = claimed
+
+            draft = ReservationEntity(
+                state=ReservationState.DRAFT,
+                start=bounds.start,
+                end=bounds.end,
+                users=user_entities,
+                walkin=is_walkin,
+                room_id=None,
+                seats=seat_entities,
+            )
+
+        # The database also rejects drafts that overlap another active reservation of the
+        # seat, should one be written without claiming the seat first.
+        self._session.add(draft)
+        try:
+            self._session.commit()
+        except IntegrityError as e:
+            self._session.rollback()
+            if getattr(e.orig, "pgcode", None) != _EXCLUSION_VIOLATION:
+                raise
+            raise ReservationException(
+                "The requested seat(s) are no longer available."
+            ) from e
+        finally:
+            self._availability_cache.invalidate()
+        return draft.to_model()
+
+    def draft_reservations(
+        self, subject: User, requests: Sequence[ReservationRequest]
+    ) -> list[ReservationDraftResult]:
+        """Drafts a batch of reservations at once, such as when an ambassador seats a group.
+
+        Each request is subject to the same rules as draft_reservation, including seating a party
+        of several users together. Rather than computing availability per request, the requested
+        seats are locked and their availability is computed once, then seats are claimed for
+        requests in order, as by draft_reservation, removing each claim from the availability of
+        the requests that follow so the batch never double books a seat.
+        All drafts are written in one transaction, each behind its own savepoint, so a request
+        that cannot be satisfied does not undo the others.
+
+        Args:
+            subject (User): The user initiating the draft requests.
+            requests (Sequence[ReservationRequest]): The requested reservations.
+
+        Returns:
+            list[ReservationDraftResult]: The result of each request, in the order requested.
+
+        Raises:
+            ReservationException: If the batch is empty or larger than MAXIMUM_BATCH_SIZE.
+        """
+        if not 0 < len(requests) <= MAXIMUM_BATCH_SIZE:
+            raise ReservationException(
+                f"A batch must contain between 1 and {MAXIMUM_BATCH_SIZE} reservations."
+            )
+
+        now = datetime.now()
+        results = [ReservationDraftResult() for _ in requests]
+
+        # Requests failing permission or policy checks are reported without further work.
+        permitted: set[int] = set()
+        planned: dict[int, tuple[TimeRange, bool]] = {}
+        for i, request in enumerate(requests):
+            try:
+                party_size = self._policy_svc.maximum_party_size(subject)
+                if len(request.users) > party_size:
+                    raise ReservationException(
+                        f"Reservations are limited to {party_size} users."
+                    )
+                if request.room is not None:
+                    raise ReservationException(
+                        "Rooms are reserved one reservation at a time."
+                    )
+                self._enforce_draft_permissions(subject, request, permitted)
+                planned[i] = self._draft_bounds(subject, request, now)
+            except (ReservationException, UserPermissionException) as e:
+                results[i].error = str(e)
+        if len(planned) == 0:
+            return results
+
+        window = TimeRange(
+            start=min(bounds.start for bounds, _ in planned.values()),
+            end=max(bounds.end for bounds, _ in planned.values()),
+        )
+        user_ids = {user.id for i in planned for user in requests[i].users}
+        users_by_id = {
+            user.id: user
+            for user in self._session.scalars(
+                select(UserEntity).where(UserEntity.id.in_(user_ids))
+            )
+        }
+        conflicts_by_user = self._get_active_reservations_for_users(user_ids, window)
+
+        # Seats locked by concurrent drafts are skipped, as in _claim_seat. Holding the locks,
+        # the expired reservations of the locked seats are swept before reading availability.
+        catalog = self._seat_svc.catalog()
+        requested_ids = {seat.id for i in planned for seat in requests[i].seats}
+        seat_entities = {
+            seat.id: seat
+            for seat in self._session.scalars(
+                select(SeatEntity)
+                .where(SeatEntity.id.in_(requested_ids))
+                .order_by(SeatEntity.id)
+                .with_for_update(skip_locked=True)
+            )
+            if seat.id in catalog.by_id
+        }
+        self._expire(now, list(seat_entities))
+        availability = self._bounded_seat_availability_dict(
+            [catalog.by_id[id] for id in seat_entities], window, None, False, now
+        )
+        threshold = (
+            self._policy_svc.minimum_reservation_duration()
+            - MINUMUM_RESERVATION_EPSILON
+        )
+
+        drafts: dict[int, ReservationEntity] = {}
+        try:
+            for i, (bounds, is_walkin) in planned.items():
+                request = requests[i]
+                try:
+                    party = [
+                        users_by_id[user.id]
+                        for user in request.users
+                        if user.id in users_by_id
+                    ]
+                    if len(party) == 0:
+                        raise ReservationException(
+                            "At least one valid user is required to make a reservation."
+                        )
+                    conflicts = list(
+                        {
+                            conflict.id: conflict
+                            for user in party
+                            for conflict in conflicts_by_user.get(user.id, [])
+                        }.values()
+                    )
+                    bounds = self._nonconflicting_bounds(bounds, is_walkin, conflicts)
+
+                    candidates = [
+                        seat
+                        for seat in catalog.lookup(request.seats)
+                        if seat.id in availability and (is_walkin or seat.reservable)
+                    ]
+                    constrained: dict[int, IntervalSet] = {}
+                    for seat in candidates:
+                        constrained[seat.id] = availability[seat.id].copy()
+                        constrained[seat.id].constrain(
+                            to_micros(bounds.start), to_micros(bounds.end)
+                        )
+                    available_seats = self._prune_seats_below_availability_threshold(
+                        candidates, constrained, threshold
+                    )
+                    if len(available_seats) < len(party):
+                        raise ReservationException(
+                            "The requested seat(s) are no longer available."
+                        )
+                    available_seats.sort(key=_seat_preference)
+
+                    # The batch already holds the locks of the candidate seats, so claiming
+                    # them only checks them against the drafts written earlier in the batch.
+                    try:
+                        with self._session.begin_nested():
+                            claimed = self._claim_seats(
+                                self._seat_availability_models(available_seats),
+                                len(party),
+                                now,
+                            )
+                            if claimed is None:
+                                raise ReservationException(
+                                    "The requested seat(s) are no longer available."
+                                )
+                            claimed_seats, claimed_bounds = claimed
+                            draft = ReservationEntity(
+                                state=ReservationState.DRAFT,
+                                start=claimed_bounds.start,
+                                end=claimed_bounds.end,
+                                users=party,
+                                walkin=is_walkin,
+                                room_id=None,
+                                seats=claimed_seats,
+                            )
+                            self._session.add(draft)
+                    except IntegrityError as e:
+                        if getattr(e.orig, "pgcode", None) != _EXCLUSION_VIOLATION:
+                            raise
+                        raise ReservationException(
+                            "The requested seat(s) are no longer available."
+                        ) from e
+                except ReservationException as e:
+                    results[i].error = str(e)
+                    continue
+
+                # Later requests of the batch see this draft as taken and, for its party,
+                # as a conflict.
+                for seat in claimed_seats:
+                    availability[seat.id].subtract(
+                        to_micros(claimed_bounds.start), to_micros(claimed_bounds.end)
+                    )
+                reservation = draft.to_model()
+                for user in party:
+                    conflicts_by_user.setdefault(user.id, []).append(reservation)
+                drafts[i] = draft
+            self._session.commit()
+        finally:
+            self._availability_cache.invalidate()
+
+        for i, draft in drafts.items():
+            results[i].reservation = draft.to_model()
+        return results
+
+    def _enforce_draft_permissions(
+        self,
+        subject: User,
+        request: ReservationRequest,
+        permitted: set[int] | None = None,
+    ) -> None:
+        """Reservations must be made by and for the subject, or by a subject with permission
+        to manage the reservations of every user in the request. Users added to permitted, when
+        given, are not checked again."""
         if subject.id not in [user.id for user in request.users]:
             for user in request.users:
+                if permitted is not None and user.id in permitted:
+                    continue
                 self._permission_svc.enforce(
                     subject, "coworking.reservation.manage", f"user/{user.id}"
                 )
-
+                if permitted is not None:
+                    permitted.add(user.id)
+
+    def _draft_bounds(
+        self, subject: User, request: ReservationRequest, now: datetime
+    ) -> tuple[TimeRange, bool]:
+        """The requested time range bounded by walk-in or pre-reservation policy, and
+        whether the request is a walk-in."""
         # Bound start
-        now = datetime.now()
         start = request.start if request.start >= now else now
 
         is_walkin = abs(start - now) < self._policy_svc.walkin_window(subject)
@@ -376,79 +1300,150 @@ class ReservationService:
         end = request.end if request.end <= end_limit else end_limit
 
         # Enforce request range is within bounds of walkin vs. pre-reserved policies
-        bounds = TimeRange(start=start, end=end)
+        return TimeRange(start=start, end=end), is_walkin
 
-        # Fetch User entities for all requested in reservation
-        user_entities = (
-            self._session.query(UserEntity)
-            .filter(UserEntity.id.in_([user.id for user in request.users]))
-            .all()
-        )
-        if len(user_entities) == 0:
+    def _nonconflicting_bounds(
+        self,
+        bounds: TimeRange,
+        is_walkin: bool,
+        conflicts: Sequence[Reservation],
+    ) -> TimeRange:
+        """Trims bounds to avoid the users' existing reservations.
+
+        Raises:
+            ReservationException: If a walk-in conflicts with another walk-in, or the
+                conflicts would split bounds in two or consume it.
+        """
+        if is_walkin and any(conflict.walkin for conflict in conflicts):
             raise ReservationException(
-                "At least one valid user is required to make a reservation."
+                "Users may not have concurrent walk-in reservations."
             )
 
-        # Check for overlapping reservations for a single user
-        # if len(user_entities) == 1:
-        conflicts = self._get_active_reservations_for_user(request.users[0], bounds)
-        for conflict in conflicts:
-            if is_walkin and conflict.walkin:
-                raise ReservationException(
-                    "Users may not have concurrent walk-in reservations."
-                )
+        nonconflicting = AvailabilityList(availability=[bounds])
+        nonconflicting.subtract_many(conflicts)
+        if len(nonconflicting.availability) == 1:
+            return nonconflicting.availability[0]
+        else:
+            raise ReservationException("Users may not have conflicting reservations.")
 
-            nonconflicting = bounds.subtract(conflict)
-            if len(nonconflicting) == 1:
-                bounds = nonconflicting[0]
-            else:
-                raise ReservationException(
-                    "Users may not have conflicting reservations."
-                )
-        # Dead code because of the NotImplementedError testing for multiple users at the top
-        # else:
-        #     # Draft of expected functionality (needs testing and sanity checking)
-        #     # Multiple users all need to not have conflicts
-        #     for user in request.users:
-        #         conflicts = self._get_active_reservations_for_user(user, bounds)
-        #         if len(conflicts) > 0:
-        #             raise ReservationException(
-        #                 "Users may not have conflicting reservations."
-        #             )
-
-        # Look at the seats - match bounds of assigned seat's availability
-        # TODO: Fetch all seats
-        seats: list[Seat] = SeatEntity.get_models_from_identities(
-            self._session, request.seats
-        )
-        seat_availability = self.seat_availability(seats, bounds)
-
-        if not is_walkin:
-            seat_availability = [seat for seat in seat_availability if seat.reservable]
-
-        if len(seat_availability) == 0:
-            raise ReservationException("The requested seat(s) are no longer available.")
-
-        # TODO (limit to # of users on request if multiple users)
-        # Here we constrain the reservation start/end to that of the best available seat requested.
-        # This matters as walk-in availability becomes scarce (may start in the near future even though request
-        # start is for right now), alternatively may end early due to reserved seat on backend.
-        seat_entities = [self._session.get(SeatEntity, seat_availability[0].id)]
-        bounds = seat_availability[0].availability[0]
-
-        draft = ReservationEntity(
-            state=ReservationState.DRAFT,
-            start=bounds.start,
-            end=bounds.end,
-            users=user_entities,
-            walkin=is_walkin,
-            room_id=None,
-            seats=seat_entities,
+    def _requested_room(self, request: ReservationRequest) -> RoomDetails | None:
+        """The reservable room requested, or None when seats are requested instead.
+
+        Raises:
+            ReservationException: If the room is not reservable or seats are also requested.
+        """
+        if request.room is None:
+            return None
+        if len(request.seats) > 0:
+            raise ReservationException(
+                "A reservation is for either seats or a room, not both."
+            )
+        room = self._seat_svc.catalog().rooms_by_id.get(request.room.id)
+        if room is None or not room.reservable:
+            raise ReservationException("The requested room is not reservable.")
+        return room
+
+    def _claim_room(
+        self, room: Room, bounds: TimeRange, now: datetime
+    ) -> TimeRange | None:
+        """Locks the room until the transaction ends and finds the first time within bounds it
+        is available for at least the minimum reservation duration.
+
+        Unlike seats, a room is requested by itself, so a draft waits for a concurrent draft of
+        the same room to finish and then reads availability that includes it.
+
+        Returns:
+            TimeRange | None: The bounds the room is available for, or None if it is not.
+        """
+        self._session.execute(
+            select(RoomEntity.id).where(RoomEntity.id == room.id).with_for_update()
         )
+        available = self.room_availability(bounds, [room], cached=False)
+        if len(available) == 0:
+            return None
+        return available[0].availability[0]
+
+    def _claim_seat(
+        self, candidates: Sequence[SeatAvailability], now: datetime
+    ) -> tuple[SeatEntity, TimeRange] | None:
+        """Locks the most preferred candidate seat that is still available until the
+        transaction ends.
+
+        Concurrent drafts, such as a burst of walk-ins at the top of the hour, compute the
+        same availability and prefer the same seats. Rather than wait on one another, each
+        skips seats locked by another draft and falls back to its next-best seat. A seat
+        locked after another draft committed a reservation of it is checked again, as the
+        availability read before locking it is stale.
 
-        self._session.add(draft)
-        self._session.commit()
-        return draft.to_model()
+        Args:
+            candidates (Sequence[SeatAvailability]): Available seats, most preferred first.
+            now (datetime): The time of the draft.
+
+        Returns:
+            tuple[SeatEntity, TimeRange] | None: The locked seat and the bounds it is
+                available for, or None if every candidate was taken.
+        """
+        for candidate in candidates:
+            seat = self._session.execute(
+                select(SeatEntity)
+                .where(SeatEntity.id == candidate.id)
+                .with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            if seat is None:
+                continue
+
+            # Expired reservations the sweeper has yet to transition still hold the seat
+            # in the database. Holding the seat's lock, no other draft contends for them.
+            self._expire(now, [seat.id])
+            bounds = candidate.availability[0]
+            taken = (
+                self._session.query(ReservationEntity.id)
+                .filter(
+                    ReservationEntity.id.in_(
+                        self._seat_reservation_ids([seat.id], bounds)
+                    ),
+                    self._unexpired_criteria(now),
+                )
+                .first()
+            )
+            if taken is None:
+                return seat, bounds
+        return None
+
+    def _claim_seats(
+        self, candidates: Sequence[SeatAvailability], count: int, now: datetime
+    ) -> tuple[list[SeatEntity], TimeRange] | None:
+        """Locks count of the candidate seats for the same bounds, preferring the candidates
+        in order.
+
+        The bounds are those of the most preferred seat claimed. The rest of the party is seated
+        in the most preferred remaining seats available for the whole of those bounds.
+
+        Returns:
+            tuple[list[SeatEntity], TimeRange] | None: The locked seats and their bounds, or
+                None if too few candidates could be claimed.
+        """
+        claimed = self._claim_seat(candidates, now)
+        if claimed is None:
+            return None
+        seat, bounds = claimed
+        seats = [seat]
+        while len(seats) < count:
+            claimed_ids = {seat.id for seat in seats}
+            remaining = [
+                candidate.model_copy(update={"availability": [bounds]})
+                for candidate in candidates
+                if candidate.id not in claimed_ids
+                and any(
+                    available.start <= bounds.start and bounds.end <= available.end
+                    for available in candidate.availability
+                )
+            ]
+            claimed = self._claim_seat(remaining, now)
+            if claimed is None:
+                return None
+            seats.append(claimed[0])
+        return seats, bounds
 
     def change_reservation(
         self, subject: User, delta: ReservationPartial
@@ -456,6 +1451,8 @@ class ReservationService:
         """Modify an existing reservation.
 
         Users should be able to change reservations without hassle. Different restrictions apply to changes based on state of reservation.
+        A later end extends a reservation, within the policy's extend window before it ends and until its
+        seats or room are next reserved.
 
         Args:
             subject (User): The user initiating the reservation change request.
@@ -467,10 +1464,11 @@ class ReservationService:
         Raises:
             ResourceNotFoundException when the requested ID is not found
             UserPermissionException when user does not have permission to modify the reservation
+            ReservationException when the reservation cannot be extended as requested
             NotImplementedError when requested changes are not yet implemented as features
 
         Future work:
-            Implement the ability to change seats, party, and start/end time within policy restrictions
+            Implement the ability to change seats, party, and start time within policy restrictions
         """
         entity = self._session.get(ReservationEntity, delta.id)
         if entity is None:
@@ -490,6 +1488,8 @@ class ReservationService:
 
         # Handle Requested State Changes
         dirty = False
+        before = reservation_utilization(entity)
+        was_confirmed = entity.state == ReservationState.CONFIRMED
         if delta.state is not None and delta.state != entity.state:
             dirty = dirty or self._change_state(entity, delta.state)
             if entity.state == ReservationState.CHECKED_OUT:
@@ -503,16 +1503,86 @@ class ReservationService:
         if delta.users is not None:
             raise NotImplementedError("Changing party not yet supported.")
 
-        # Handle Requested Time Changes (TODO)
-        if delta.start is not None or delta.end is not None or delta.seats is not None:
-            # TODO: Assure these requested changes are valid within policies
-            raise NotImplementedError("Changing start/end not yet supported")
+        # Handle Requested Time Changes
+        if delta.start is not None and delta.start != entity.start:
+            raise NotImplementedError("Changing start not yet supported")
+        if delta.end is not None and delta.end != entity.end:
+            if delta.end < entity.end:
+                raise NotImplementedError("Shortening reservations not yet supported")
+            self._extend(subject, entity, delta.end)
+            dirty = True
 
         if dirty:  # and valid():
-            self._session.commit()
+            # Cancelling a confirmed reservation once its check-in window passed is a no-show,
+            # as when the sweeper cancels it.
+            no_show = (
+                was_confirmed
+                and entity.state == ReservationState.CANCELLED
+                and datetime.now()
+                >= entity.start + self._policy_svc.reservation_checkin_timeout()
+            )
+            record_utilization(
+                self._session, [(before, reservation_utilization(entity, no_show))]
+            )
+            try:
+                self._session.commit()
+            except IntegrityError as e:
+                self._session.rollback()
+                if getattr(e.orig, "pgcode", None) != _EXCLUSION_VIOLATION:
+                    raise
+                raise ReservationException(
+                    "The reservation's seat(s) are no longer available."
+                ) from e
+            finally:
+                self._availability_cache.invalidate()
 
         return entity.to_model()
 
+    def _extend(self, subject: User, entity: ReservationEntity, end: datetime) -> None:
+        """Extends the reservation to end, if it is extendable until then.
+
+        The seats' next reservations are read from the upcoming reservation index, as the
+        database rejects an extension overlapping another reservation of a seat. A room is
+        locked and its next reservation read from the database, as for drafts.
+
+        Raises:
+            ReservationException: If the reservation is not extendable until end, or a member
+                of its party has another reservation in the meantime.
+        """
+        now = datetime.now()
+        reservation = entity.to_model()
+        if entity.room_id is not None:
+            self._session.execute(
+                select(RoomEntity.id)
+                .where(RoomEntity.id == entity.room_id)
+                .with_for_update()
+            )
+        extendable_at, until = self._extension(
+            reservation, subject, now, fresh=entity.room_id is not None
+        )
+        if until is None:
+            if extendable_at is None or now >= extendable_at:
+                raise ReservationException("The reservation cannot be extended.")
+            raise ReservationException(
+                f"The reservation can be extended from {extendable_at:%I:%M %p}."
+            )
+        if end > until:
+            raise ReservationException(
+                f"The reservation can only be extended until {until:%I:%M %p}."
+            )
+
+        conflicts = self._get_active_reservations_for_users(
+            [user.id for user in reservation.users],
+            TimeRange(start=entity.end, end=end),
+        )
+        if any(
+            conflict.id != entity.id
+            for user_conflicts in conflicts.values()
+            for conflict in user_conflicts
+        ):
+            raise ReservationException("Users may not have conflicting reservations.")
+        entity.end = end
+
     def _change_state(self, entity: ReservationEntity, delta: ReservationState) -> bool:
         RS = ReservationState
 
@@ -538,8 +1608,8 @@ class ReservationService:
     def list_all_active_and_upcoming(self, subject: User) -> Sequence[Reservation]:
         """Ambassadors need to see all active and upcoming reservations.
 
-        This method queries all future events. When pre-reservations are added, this method
-        will need redesign to support date/time based pagination.
+        This method queries all reservations underway or starting within the next five
+        minutes. See `list_active_and_upcoming_page` to page through a window of time.
 
         Args:
             subject (User): The user initiating the reservation change request.
@@ -549,33 +1619,82 @@ class ReservationService:
 
         Raises:
             UserPermissionException when user does not have permission to read reservations
-
-        Future work:
-            Pagination based on timespans in the future.
         """
         self._permission_svc.enforce(subject, "coworking.reservation.read", f"user/*")
         now = datetime.now()
         reservations = (
             self._session.query(ReservationEntity)
-            .join(ReservationEntity.users)
             .filter(
                 ReservationEntity.start <= now + timedelta(minutes=5),
                 ReservationEntity.end > now,
-                ReservationEntity.state.in_(
-                    (
-                        ReservationState.CONFIRMED,
-                        ReservationState.CHECKED_IN,
-                        ReservationState.CHECKED_OUT,
-                    )
-                ),
-            )
-            .options(
-                joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
+                ReservationEntity.state.in_(_AMBASSADOR_STATES),
             )
+            .options(*ReservationEntity.bulk_load_options())
             .order_by(ReservationEntity.start.desc())
             .all()
         )
-        return [reservation.to_model() for reservation in reservations]
+        return ReservationEntity.to_models(reservations)
+
+    def list_active_and_upcoming_page(
+        self,
+        subject: User,
+        window: TimeRange,
+        cursor: str | None = None,
+        limit: int = AMBASSADOR_PAGE_SIZE,
+    ) -> ReservationPage:
+        """A page of the reservations ambassadors see that overlap a window of time.
+
+        Pages are ordered by start and then ID, and continue from the last reservation of the
+        previous page rather than from an offset, so reservations made or cancelled while
+        paging neither repeat nor shift later pages. Each page is a single indexed query
+        regardless of how far into the window it lies.
+
+        Args:
+            subject (User): The user requesting the page.
+            window (TimeRange): Reservations ending after its start and starting before its
+                end are listed.
+            cursor (str | None): The `next_cursor` of the previous page, or None for the first.
+            limit (int): The largest number of reservations in the page.
+
+        Returns:
+            ReservationPage: The page, whose `next_cursor` is None when it is the last.
+
+        Raises:
+            UserPermissionException when user does not have permission to read reservations
+            ReservationException when the cursor or limit is invalid
+        """
+        self._permission_svc.enforce(subject, "coworking.reservation.read", f"user/*")
+        if not 1 <= limit <= MAXIMUM_PAGE_SIZE:
+            raise ReservationException(
+                f"Page size must be between 1 and {MAXIMUM_PAGE_SIZE}."
+            )
+
+        query = self._session.query(ReservationEntity).filter(
+            ReservationEntity.start < window.end,
+            ReservationEntity.end > window.start,
+            ReservationEntity.state.in_(_AMBASSADOR_STATES),
+        )
+        if cursor is not None:
+            query = query.filter(
+                tuple_(ReservationEntity.start, ReservationEntity.id)
+                > _decode_cursor(cursor)
+            )
+        entities = (
+            query.options(*ReservationEntity.bulk_load_options())
+            .order_by(ReservationEntity.start, ReservationEntity.id)
+            .limit(limit + 1)
+            .all()
+        )
+
+        next_cursor = None
+        if len(entities) > limit:
+            entities = entities[:limit]
+            next_cursor = _encode_cursor(entities[-1].start, entities[-1].id)
+        return ReservationPage(
+            items=ReservationEntity.to_models(entities),
+            window=window,
+            next_cursor=next_cursor,
+        )
 
     def staff_checkin_reservation(
         self, subject: User, reservation: Reservation
@@ -608,8 +1727,13 @@ class ReservationService:
 
         # Update state iff ReservationState is current CONFIRMED
         if entity.state == ReservationState.CONFIRMED:
+            before = reservation_utilization(entity)
             entity.state = ReservationState.CHECKED_IN
+            record_utilization(
+                self._session, [(before, reservation_utilization(entity))]
+            )
             self._session.commit()
+            self._availability_cache.invalidate()
         elif entity.state in (
             ReservationState.CANCELLED,
             ReservationState.CHECKED_OUT,
@@ -623,49 +1747,162 @@ class ReservationService:
 
         return entity.to_model()
 
+    def seat_availability_cache_stats(self, subject: User) -> CacheStats:
+        """Hit and miss counters of the process-wide seat availability cache.
+
+        Args:
+            subject (User): The user requesting the counters.
+
+        Returns:
+            CacheStats: Counters since the process started.
+
+        Raises:
+            UserPermissionException when user does not have permission to read reservations
+        """
+        self._permission_svc.enforce(subject, "coworking.reservation.read", f"user/*")
+        return self._availability_cache.stats()
+
     # Private helper methods
 
-    def _operating_hours_to_bounded_availability_list(
+    def _operating_hours_to_bounded_interval_set(
         self, operating_hours: Sequence[OperatingHours], bounds: TimeRange
-    ) -> AvailabilityList:
-        availability = AvailabilityList(
-            availability=[
-                TimeRange(start=operating_hour.start, end=operating_hour.end)
-                for operating_hour in operating_hours
-            ]
-        )
-        availability.constrain(bounds)
+    ) -> IntervalSet:
+        availability = IntervalSet.from_time_ranges(operating_hours)
+        availability.constrain(to_micros(bounds.start), to_micros(bounds.end))
         return availability
 
     def _initialize_seat_availability_dict(
-        self, seats: Sequence[Seat], availability: AvailabilityList
-    ) -> dict[int, SeatAvailability]:
+        self, seats: Sequence[Seat], availability: IntervalSet
+    ) -> dict[int, IntervalSet]:
+        return {seat.id: availability.copy() for seat in seats if seat.id is not None}
+
+    def _slot_grid(
+        self,
+        seats: Sequence[Seat],
+        availability: IntervalSet,
+        reservations: Sequence[Reservation],
+        slot_width: timedelta,
+    ) -> SlotGrid:
+        grid = SlotGrid.covering(
+            availability,
+            duration_micros(slot_width),
+            (seat.id for seat in seats if seat.id is not None),
+        )
+        grid.occupy_many(
+            (seat.id, to_micros(reservation.start), to_micros(reservation.end))
+            for reservation in reservations
+            for seat in reservation.seats
+        )
+        return grid
+
+    def _slot_grid_seat_availability_dict(
+        self,
+        seats: Sequence[Seat],
+        availability: IntervalSet,
+        reservations: Sequence[Reservation],
+        slot_width: timedelta,
+        threshold: timedelta,
+    ) -> dict[int, IntervalSet]:
+        grid = self._slot_grid(seats, availability, reservations, slot_width)
+        minimum_slots = -(-threshold // slot_width)
         return {
-            seat.id: SeatAvailability(
-                availability=availability.model_copy(deep=True).availability,
-                **seat.model_dump(),
-            )
-            for seat in seats
-            if seat.id is not None
+            seat_id: grid.free_runs(seat_id, minimum_slots) for seat_id in grid.rows
         }
 
     def _remove_reservations_from_availability(
         self,
-        seat_availability_dict: dict[int, SeatAvailability],
+        seat_availability_dict: dict[int, IntervalSet],
         reservations: Sequence[Reservation],
     ):
+        blocks_by_seat: dict[int, list[tuple[int, int]]] = {}
         for reservation in reservations:
             if len(reservation.seats) > 0:
+                block = (to_micros(reservation.start), to_micros(reservation.end))
                 for seat in reservation.seats:
                     if seat.id in seat_availability_dict:
-                        seat_availability_dict[seat.id].subtract(reservation)
+                        blocks_by_seat.setdefault(seat.id, []).append(block)
+
+        for seat_id, blocks in blocks_by_seat.items():
+            seat_availability_dict[seat_id].subtract_many(blocks)
 
     def _prune_seats_below_availability_threshold(
-        self, seats: Sequence[SeatAvailability], threshold: timedelta
-    ) -> Sequence[SeatAvailability]:
-        available_seats: list[SeatAvailability] = []
-        for seat in seats:
-            seat.filter_time_ranges_below(threshold)
-            if len(seat.availability) > 0:
-                available_seats.append(seat)
+        self,
+        seats: Sequence[Seat],
+        seat_availability_dict: dict[int, IntervalSet],
+        threshold: timedelta,
+    ) -> list[tuple[Seat, IntervalSet]]:
+        seats_by_id = {seat.id: seat for seat in seats}
+        minimum = duration_micros(threshold)
+        available_seats: list[tuple[Seat, IntervalSet]] = []
+        for seat_id, availability in seat_availability_dict.items():
+            availability.prune(minimum)
+            if len(availability) > 0:
+                available_seats.append((seats_by_id[seat_id], availability))
         return available_seats
+
+    def _seat_availability_models(
+        self, available_seats: Sequence[tuple[Seat, IntervalSet]]
+    ) -> list[SeatAvailability]:
+        # Seats are already validated models and availability comes from the engine, which
+        # only produces sorted, non-overlapping ranges, so validation is skipped.
+        datetimes: dict[int, datetime] = {}
+        return [
+            SeatAvailability.model_construct(
+                availability=availability.to_time_ranges(datetimes),
+                **{field: getattr(seat, field) for field in Seat.model_fields},
+            )
+            for seat, availability in available_seats
+        ]
+
+
+def _seat_preference(pair: tuple[Seat, IntervalSet]):
+    """Sort key of available seats: nearest available ASC, duration DESC, reservable (False
+    before True), with entropy.
+
+    The rationale for entropy is when XL is wide open for walkins, within the given seat search
+    we'd like to mix up the order in which seats are assigned rather than always giving away
+    the same sequence of seats (and causing more consisten wear and tear to it)."""
+    return (
+        pair[1].starts[0],
+        pair[1].starts[0] - pair[1].ends[0],
+        pair[0].reservable,
+        random(),
+    )
+
+
+def _encode_cursor(start: datetime, id: int) -> str:
+    """An opaque cursor positioned after the reservation with the given start and ID."""
+    return urlsafe_b64encode(f"{start.isoformat()}|{id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """The start and ID of the reservation a cursor is positioned after."""
+    try:
+        start, id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(start), int(id)
+    except (Base64Error, UnicodeDecodeError, ValueError):
+        raise ReservationException("Invalid page cursor.")
+
+
+def background_reservation_service(
+    session: Session, availability_cache: SeatAvailabilityCache | None = None
+) -> ReservationService:
+    """Constructs a ReservationService outside of a request, such as on a background thread.
+
+    Args:
+        session (Session): A database session owned by the caller.
+        availability_cache (SeatAvailabilityCache | None): The seat availability cache to use,
+            defaulting to the process-wide cache.
+
+    Returns:
+        ReservationService: A service constructed as it would be for a request.
+    """
+    return ReservationService(
+        session,
+        PermissionService(session),
+        PolicyService(session, policy_cache()),
+        OperatingHoursService(session, operating_hours_index()),
+        SeatService(session, seat_catalog_cache()),
+        availability_cache or seat_availability_cache(),
+        upcoming_reservation_index(),
+    )
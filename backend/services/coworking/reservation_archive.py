@@ -0,0 +1,301 @@
+"""Archive of reservations in terminal states.
+
+Cancelled and checked out reservations never change again, yet left in `coworking__reservation`
+they grow its indexes semester over semester and every overlap query filters past them.
+ReservationArchiveService moves them, once old enough, into the month-partitioned
+`coworking__reservation_archive` in batches, and reads history across both tables so that
+views of a user's past reservations do not need to know where a reservation is kept.
+"""
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Sequence
+from fastapi import Depends
+from sqlalchemy import delete, insert, select, text
+from sqlalchemy.orm import Session
+from ...database import db_session
+from ...entities import UserEntity
+from ...entities.coworking import (
+    ReservationArchiveEntity,
+    ReservationEntity,
+    RoomEntity,
+    reservation_seat_table,
+)
+from ...entities.coworking.reservation_user_table import reservation_user_table
+from ...models import User
+from ...models.user import UserIdentity
+from ...models.coworking import Reservation, ReservationState, TimeRange
+from ..permission import PermissionService
+from .reservation import MAXIMUM_PAGE_SIZE, ReservationException
+from .seat import SeatService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+ARCHIVED_STATES = (ReservationState.CANCELLED, ReservationState.CHECKED_OUT)
+"""Terminal states of reservations eligible for the archive."""
+
+ARCHIVE_BATCH_SIZE = 500
+"""Reservations moved to the archive per transaction."""
+
+HISTORY_PAGE_SIZE = 50
+"""Default number of reservations in a user's history."""
+
+_MAXIMUM_RESERVATION_SPAN = timedelta(days=1)
+"""Reservations never span more than a day of operating hours, which bounds the archive
+partitions a history window reads."""
+
+
+class ReservationArchiveService:
+    """ReservationArchiveService archives terminal reservations and reads history across the
+    reservation and archive tables."""
+
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        permission_svc: PermissionService = Depends(),
+        seat_svc: SeatService = Depends(),
+    ):
+        """Initializes a new ReservationArchiveService.
+
+        Args:
+            session (Session): The database session to use, typically injected by FastAPI.
+            permission_svc (PermissionService): Authorizes reads of other users' history.
+            seat_svc (SeatService): Catalog of the seats of archived reservations.
+        """
+        self._session = session
+        self._permission_svc = permission_svc
+        self._seat_svc = seat_svc
+
+    def archive(
+        self, ended_before: datetime, batch_size: int = ARCHIVE_BATCH_SIZE
+    ) -> int:
+        """Moves reservations in terminal states that ended before ended_before into the
+        archive.
+
+        Each batch is moved in its own transaction, so a long backlog never holds locks for
+        long. Reservations locked by another transaction are left for a later run.
+
+        Args:
+            ended_before (datetime): Reservations ending before this time are archived. In
+                production, this is the current time less PolicyService#reservation_archive_age.
+            batch_size (int): Reservations moved per transaction.
+
+        Returns:
+            int: The number of reservations archived.
+        """
+        archived = 0
+        while True:
+            ids = self._session.scalars(
+                select(ReservationEntity.id)
+                .where(
+                    ReservationEntity.state.in_(ARCHIVED_STATES),
+                    ReservationEntity.end < ended_before,
+                )
+                .order_by(ReservationEntity.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if len(ids) == 0:
+                break
+            self._archive_batch(ids)
+            self._session.commit()
+            archived += len(ids)
+            if len(ids) < batch_size:
+                break
+        return archived
+
+    def _archive_batch(self, ids: Sequence[int]) -> None:
+        """Copies the reservations with ids, with their users and seats, into the archive and
+        deletes them, without committing."""
+        user_ids: dict[int, list[int]] = {}
+        for reservation_id, user_id in self._session.execute(
+            select(
+                reservation_user_table.c.reservation_id,
+                reservation_user_table.c.user_id,
+            )
+            .where(reservation_user_table.c.reservation_id.in_(ids))
+            .order_by(reservation_user_table.c.user_id)
+        ):
+            user_ids.setdefault(reservation_id, []).append(user_id)
+        seat_ids: dict[int, list[int]] = {}
+        for reservation_id, seat_id in self._session.execute(
+            select(
+                reservation_seat_table.c.reservation_id,
+                reservation_seat_table.c.seat_id,
+            )
+            .where(reservation_seat_table.c.reservation_id.in_(ids))
+            .order_by(reservation_seat_table.c.seat_id)
+        ):
+            seat_ids.setdefault(reservation_id, []).append(seat_id)
+
+        now = datetime.now()
+        rows = [
+            {
+                "id": row.id,
+                "start": row.start,
+                "end": row.end,
+                "state": row.state,
+                "walkin": row.walkin,
+                "room_id": row.room_id,
+                "user_ids": user_ids.get(row.id, []),
+                "seat_ids": seat_ids.get(row.id, []),
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+                "archived_at": now,
+            }
+            for row in self._session.execute(
+                select(
+                    ReservationEntity.id,
+                    ReservationEntity.start,
+                    ReservationEntity.end,
+                    ReservationEntity.state,
+                    ReservationEntity.walkin,
+                    ReservationEntity.room_id,
+                    ReservationEntity.created_at,
+                    ReservationEntity.updated_at,
+                ).where(ReservationEntity.id.in_(ids))
+            )
+        ]
+        for month in sorted({_month(row["start"]) for row in rows}):
+            self._ensure_partition(month)
+        self._session.execute(insert(ReservationArchiveEntity), rows)
+
+        self._session.execute(
+            delete(reservation_user_table).where(
+                reservation_user_table.c.reservation_id.in_(ids)
+            )
+        )
+        self._session.execute(
+            delete(reservation_seat_table).where(
+                reservation_seat_table.c.reservation_id.in_(ids)
+            )
+        )
+        self._session.execute(
+            delete(ReservationEntity)
+            .where(ReservationEntity.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+
+    def _ensure_partition(self, month: datetime) -> None:
+        """Creates the archive partition of reservations starting in month, if missing."""
+        table = ReservationArchiveEntity.__tablename__
+        following = _month(month + timedelta(days=32))
+        self._session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {table}_{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+            )
+        )
+
+    def history(
+        self,
+        subject: User,
+        focus: UserIdentity,
+        window: TimeRange,
+        limit: int = HISTORY_PAGE_SIZE,
+    ) -> list[Reservation]:
+        """Reservations of a user overlapping window, whether archived or not.
+
+        Args:
+            subject (User): The user requesting the history.
+            focus (UserIdentity): The user whose reservations are listed.
+            window (TimeRange): The time range of interest.
+            limit (int): The most reservations returned.
+
+        Returns:
+            list[Reservation]: The most recent reservations first.
+
+        Raises:
+            UserPermissionException when subject does not have permission to read the history
+            ReservationException when limit is not between 1 and MAXIMUM_PAGE_SIZE
+        """
+        if subject.id != focus.id:
+            self._permission_svc.enforce(
+                subject, "coworking.reservation.read", f"user/{focus.id}"
+            )
+        if not 1 <= limit <= MAXIMUM_PAGE_SIZE:
+            raise ReservationException(
+                f"Page size must be between 1 and {MAXIMUM_PAGE_SIZE}."
+            )
+
+        hot = ReservationEntity.to_models(
+            self._session.query(ReservationEntity)
+            .filter(
+                ReservationEntity.start < window.end,
+                ReservationEntity.end > window.start,
+                ReservationEntity.users.any(UserEntity.id == focus.id),
+            )
+            .options(*ReservationEntity.bulk_load_options())
+            .order_by(ReservationEntity.start.desc(), ReservationEntity.id.desc())
+            .limit(limit)
+            .all()
+        )
+        archived = self._archived_models(
+            self._session.scalars(
+                select(ReservationArchiveEntity)
+                .where(
+                    ReservationArchiveEntity.user_ids.contains([focus.id]),
+                    ReservationArchiveEntity.start < window.end,
+                    ReservationArchiveEntity.start
+                    > window.start - _MAXIMUM_RESERVATION_SPAN,
+                    ReservationArchiveEntity.end > window.start,
+                )
+                .order_by(
+                    ReservationArchiveEntity.start.desc(),
+                    ReservationArchiveEntity.id.desc(),
+                )
+                .limit(limit)
+            ).all()
+        )
+
+        # Both lists are ordered, and a reservation is in one table or the other.
+        merged = heapq.merge(
+            hot,
+            archived,
+            key=lambda reservation: (reservation.start, reservation.id),
+            reverse=True,
+        )
+        return [reservation for reservation, _ in zip(merged, range(limit))]
+
+    def _archived_models(
+        self, entities: Sequence[ReservationArchiveEntity]
+    ) -> list[Reservation]:
+        """Converts archived reservations to models, loading their users and rooms at once.
+        Seats no longer in the catalog are omitted."""
+        user_ids = {id for entity in entities for id in entity.user_ids}
+        users = {
+            user.id: user.to_model()
+            for user in self._session.scalars(
+                select(UserEntity).where(UserEntity.id.in_(user_ids))
+            )
+        }
+        room_ids = {entity.room_id for entity in entities if entity.room_id}
+        rooms = {
+            room.id: room.to_model()
+            for room in self._session.scalars(
+                select(RoomEntity).where(RoomEntity.id.in_(room_ids))
+            )
+        }
+        seats = self._seat_svc.catalog().by_id
+        return [
+            Reservation.model_construct(
+                id=entity.id,
+                start=entity.start,
+                end=entity.end,
+                state=ReservationState(entity.state),
+                users=[users[id] for id in entity.user_ids if id in users],
+                seats=[seats[id] for id in entity.seat_ids if id in seats],
+                walkin=entity.walkin,
+                room=rooms.get(entity.room_id) if entity.room_id else None,
+                created_at=entity.created_at,
+                updated_at=entity.updated_at,
+            )
+            for entity in entities
+        ]
+
+
+def _month(moment: datetime) -> datetime:
+    """The start of the month of moment."""
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
@@ -1,10 +1,11 @@
 """Service that manages seats in the coworking space."""
 
 from fastapi import Depends
+from datetime import datetime
 from sqlalchemy.orm import Session
 from ...database import db_session
 from ...models.coworking import Seat, SeatDetails
-from ...entities.coworking import SeatEntity
+from .seat_catalog import SeatCatalog, SeatCatalogCache, seat_catalog_cache
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -14,19 +15,32 @@ __license__ = "MIT"
 class SeatService:
     """SeatService is the access layer to coworking seats."""
 
-    def __init__(self, session: Session = Depends(db_session)):
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        catalog_cache: SeatCatalogCache = Depends(seat_catalog_cache),
+    ):
         """Initializes a new RoomService.
 
         Args:
             session (Session): The database session to use, typically injected by FastAPI.
+            catalog_cache (SeatCatalogCache): Holder of the catalog shared across requests.
         """
         self._session = session
+        self._catalog_cache = catalog_cache
 
     def list(self) -> list[SeatDetails]:
         """Returns all seats in the coworking space.
 
         Returns:
-            list[SeatDetails]: All rooms in the coworking space orderd by increasing capacity.
+            list[SeatDetails]: All seats in the coworking space ordered by ID.
         """
-        entities = self._session.query(SeatEntity).all()
-        return [entity.to_model() for entity in entities]
+        return list(self.catalog().seats)
+
+    def catalog(self) -> SeatCatalog:
+        """Returns the immutable catalog of all seats, shared across requests.
+
+        Returns:
+            SeatCatalog: The current catalog, whose seats must not be modified.
+        """
+        return self._catalog_cache.get(self._session, datetime.now())
@@ -0,0 +1,140 @@
+"""Immutable, versioned catalog of the seats and rooms in the coworking space.
+
+Seats and rooms change only when the coworking space is reconfigured, yet every status request
+and reservation draft needs seat or room details. The catalog loads every seat once, with its
+room joined, and every room, and is shared by all requests until a committed edit to seats or
+rooms in this process, or age, makes it stale.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from types import MappingProxyType
+from typing import Mapping, Sequence
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from ...entities.coworking import RoomEntity, SeatEntity
+from ...models.coworking import RoomDetails, SeatDetails, SeatSearch
+from ...models.coworking.seat import SeatIdentity
+from .commit_hooks import after_commit_of
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+class SeatCatalog:
+    """Every seat and room in the coworking space as of a version. Seats and rooms are shared
+    and must not be modified."""
+
+    __slots__ = ("version", "loaded_at", "seats", "by_id", "rooms", "rooms_by_id")
+
+    version: int
+    loaded_at: datetime
+    seats: tuple[SeatDetails, ...]
+    by_id: Mapping[int, SeatDetails]
+    rooms: tuple[RoomDetails, ...]
+    rooms_by_id: Mapping[str, RoomDetails]
+
+    def __init__(
+        self,
+        version: int,
+        loaded_at: datetime,
+        seats: Sequence[SeatDetails],
+        rooms: Sequence[RoomDetails] = (),
+    ):
+        self.version = version
+        self.loaded_at = loaded_at
+        self.seats = tuple(seats)
+        self.by_id = MappingProxyType({seat.id: seat for seat in self.seats})
+        self.rooms = tuple(rooms)
+        self.rooms_by_id = MappingProxyType({room.id: room for room in self.rooms})
+
+    def lookup(self, identities: Sequence[SeatIdentity]) -> list[SeatDetails]:
+        """The seats with the given identities, in the given order, omitting unknown seats."""
+        return [
+            self.by_id[identity.id]
+            for identity in identities
+            if identity.id in self.by_id
+        ]
+
+    def search(self, criteria: SeatSearch) -> list[SeatDetails]:
+        """The seats meeting criteria, ordered by ID."""
+        return [seat for seat in self.seats if criteria.matches(seat)]
+
+    def reservable_rooms(self) -> list[RoomDetails]:
+        """The rooms reserved as a whole, ordered by increasing capacity."""
+        return [room for room in self.rooms if room.reservable]
+
+
+class SeatCatalogCache:
+    """Thread-safe holder of the current SeatCatalog."""
+
+    def __init__(self, max_age: timedelta = timedelta(minutes=5)):
+        """Initializes a new SeatCatalogCache.
+
+        Args:
+            max_age (timedelta): How long a catalog is trusted without a local edit.
+        """
+        self._max_age = max_age
+        self._lock = Lock()
+        self._version = 0
+        self._catalog: SeatCatalog | None = None
+
+    def get(self, session: Session, now: datetime) -> SeatCatalog:
+        """The current catalog, loaded using session if stale."""
+        catalog = self._catalog
+        if (
+            catalog is not None
+            and catalog.version == self._version
+            and catalog.loaded_at <= now < catalog.loaded_at + self._max_age
+        ):
+            return catalog
+
+        with self._lock:
+            version = self._version
+        entities = (
+            session.query(SeatEntity)
+            .options(joinedload(SeatEntity.room))
+            .order_by(SeatEntity.id)
+            .all()
+        )
+        # Room details are built without their seats, which the seats already reference.
+        rooms = [
+            RoomDetails(
+                id=room.id,
+                nickname=room.nickname,
+                building=room.building,
+                room=room.room,
+                capacity=room.capacity,
+                reservable=room.reservable,
+            )
+            for room in session.scalars(
+                select(RoomEntity).order_by(RoomEntity.capacity, RoomEntity.id)
+            )
+        ]
+        catalog = SeatCatalog(
+            version, now, [entity.to_model() for entity in entities], rooms
+        )
+        with self._lock:
+            # A catalog loaded while an edit committed is used only for this request.
+            if version == self._version:
+                self._catalog = catalog
+        return catalog
+
+    def invalidate(self) -> None:
+        """Marks the catalog stale. Called after edits to seats or rooms are committed."""
+        with self._lock:
+            self._version += 1
+
+
+_seat_catalog_cache = SeatCatalogCache()
+"""Process-wide catalog shared by all requests."""
+
+
+def seat_catalog_cache() -> SeatCatalogCache:
+    """Dependency injection of the process-wide SeatCatalogCache."""
+    return _seat_catalog_cache
+
+
+after_commit_of([SeatEntity, RoomEntity], _seat_catalog_cache.invalidate)
@@ -1,7 +1,9 @@
 """Reservation Service manages room and desk reservations for the XL."""
 
 from fastapi import Depends
-from datetime import datetime
+from datetime import datetime, timedelta
+from hashlib import blake2b
+from uuid import uuid4
 from sqlalchemy.orm import Session
 from ...database import db_session
 from .reservation import ReservationService
@@ -10,11 +12,19 @@ from .seat import SeatService
 from ...models.coworking import Status, TimeRange
 from ...models import User
 from .policy import PolicyService
+from .availability_cache import SeatAvailabilityCache, seat_availability_cache
+from .status_snapshot import StatusSnapshot, StatusSnapshotCache, status_snapshot_cache
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+ETAG_TICK = timedelta(minutes=1)
+"""How long a status ETag remains valid when coworking state does not change."""
+
+_PROCESS_ID = uuid4().hex
+"""Distinguishes ETags across processes, whose state versions are independent."""
+
 
 class StatusService:
     """RoleService is the access layer to the role data model, its members, and permissions."""
@@ -25,11 +35,15 @@ class StatusService:
         operating_hours_svc: OperatingHoursService = Depends(),
         seat_svc: SeatService = Depends(),
         reservation_svc: ReservationService = Depends(),
+        availability_cache: SeatAvailabilityCache = Depends(seat_availability_cache),
+        snapshot_cache: StatusSnapshotCache = Depends(status_snapshot_cache),
     ):
         self._policies_svc = policies_svc
         self._reservation_svc = reservation_svc
         self._operating_hours_svc = operating_hours_svc
         self._seat_svc = seat_svc
+        self._availability_cache = availability_cache
+        self._snapshot_cache = snapshot_cache
 
     def get_coworking_status(self, subject: User) -> Status:
         """All-in-one endpoint for a user to simultaneously get their own upcoming reservations and current status of the XL."""
@@ -37,29 +51,78 @@ class StatusService:
             subject, subject
         )
 
+        # Seat and room availability and operating hours are shared by every user whose
+        # policies are the same. Reservation changes advance the availability cache generation, so they
+        # are reflected in the very next snapshot.
         now = datetime.now()
-        walkin_window = TimeRange(
-            start=now,
-            end=now
-            + self._policies_svc.walkin_window(subject)
-            + 3 * self._policies_svc.walkin_initial_duration(subject),
-            # We triple walkin duration for end bounds to find seats not pre-reserved later. If XL stays
-            # relatively open, the walkin could then more likely be extended while it is not busy.
-            # This also prioritizes _not_ placing walkins in reservable seats.
+        walkin_end, reservation_window = self._windows(subject)
+        snapshot = self._snapshot_cache.get(
+            now,
+            (walkin_end, reservation_window, self._availability_cache.generation()),
+            lambda: self._snapshot(now, walkin_end, reservation_window),
+        )
+
+        return Status(
+            my_reservations=my_reservations,
+            seat_availability=snapshot.seat_availability,
+            operating_hours=snapshot.operating_hours,
+            room_availability=snapshot.room_availability,
+        )
+
+    def etag(self, subject: User) -> str:
+        """An entity tag of the subject's status, computed without querying the database.
+
+        The tag changes whenever coworking state changes in this process and, as the seat
+        availability within a status starts from the current moment, once every ETAG_TICK.
+
+        Args:
+            subject (User): The user whose status is tagged.
+
+        Returns:
+            str: A weak entity tag suitable for the ETag header.
+        """
+        tick = int(datetime.now().timestamp() // ETAG_TICK.total_seconds())
+        version = (
+            _PROCESS_ID,
+            self._availability_cache.generation(),
+            subject.id,
+            self._windows(subject),
+            tick,
+        )
+        return f'W/"{blake2b(repr(version).encode(), digest_size=12).hexdigest()}"'
+
+    def walkin_search_duration(self, subject: User) -> timedelta:
+        """How far past the current moment walk-in seat availability is searched."""
+        # We triple walkin duration for end bounds to find seats not pre-reserved later. If XL stays
+        # relatively open, the walkin could then more likely be extended while it is not busy.
+        # This also prioritizes _not_ placing walkins in reservable seats.
+        return self._policies_svc.walkin_window(
+            subject
+        ) + 3 * self._policies_svc.walkin_initial_duration(subject)
+
+    def _windows(self, subject: User) -> tuple[timedelta, timedelta]:
+        """The walk-in search duration and reservation window of the subject's policies."""
+        return (
+            self.walkin_search_duration(subject),
+            self._policies_svc.reservation_window(subject),
         )
+
+    def _snapshot(
+        self, now: datetime, walkin_end: timedelta, reservation_window: timedelta
+    ) -> StatusSnapshot:
+        """Computes the user-independent portion of the status."""
         seats = self._seat_svc.list()  # All Seats are fair game for walkin purposes
         seat_availability = self._reservation_svc.seat_availability(
-            seats, walkin_window
+            seats, TimeRange(start=now, end=now + walkin_end)
         )
 
         operating_hours = self._operating_hours_svc.schedule(
-            TimeRange(
-                start=now, end=now + self._policies_svc.reservation_window(subject)
-            )
+            TimeRange(start=now, end=now + reservation_window)
         )
 
-        return Status(
-            my_reservations=my_reservations,
-            seat_availability=seat_availability,
-            operating_hours=operating_hours,
+        # Rooms are reserved in advance, so their availability spans the reservation window.
+        room_availability = self._reservation_svc.room_availability(
+            TimeRange(start=now, end=now + reservation_window)
         )
+
+        return StatusSnapshot(seat_availability, operating_hours, room_availability)
@@ -0,0 +1,86 @@
+"""Snapshot of the parts of the coworking status shared by every user.
+
+Seat availability for the walk-in window, room availability for the reservation window and the
+upcoming operating hours are the same for every user polling the status endpoint in the same moment. A snapshot of them is computed at
+most once per tick, per distinct set of policy values, and shared by all requests in that tick.
+Concurrent requests for a snapshot not yet computed wait on a single computation of it.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from typing import Callable, Hashable, Sequence
+from ...models.coworking import OperatingHours, RoomAvailability, SeatAvailability
+from ...models.coworking.availability_engine import to_micros, duration_micros
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """The user-independent portion of a Status."""
+
+    seat_availability: Sequence[SeatAvailability]
+    operating_hours: Sequence[OperatingHours]
+    room_availability: Sequence[RoomAvailability] = ()
+
+
+class StatusSnapshotCache:
+    """Thread-safe, single-flight holder of the status snapshots of the current tick."""
+
+    def __init__(self, tick: timedelta = timedelta(seconds=1)):
+        """Initializes a new StatusSnapshotCache.
+
+        Args:
+            tick (timedelta): How long a snapshot is shared for, aligned to multiples of it.
+        """
+        self._tick = duration_micros(tick)
+        self._lock = Lock()
+        self._compute_lock = Lock()
+        self._snapshots: dict[tuple, StatusSnapshot] = {}
+
+    def get(
+        self, now: datetime, key: Hashable, compute: Callable[[], StatusSnapshot]
+    ) -> StatusSnapshot:
+        """Returns the snapshot for key in the tick containing now, computing it if needed.
+
+        Args:
+            now (datetime): The moment of the request.
+            key (Hashable): Everything besides time the snapshot depends on, such as policy
+                values and the generation of the seat availability cache.
+            compute (Callable[[], StatusSnapshot]): Computes the snapshot when it is absent.
+
+        Returns:
+            StatusSnapshot: A snapshot shared with other requests, which must not be modified.
+        """
+        tick = to_micros(now) // self._tick
+        with self._lock:
+            snapshot = self._snapshots.get((tick, key))
+        if snapshot is not None:
+            return snapshot
+
+        with self._compute_lock:
+            with self._lock:
+                snapshot = self._snapshots.get((tick, key))
+            if snapshot is not None:
+                return snapshot
+            snapshot = compute()
+            with self._lock:
+                self._snapshots = {
+                    entry_key: entry
+                    for entry_key, entry in self._snapshots.items()
+                    if entry_key[0] >= tick
+                }
+                self._snapshots[(tick, key)] = snapshot
+            return snapshot
+
+
+_status_snapshot_cache = StatusSnapshotCache()
+"""Process-wide snapshot cache shared by all requests."""
+
+
+def status_snapshot_cache() -> StatusSnapshotCache:
+    """Dependency injection of the process-wide StatusSnapshotCache."""
+    return _status_snapshot_cache
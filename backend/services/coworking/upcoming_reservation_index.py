@@ -0,0 +1,124 @@
+"""In-memory index of the starts of upcoming reservations of each seat and room.
+
+Whether a reservation can be extended, and until when, depends only on when the next
+reservation of its seats or room begins. Rather than computing seat availability for every
+reservation shown to a user, the index holds the sorted starts of the active reservations
+beginning within a horizon of the moment it loads, per seat and per room, and answers by
+bisection. The index is stamped with the generation of the seat availability cache, which
+advances whenever reservations change in this process, and is stale once it advances or the
+index ages, bounding how long reservations made by other processes go unseen.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Sequence
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+Booked = int | str
+"""The ID of a seat, or of a room reserved as a whole."""
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    generation: int
+    loaded_at: datetime
+    covers_until: datetime
+    starts: dict[Booked, list[datetime]]
+
+
+class UpcomingReservationIndex:
+    """Thread-safe index of upcoming reservation starts answering next booking lookups by
+    bisection."""
+
+    def __init__(
+        self,
+        horizon: timedelta = timedelta(hours=12),
+        max_age: timedelta = timedelta(minutes=1),
+    ):
+        """Initializes a new, empty UpcomingReservationIndex.
+
+        Args:
+            horizon (timedelta): How far past the moment of loading the index covers.
+            max_age (timedelta): How long a load is trusted without a local change.
+        """
+        self.horizon = horizon
+        self._max_age = max_age
+        self._snapshot: _Snapshot | None = None
+
+    def next_start(
+        self,
+        booked: Sequence[Booked],
+        after: datetime,
+        until: datetime,
+        now: datetime,
+        generation: int,
+    ) -> datetime | None:
+        """The earliest start at or after `after` of a reservation of any of the seats or rooms,
+        or until if none starts before it. None if the index is stale or does not cover
+        the range from after to until."""
+        snapshot = self._snapshot
+        if (
+            not self._is_fresh(snapshot, now, generation)
+            or after < snapshot.loaded_at
+            or until > snapshot.covers_until
+        ):
+            return None
+        earliest = until
+        for id in booked:
+            starts = snapshot.starts.get(id)
+            if starts is None:
+                continue
+            i = bisect_left(starts, after)
+            if i < len(starts) and starts[i] < earliest:
+                earliest = starts[i]
+        return earliest
+
+    def is_fresh(self, now: datetime, generation: int) -> bool:
+        """Whether the index reflects every reservation change made in this process."""
+        return self._is_fresh(self._snapshot, now, generation)
+
+    def load(
+        self,
+        now: datetime,
+        generation: int,
+        bookings: Iterable[tuple[Booked, datetime]],
+    ) -> None:
+        """Replaces the index with bookings, the seat or room and start of every active
+        reservation starting from now to the horizon.
+
+        Args:
+            now (datetime): The moment the bookings were read.
+            generation (int): The generation of the seat availability cache read before the
+                bookings were, so that bookings read concurrently with a change are never
+                trusted.
+            bookings (Iterable[tuple[Booked, datetime]]): The bookings, in any order.
+        """
+        starts: dict[Booked, list[datetime]] = {}
+        for id, start in bookings:
+            starts.setdefault(id, []).append(start)
+        for id_starts in starts.values():
+            id_starts.sort()
+        # Snapshots are replaced whole, so readers never see a partial load.
+        self._snapshot = _Snapshot(generation, now, now + self.horizon, starts)
+
+    def _is_fresh(
+        self, snapshot: _Snapshot | None, now: datetime, generation: int
+    ) -> bool:
+        return (
+            snapshot is not None
+            and snapshot.generation == generation
+            and snapshot.loaded_at <= now < snapshot.loaded_at + self._max_age
+        )
+
+
+_upcoming_reservation_index = UpcomingReservationIndex()
+"""Process-wide index shared by all requests."""
+
+
+def upcoming_reservation_index() -> UpcomingReservationIndex:
+    """Dependency injection of the process-wide UpcomingReservationIndex."""
+    return _upcoming_reservation_index
@@ -0,0 +1,298 @@
+"""Hourly utilization rollup of the seats in coworking rooms.
+
+Answering how full a room was each hour from the reservations themselves scans every
+reservation and its seats. Instead, ReservationService records how each reservation's
+contribution to the `coworking__utilization_hour` rollup changes as it changes state, in the same
+transaction as the change, and UtilizationService reads the rollup. Reservations made before
+the rollup existed are added by `UtilizationService#backfill`.
+
+A reservation contributes its seat-seconds within each hour to the room of each of its seats:
+
+1. Confirmed, checked in and checked out reservations count as reserved.
+2. Checked in and checked out reservations also count as checked in.
+3. Confirmed reservations cancelled once their check-in window passed, as the expiry sweeper
+   does, count as reserved and as no-shows.
+"""
+
+from datetime import datetime, timedelta
+from typing import Iterable, Sequence
+from fastapi import Depends
+from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, selectinload
+from ...database import db_session
+from ...entities.coworking import (
+    ReservationArchiveEntity,
+    ReservationEntity,
+    SeatEntity,
+    UtilizationHourEntity,
+)
+from ...models import User
+from ...models.coworking import ReservationState, TimeRange, UtilizationHour
+from ..permission import PermissionService
+from .policy import PolicyService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+UTILIZATION_BUCKET = timedelta(hours=1)
+"""Width of a rollup bucket."""
+
+_RESERVED_STATES = (
+    ReservationState.CONFIRMED,
+    ReservationState.CHECKED_IN,
+    ReservationState.CHECKED_OUT,
+)
+
+_CHECKED_IN_STATES = (ReservationState.CHECKED_IN, ReservationState.CHECKED_OUT)
+
+_ROLLUP_BATCH_SIZE = 1000
+"""Rows written to the rollup per statement."""
+
+Utilization = dict[tuple[str, datetime], tuple[int, int, int]]
+"""Seat-seconds by (room ID, hour) as (reserved, checked in, no-show)."""
+
+
+def utilization(
+    state: ReservationState,
+    start: datetime,
+    end: datetime,
+    room_ids: Sequence[str],
+    no_show: bool = False,
+) -> Utilization:
+    """The contribution of a reservation to the rollup.
+
+    Args:
+        state (ReservationState): The reservation's state.
+        start (datetime): The reservation's start.
+        end (datetime): The reservation's end.
+        room_ids (Sequence[str]): The room of each of the reservation's seats.
+        no_show (bool): Whether the reservation was cancelled as a no-show.
+
+    Returns:
+        Utilization: The reservation's seat-seconds in each room and hour it spans.
+    """
+    if not (state in _RESERVED_STATES or no_show) or end <= start:
+        return {}
+
+    checked_in = 1 if state in _CHECKED_IN_STATES else 0
+    missed = 1 if no_show else 0
+    contribution: Utilization = {}
+    hour = start.replace(minute=0, second=0, microsecond=0)
+    while hour < end:
+        # Truncating each bound to the second, rather than each duration, keeps the sum of
+        # the hours equal to the reservation's whole seconds.
+        seconds = int(
+            (
+                min(end, hour + UTILIZATION_BUCKET).replace(microsecond=0)
+                - max(start, hour).replace(microsecond=0)
+            ).total_seconds()
+        )
+        for room_id in room_ids:
+            reserved, checked_in_seconds, no_show_seconds = contribution.get(
+                (room_id, hour), (0, 0, 0)
+            )
+            contribution[(room_id, hour)] = (
+                reserved + seconds,
+                checked_in_seconds + seconds * checked_in,
+                no_show_seconds + seconds * missed,
+            )
+        hour += UTILIZATION_BUCKET
+    return contribution
+
+
+def reservation_utilization(
+    entity: ReservationEntity, no_show: bool = False
+) -> Utilization:
+    """The contribution of a reservation entity to the rollup, as it is now."""
+    return utilization(
+        entity.state,
+        entity.start,
+        entity.end,
+        [seat.room_id for seat in entity.seats if seat.room_id is not None],
+        no_show,
+    )
+
+
+def record_utilization(
+    session: Session, changes: Iterable[tuple[Utilization, Utilization]]
+) -> None:
+    """Adds the difference between each (before, after) pair of contributions to the rollup
+    without committing.
+
+    Rows are upserted in key order so that concurrent transactions recording changes to the
+    same hours lock them in the same order."""
+    deltas: dict[tuple[str, datetime], list[int]] = {}
+    for before, after in changes:
+        for key, seconds in after.items():
+            delta = deltas.setdefault(key, [0, 0, 0])
+            for i in range(3):
+                delta[i] += seconds[i]
+        for key, seconds in before.items():
+            delta = deltas.setdefault(key, [0, 0, 0])
+            for i in range(3):
+                delta[i] -= seconds[i]
+
+    rows = [
+        {
+            "room_id": room_id,
+            "hour": hour,
+            "reserved_seat_seconds": delta[0],
+            "checked_in_seat_seconds": delta[1],
+            "no_show_seat_seconds": delta[2],
+        }
+        for (room_id, hour), delta in sorted(deltas.items())
+        if any(delta)
+    ]
+    for i in range(0, len(rows), _ROLLUP_BATCH_SIZE):
+        statement = insert(UtilizationHourEntity).values(
+            rows[i : i + _ROLLUP_BATCH_SIZE]
+        )
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    UtilizationHourEntity.room_id,
+                    UtilizationHourEntity.hour,
+                ],
+                set_={
+                    column: getattr(UtilizationHourEntity, column)
+                    + statement.excluded[column]
+                    for column in (
+                        "reserved_seat_seconds",
+                        "checked_in_seat_seconds",
+                        "no_show_seat_seconds",
+                    )
+                },
+            )
+        )
+
+
+class UtilizationService:
+    """UtilizationService reads and rebuilds the hourly utilization rollup."""
+
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        permission_svc: PermissionService = Depends(),
+        policy_svc: PolicyService = Depends(),
+    ):
+        """Initializes a new UtilizationService.
+
+        Args:
+            session (Session): The database session to use, typically injected by FastAPI.
+            permission_svc (PermissionService): Authorizes reads of the rollup.
+            policy_svc (PolicyService): Check-in timeout used to identify no-shows.
+        """
+        self._session = session
+        self._permission_svc = permission_svc
+        self._policy_svc = policy_svc
+
+    def hourly(
+        self, subject: User, window: TimeRange, room_id: str | None = None
+    ) -> list[UtilizationHour]:
+        """Utilization of each room, or of one room, in each hour overlapping window.
+
+        Hours without reservations are omitted.
+
+        Args:
+            subject (User): The user requesting utilization.
+            window (TimeRange): The time range of interest.
+            room_id (str | None): The room of interest, or None for every room.
+
+        Returns:
+            list[UtilizationHour]: Utilization ordered by hour and then room.
+
+        Raises:
+            UserPermissionException when user does not have permission to read utilization
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.utilization.read", "coworking.utilization"
+        )
+        query = select(UtilizationHourEntity).where(
+            UtilizationHourEntity.hour
+            >= window.start.replace(minute=0, second=0, microsecond=0),
+            UtilizationHourEntity.hour < window.end,
+        )
+        if room_id is not None:
+            query = query.where(UtilizationHourEntity.room_id == room_id)
+        query = query.order_by(
+            UtilizationHourEntity.hour, UtilizationHourEntity.room_id
+        )
+        return [entity.to_model() for entity in self._session.scalars(query)]
+
+    def backfill(self, batch_size: int = 1000) -> int:
+        """Rebuilds the rollup from every reservation, including archived reservations, streamed
+        from the database in batches.
+
+        The rollup is locked while it is rebuilt, so changes recorded concurrently wait and
+        apply on top of the rebuilt rollup. Reservations cancelled once their check-in window
+        passed are counted as no-shows.
+
+        Args:
+            batch_size (int): Reservations loaded from the database at a time.
+
+        Returns:
+            int: The number of reservations read, archived or not.
+        """
+        self._session.execute(
+            text(f"LOCK TABLE {UtilizationHourEntity.__tablename__} IN EXCLUSIVE MODE")
+        )
+        self._session.execute(delete(UtilizationHourEntity))
+
+        checkin_timeout = self._policy_svc.reservation_checkin_timeout()
+        totals: Utilization = {}
+        count = 0
+
+        def add(contribution: Utilization) -> None:
+            for key, seconds in contribution.items():
+                total = totals.get(key, (0, 0, 0))
+                totals[key] = (
+                    total[0] + seconds[0],
+                    total[1] + seconds[1],
+                    total[2] + seconds[2],
+                )
+
+        reservations = self._session.scalars(
+            select(ReservationEntity)
+            .options(selectinload(ReservationEntity.seats))
+            .execution_options(yield_per=batch_size)
+        )
+        for entity in reservations:
+            no_show = (
+                entity.state == ReservationState.CANCELLED
+                and entity.updated_at >= entity.start + checkin_timeout
+            )
+            add(reservation_utilization(entity, no_show))
+            count += 1
+
+        # Archived reservations carry their seats as IDs, whose rooms are looked up here.
+        seat_rooms: dict[int, str] = {
+            id: room_id
+            for id, room_id in self._session.execute(
+                select(SeatEntity.id, SeatEntity.room_id)
+            )
+            if room_id is not None
+        }
+        archived = self._session.execute(
+            select(
+                ReservationArchiveEntity.state,
+                ReservationArchiveEntity.start,
+                ReservationArchiveEntity.end,
+                ReservationArchiveEntity.seat_ids,
+                ReservationArchiveEntity.updated_at,
+            ).execution_options(yield_per=batch_size)
+        )
+        for state, start, end, seat_ids, updated_at in archived:
+            state = ReservationState(state)
+            no_show = (
+                state == ReservationState.CANCELLED
+                and updated_at >= start + checkin_timeout
+            )
+            room_ids = [seat_rooms[id] for id in seat_ids if id in seat_rooms]
+            add(utilization(state, start, end, room_ids, no_show))
+            count += 1
+
+        record_utilization(self._session, [({}, totals)])
+        self._session.commit()
+        return count
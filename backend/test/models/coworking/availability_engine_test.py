@@ -0,0 +1,236 @@
+"""Unit tests for the array-backed availability engine."""
+
+import pytest
+from array import array
+from random import Random
+from ....models.coworking import TimeRange
+from ....models.coworking.availability_engine import (
+    IntervalSet,
+    SlotGrid,
+    to_micros,
+    from_micros,
+    duration_micros,
+)
+from ...services.coworking.time import *
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _interval_set(time_ranges: list[TimeRange]) -> IntervalSet:
+    return IntervalSet.from_time_ranges(time_ranges)
+
+
+def test_micros_round_trip(time: dict[str, datetime]):
+    assert from_micros(to_micros(time[NOW])) == time[NOW]
+    assert duration_micros(FIVE_MINUTES) == 5 * 60 * 1_000_000
+
+
+def test_from_time_ranges(time: dict[str, datetime]):
+    interval_set = _interval_set(
+        [
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+        ]
+    )
+    assert len(interval_set) == 2
+    assert interval_set.to_time_ranges() == [
+        TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+        TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+    ]
+
+
+def test_copy_is_independent(time: dict[str, datetime]):
+    original = _interval_set([TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])])
+    copy = original.copy()
+    copy.subtract(to_micros(time[NOW]), to_micros(time[IN_THIRTY_MINUTES]))
+    assert original.to_time_ranges()[0].start == time[NOW]
+    assert copy.to_time_ranges()[0].start == time[IN_THIRTY_MINUTES]
+
+
+def test_constrain_front_and_back(time: dict[str, datetime]):
+    interval_set = _interval_set(
+        [
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+        ]
+    )
+    interval_set.constrain(
+        to_micros(time[NOW] + ONE_MINUTE), to_micros(time[IN_TWO_HOURS] - ONE_MINUTE)
+    )
+    assert interval_set.to_time_ranges() == [
+        TimeRange(start=time[NOW] + ONE_MINUTE, end=time[IN_THIRTY_MINUTES]),
+        TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS] - ONE_MINUTE),
+    ]
+
+
+def test_constrain_drops_outside(time: dict[str, datetime]):
+    interval_set = _interval_set(
+        [
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+        ]
+    )
+    interval_set.constrain(
+        to_micros(time[IN_THIRTY_MINUTES]), to_micros(time[IN_TWO_HOURS])
+    )
+    assert interval_set.to_time_ranges() == [
+        TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS])
+    ]
+
+
+def test_constrain_empty(time: dict[str, datetime]):
+    interval_set = _interval_set([TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])])
+    interval_set.constrain(to_micros(time[IN_TWO_HOURS]), to_micros(time[TOMORROW]))
+    assert len(interval_set) == 0
+
+
+def test_subtract_inside(time: dict[str, datetime]):
+    interval_set = _interval_set(
+        [
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+        ]
+    )
+    interval_set.subtract(
+        to_micros(time[NOW] + FIVE_MINUTES), to_micros(time[NOW] + 2 * FIVE_MINUTES)
+    )
+    assert interval_set.to_time_ranges() == [
+        TimeRange(start=time[NOW], end=time[NOW] + FIVE_MINUTES),
+        TimeRange(start=time[NOW] + 2 * FIVE_MINUTES, end=time[IN_THIRTY_MINUTES]),
+        TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+    ]
+
+
+def test_subtract_across_boundaries(time: dict[str, datetime]):
+    interval_set = _interval_set(
+        [
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+        ]
+    )
+    interval_set.subtract(
+        to_micros(time[IN_THIRTY_MINUTES] - FIVE_MINUTES),
+        to_micros(time[IN_ONE_HOUR] + FIVE_MINUTES),
+    )
+    assert interval_set.to_time_ranges() == [
+        TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES] - FIVE_MINUTES),
+        TimeRange(start=time[IN_ONE_HOUR] + FIVE_MINUTES, end=time[IN_TWO_HOURS]),
+    ]
+
+
+def test_subtract_all(time: dict[str, datetime]):
+    interval_set = _interval_set(
+        [
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+        ]
+    )
+    interval_set.subtract(to_micros(time[NOW]), to_micros(time[IN_TWO_HOURS]))
+    assert len(interval_set) == 0
+
+
+def test_subtract_no_overlap(time: dict[str, datetime]):
+    interval_set = _interval_set(
+        [TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS])]
+    )
+    interval_set.subtract(to_micros(time[NOW]), to_micros(time[IN_ONE_HOUR]))
+    interval_set.subtract(to_micros(time[IN_TWO_HOURS]), to_micros(time[TOMORROW]))
+    assert interval_set.to_time_ranges() == [
+        TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS])
+    ]
+
+
+def test_prune(time: dict[str, datetime]):
+    interval_set = _interval_set(
+        [
+            TimeRange(start=time[NOW], end=time[NOW] + FIVE_MINUTES),
+            TimeRange(start=time[NOW] + FIVE_MINUTES, end=time[NOW] + THIRTY_MINUTES),
+        ]
+    )
+    interval_set.prune(duration_micros(FIVE_MINUTES))
+    assert len(interval_set) == 2
+    interval_set.prune(duration_micros(FIVE_MINUTES + timedelta(seconds=1)))
+    assert interval_set.to_time_ranges() == [
+        TimeRange(start=time[NOW] + FIVE_MINUTES, end=time[NOW] + THIRTY_MINUTES)
+    ]
+
+
+def test_to_bits():
+    width = duration_micros(FIVE_MINUTES)
+    interval_set = IntervalSet(
+        array("q", [width // 2, 3 * width, 9 * width]),
+        array("q", [2 * width, 5 * width + 1, 20 * width]),
+    )
+    # Slot 0 is partially free, slots 9 and beyond are clamped to the grid's 10 slots.
+    assert interval_set.to_bits(0, width, 10) == 0b1000011010
+    assert IntervalSet().to_bits(0, width, 10) == 0
+
+
+def test_slot_grid_aligned_to_width(time: dict[str, datetime]):
+    width = duration_micros(FIVE_MINUTES)
+    free = _interval_set([TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])])
+    grid = SlotGrid.covering(free, width, [1, 2])
+    assert grid.origin % width == 0
+    for key in (1, 2):
+        runs = grid.free_runs(key)
+        assert len(runs) == 1
+        assert runs.starts[0] % width == 0
+        assert runs.starts[0] >= to_micros(time[NOW])
+        assert runs.ends[0] <= to_micros(time[IN_ONE_HOUR])
+
+
+def test_slot_grid_occupy_many():
+    width = duration_micros(FIVE_MINUTES)
+    free = IntervalSet(array("q", [0]), array("q", [12 * width]))
+    grid = SlotGrid.covering(free, width, [1, 2])
+    grid.occupy_many(
+        [
+            (1, 2 * width, 3 * width),
+            (1, 6 * width + 1, 8 * width),
+            (2, 11 * width, 20 * width),
+            (3, 0, 12 * width),
+        ]
+    )
+    assert list(grid.free_runs(1).starts) == [0, 3 * width, 8 * width]
+    assert list(grid.free_runs(1).ends) == [2 * width, 6 * width, 12 * width]
+    assert list(grid.free_runs(2).starts) == [0]
+    assert list(grid.free_runs(2).ends) == [11 * width]
+    assert 3 not in grid.rows
+
+
+def test_slot_grid_free_runs_minimum():
+    width = duration_micros(FIVE_MINUTES)
+    free = IntervalSet(array("q", [0]), array("q", [12 * width]))
+    grid = SlotGrid.covering(free, width, [1])
+    grid.occupy_many([(1, 2 * width, 3 * width), (1, 6 * width, 8 * width)])
+    runs = grid.free_runs(1, minimum=3)
+    assert list(runs.starts) == [3 * width, 8 * width]
+    assert list(runs.ends) == [6 * width, 12 * width]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_subtract_many_equivalent_to_subtract(seed: int):
+    """Property: subtracting blocks in bulk matches subtracting them one at a time."""
+    rng = Random(seed)
+    starts = array("q")
+    ends = array("q")
+    cursor = 0
+    for _ in range(rng.randint(0, 8)):
+        starts.append(cursor + rng.randint(0, 30))
+        ends.append(starts[-1] + rng.randint(1, 90))
+        cursor = ends[-1]
+    one_at_a_time = IntervalSet(starts, ends)
+    bulk = one_at_a_time.copy()
+    blocks = []
+    for _ in range(rng.randint(0, 12)):
+        start = rng.randint(-30, 600)
+        blocks.append((start, start + rng.randint(1, 120)))
+
+    for start, end in blocks:
+        one_at_a_time.subtract(start, end)
+    bulk.subtract_many(blocks)
+
+    assert bulk.starts == one_at_a_time.starts
+    assert bulk.ends == one_at_a_time.ends
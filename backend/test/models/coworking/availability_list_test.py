@@ -1,6 +1,7 @@
 """Unit tests for AvailabilityList model."""
 
 import pytest
+from random import Random
 from pydantic import ValidationError
 from ....models.coworking import AvailabilityList, TimeRange
 from ...services.coworking.time import *
@@ -263,3 +264,86 @@ def test_total_duration_multiple(time: dict[str, datetime]):
         ]
     )
     assert availability_list.total_duration() == timedelta(minutes=30)
+
+
+def test_subtract_many_empty_blocks(time: dict[str, datetime]):
+    availability_list = AvailabilityList(
+        availability=[TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES])]
+    )
+    availability_list.subtract_many([])
+    assert len(availability_list.availability) == 1
+    assert availability_list.availability[0].start == time[NOW]
+
+
+def test_subtract_many_unsorted_overlapping_blocks(time: dict[str, datetime]):
+    availability_list = AvailabilityList(
+        availability=[
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_THREE_HOURS]),
+        ]
+    )
+    availability_list.subtract_many(
+        [
+            TimeRange(start=time[IN_TWO_HOURS], end=time[IN_TWO_HOURS] + FIVE_MINUTES),
+            TimeRange(
+                start=time[IN_THIRTY_MINUTES] - FIVE_MINUTES,
+                end=time[IN_ONE_HOUR] + FIVE_MINUTES,
+            ),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_ONE_HOUR] + ONE_MINUTE),
+        ]
+    )
+    assert availability_list.availability == [
+        TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES] - FIVE_MINUTES),
+        TimeRange(start=time[IN_ONE_HOUR] + FIVE_MINUTES, end=time[IN_TWO_HOURS]),
+        TimeRange(start=time[IN_TWO_HOURS] + FIVE_MINUTES, end=time[IN_THREE_HOURS]),
+    ]
+
+
+def _random_availability_list(rng: Random, origin: datetime) -> AvailabilityList:
+    availability: list[TimeRange] = []
+    cursor = origin
+    for _ in range(rng.randint(0, 8)):
+        start = cursor + rng.randint(0, 30) * ONE_MINUTE
+        end = start + rng.randint(1, 90) * ONE_MINUTE
+        availability.append(TimeRange(start=start, end=end))
+        cursor = end
+    return AvailabilityList(availability=availability)
+
+
+def _random_blocks(rng: Random, origin: datetime) -> list[TimeRange]:
+    blocks: list[TimeRange] = []
+    for _ in range(rng.randint(0, 12)):
+        start = origin + rng.randint(-30, 600) * ONE_MINUTE
+        blocks.append(
+            TimeRange(start=start, end=start + rng.randint(1, 120) * ONE_MINUTE)
+        )
+    return blocks
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_subtract_many_equivalent_to_subtract(seed: int, time: dict[str, datetime]):
+    """Property: subtracting blocks in bulk matches subtracting them one at a time."""
+    rng = Random(seed)
+    one_at_a_time = _random_availability_list(rng, time[NOW])
+    bulk = one_at_a_time.model_copy(deep=True)
+    blocks = _random_blocks(rng, time[NOW])
+
+    for block in blocks:
+        one_at_a_time.subtract(block)
+    bulk.subtract_many(blocks)
+
+    assert bulk.availability == one_at_a_time.availability
+    AvailabilityList(availability=bulk.availability)  # Still sorted and non-overlapping
+
+
+def test_subtract_availability_in_gap(time: dict[str, datetime]):
+    availability_list = AvailabilityList(
+        availability=[
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_ONE_HOUR], end=time[IN_TWO_HOURS]),
+        ]
+    )
+    availability_list.subtract(
+        TimeRange(start=time[IN_THIRTY_MINUTES], end=time[IN_ONE_HOUR])
+    )
+    assert len(availability_list.availability) == 2
@@ -0,0 +1,140 @@
+"""Tests for the SeatAvailabilityPublisher behind the seat availability stream."""
+
+import asyncio
+import pytest
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+
+from ....services.coworking import ReservationService
+from ....services.coworking.availability_cache import SeatAvailabilityCache
+from ....services.coworking.availability_publisher import (
+    SeatAvailabilityPublisher,
+    Subscription,
+)
+from ....models.coworking import SeatAvailabilityDelta
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import (
+    reservation_svc,
+    availability_cache,
+    permission_svc,
+    seat_svc,
+    seat_catalog_cache,
+    policy_svc,
+    operating_hours_svc,
+    operating_hours_index,
+)
+from .time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .operating_hours_data import fake_data_fixture as insert_order_1
+from .room_data import fake_data_fixture as insert_order_2
+from .seat_data import fake_data_fixture as insert_order_3
+from .reservation.reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ..core_data import user_data
+from .reservation import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+WALKIN_SEARCH_DURATION = timedelta(hours=2)
+
+
+@pytest.fixture()
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture()
+def publisher(test_engine: Engine, availability_cache: SeatAvailabilityCache):
+    return SeatAvailabilityPublisher(
+        lambda: Session(test_engine), availability_cache, queue_size=2
+    )
+
+
+def _next(
+    loop: asyncio.AbstractEventLoop, subscription: Subscription
+) -> SeatAvailabilityDelta | None:
+    return loop.run_until_complete(subscription.next(0.05))
+
+
+def test_subscribe_snapshot(
+    publisher: SeatAvailabilityPublisher, loop: asyncio.AbstractEventLoop
+):
+    subscription, snapshot = publisher.subscribe(WALKIN_SEARCH_DURATION, loop)
+    assert snapshot.snapshot
+    assert len(snapshot.seats) > 0
+    assert publisher.subscriber_count() == 1
+    assert _next(loop, subscription) is None
+
+
+def test_publish_without_change(
+    publisher: SeatAvailabilityPublisher, loop: asyncio.AbstractEventLoop
+):
+    """Availability that merely starts later as time passes is not a change."""
+    subscription, _ = publisher.subscribe(WALKIN_SEARCH_DURATION, loop)
+    publisher.publish()
+    assert _next(loop, subscription) is None
+
+
+def test_publish_delta_after_draft(
+    publisher: SeatAvailabilityPublisher,
+    reservation_svc: ReservationService,
+    loop: asyncio.AbstractEventLoop,
+):
+    subscriptions = [
+        publisher.subscribe(WALKIN_SEARCH_DURATION, loop)[0] for _ in range(3)
+    ]
+    reservation = reservation_svc.draft_reservation(
+        user_data.ambassador, reservation_data.test_request()
+    )
+    publisher.publish()
+
+    seat_id = reservation.seats[0].id
+    for subscription in subscriptions:
+        delta = _next(loop, subscription)
+        assert delta is not None
+        assert not delta.snapshot
+        assert list(delta.seats) == [seat_id]
+        assert all(
+            time_range.start >= reservation.end for time_range in delta.seats[seat_id]
+        )
+
+
+def test_slow_subscriber_resynchronized(
+    publisher: SeatAvailabilityPublisher, loop: asyncio.AbstractEventLoop
+):
+    subscription, snapshot = publisher.subscribe(WALKIN_SEARCH_DURATION, loop)
+    delta = SeatAvailabilityDelta(version=1, snapshot=False, seats={})
+    for _ in range(3):
+        subscription.offer(delta, snapshot)
+    assert _next(loop, subscription) == snapshot
+    assert _next(loop, subscription) is None
+    assert subscription.dropped == 2
+
+
+def test_unsubscribe(
+    publisher: SeatAvailabilityPublisher, loop: asyncio.AbstractEventLoop
+):
+    subscription, _ = publisher.subscribe(WALKIN_SEARCH_DURATION, loop)
+    publisher.unsubscribe(subscription)
+    publisher.unsubscribe(subscription)
+    assert publisher.subscriber_count() == 0
+
+
+def test_start_stop_listens_to_invalidations(
+    publisher: SeatAvailabilityPublisher,
+    availability_cache: SeatAvailabilityCache,
+):
+    publisher.start()
+    availability_cache.invalidate()
+    publisher.stop()
+    publisher.stop()
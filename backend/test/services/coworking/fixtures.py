@@ -11,7 +11,15 @@ from ....services.coworking import (
     ReservationService,
     PolicyService,
     StatusService,
+    UtilizationService,
+    ReservationArchiveService,
 )
+from ....services.coworking.availability_cache import SeatAvailabilityCache
+from ....services.coworking.status_snapshot import StatusSnapshotCache
+from ....services.coworking.operating_hours_index import OperatingHoursIndex
+from ....services.coworking.policy_cache import PolicyCache
+from ....services.coworking.seat_catalog import SeatCatalogCache
+from ....services.coworking.upcoming_reservation_index import UpcomingReservationIndex
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -25,9 +33,15 @@ def permission_svc(session: Session):
 
 
 @pytest.fixture()
-def operating_hours_svc(session: Session):
+def operating_hours_index():
+    """OperatingHoursIndex fixture, isolated from the process-wide index."""
+    return OperatingHoursIndex()
+
+
+@pytest.fixture()
+def operating_hours_svc(session: Session, operating_hours_index: OperatingHoursIndex):
     """OperatingHoursService fixture."""
-    return OperatingHoursService(session)
+    return OperatingHoursService(session, operating_hours_index)
 
 
 @pytest.fixture()
@@ -37,15 +51,27 @@ def room_svc(session: Session):
 
 
 @pytest.fixture()
-def seat_svc(session: Session):
+def seat_catalog_cache():
+    """SeatCatalogCache fixture, isolated from the process-wide catalog."""
+    return SeatCatalogCache()
+
+
+@pytest.fixture()
+def seat_svc(session: Session, seat_catalog_cache: SeatCatalogCache):
     """SeatService fixture."""
-    return SeatService(session)
+    return SeatService(session, seat_catalog_cache)
+
+
+@pytest.fixture()
+def policy_svc(session: Session):
+    """CoworkingPolicyService fixture, with a policy cache isolated from the process-wide cache."""
+    return PolicyService(session, PolicyCache())
 
 
 @pytest.fixture()
-def policy_svc():
-    """CoworkingPolicyService fixture."""
-    return PolicyService()
+def availability_cache():
+    """SeatAvailabilityCache fixture, isolated from the process-wide cache."""
+    return SeatAvailabilityCache()
 
 
 @pytest.fixture()
@@ -55,13 +81,37 @@ def reservation_svc(
     permission_svc: PermissionService,
     operating_hours_svc: OperatingHoursService,
     seat_svc: SeatService,
+    availability_cache: SeatAvailabilityCache,
 ):
-    """ReservationService fixture."""
+    """ReservationService fixture, with an upcoming reservation index isolated from the
+    process-wide index."""
     return ReservationService(
-        session, permission_svc, policy_svc, operating_hours_svc, seat_svc
+        session,
+        permission_svc,
+        policy_svc,
+        operating_hours_svc,
+        seat_svc,
+        availability_cache,
+        UpcomingReservationIndex(),
     )
 
 
+@pytest.fixture()
+def utilization_svc(
+    session: Session, permission_svc: PermissionService, policy_svc: PolicyService
+):
+    """UtilizationService fixture."""
+    return UtilizationService(session, permission_svc, policy_svc)
+
+
+@pytest.fixture()
+def archive_svc(
+    session: Session, permission_svc: PermissionService, seat_svc: SeatService
+):
+    """ReservationArchiveService fixture."""
+    return ReservationArchiveService(session, permission_svc, seat_svc)
+
+
 @pytest.fixture()
 def status_svc():
     policies_mock = create_autospec(PolicyService)
@@ -69,5 +119,10 @@ def status_svc():
     seat_mock = create_autospec(SeatService)
     reservation_mock = create_autospec(ReservationService)
     return StatusService(
-        policies_mock, operating_hours_mock, seat_mock, reservation_mock
+        policies_mock,
+        operating_hours_mock,
+        seat_mock,
+        reservation_mock,
+        SeatAvailabilityCache(),
+        StatusSnapshotCache(),
     )
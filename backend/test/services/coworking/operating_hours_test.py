@@ -2,9 +2,16 @@
 
 from ....services.coworking import OperatingHoursService
 from ....models.coworking import OperatingHours, TimeRange
+from ....entities.coworking import OperatingHoursEntity
+from ....services.coworking.availability_cache import seat_availability_cache
+from ....services.coworking.operating_hours_index import (
+    OperatingHoursIndex,
+    operating_hours_index as process_operating_hours_index,
+)
+from sqlalchemy.orm import Session
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
-from .fixtures import operating_hours_svc
+from .fixtures import operating_hours_svc, operating_hours_index
 from .time import *
 
 # Insert fake data entities in database
@@ -46,3 +53,98 @@ def test_schedule_multiple_match(
     assert len(result) == 2
     assert result[0].id == operating_hours_data.tomorrow.id
     assert result[1].id == operating_hours_data.future.id
+
+
+def test_operating_hours_edit_advances_coworking_version(session: Session):
+    """Committed edits to operating hours invalidate cached seat availability."""
+    generation = seat_availability_cache().generation()
+    entity = session.get(OperatingHoursEntity, operating_hours_data.today.id)
+    entity.end = entity.end + ONE_HOUR
+    session.flush()
+    assert seat_availability_cache().generation() == generation
+    session.commit()
+    assert seat_availability_cache().generation() == generation + 1
+
+
+def test_operating_hours_rolled_back_edit_keeps_coworking_version(session: Session):
+    generation = seat_availability_cache().generation()
+    entity = session.get(OperatingHoursEntity, operating_hours_data.today.id)
+    entity.end = entity.end + ONE_HOUR
+    session.flush()
+    session.rollback()
+    session.commit()
+    assert seat_availability_cache().generation() == generation
+
+
+def test_schedule_served_from_index(
+    operating_hours_svc: OperatingHoursService,
+    operating_hours_index: OperatingHoursIndex,
+    time: dict[str, datetime],
+):
+    """After the first lookup loads the index, lookups do not query the database."""
+    time_range = TimeRange(start=time[TOMORROW], end=time[TOMORROW] + ONE_DAY)
+    expected = operating_hours_svc.schedule(time_range)
+    assert operating_hours_index.is_fresh(datetime.now())
+    operating_hours_svc._session = None
+    assert operating_hours_svc.schedule(time_range) == expected
+
+
+def test_schedule_index_matches_database(
+    session: Session,
+    operating_hours_index: OperatingHoursIndex,
+    time: dict[str, datetime],
+):
+    """The index agrees with the range query for windows around every entry."""
+    operating_hours_index.load(session, time[NOW])
+    database = OperatingHoursService(session, OperatingHoursIndex(max_age=ONE_MINUTE))
+    database._index.invalidate()
+    for hours in operating_hours_data.all:
+        for start, end in (
+            (hours.start - ONE_HOUR, hours.start),
+            (hours.start, hours.end),
+            (hours.end, hours.end + ONE_HOUR),
+            (hours.end + ONE_MINUTE, hours.end + ONE_DAY),
+        ):
+            time_range = TimeRange(start=start, end=end)
+            indexed = operating_hours_index.schedule(time_range, time[NOW])
+            if indexed is not None:
+                assert indexed == database.schedule(time_range)
+
+
+def test_schedule_falls_back_before_index(
+    operating_hours_svc: OperatingHoursService,
+    operating_hours_index: OperatingHoursIndex,
+    time: dict[str, datetime],
+):
+    time_range = TimeRange(start=time[A_WEEK_AGO], end=time[A_WEEK_AGO] + ONE_HOUR)
+    operating_hours_svc.schedule(time_range)
+    assert operating_hours_index.schedule(time_range, datetime.now()) is None
+
+
+def test_schedule_index_stale_after_edit(
+    session: Session,
+    operating_hours_svc: OperatingHoursService,
+    operating_hours_index: OperatingHoursIndex,
+    time: dict[str, datetime],
+):
+    """Edits committed after loading are reflected in the next schedule lookup."""
+    time_range = TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])
+    operating_hours_svc.schedule(time_range)
+    process_operating_hours_index().load(session, datetime.now())
+    entity = session.get(OperatingHoursEntity, operating_hours_data.today.id)
+    session.delete(entity)
+    session.commit()
+    assert not process_operating_hours_index().is_fresh(datetime.now())
+
+    operating_hours_index.invalidate()
+    assert operating_hours_svc.schedule(time_range) == []
+
+
+def test_schedule_index_expires(
+    session: Session,
+    operating_hours_index: OperatingHoursIndex,
+    time: dict[str, datetime],
+):
+    operating_hours_index.load(session, time[NOW])
+    assert operating_hours_index.is_fresh(time[NOW])
+    assert not operating_hours_index.is_fresh(time[NOW] + ONE_DAY)
@@ -0,0 +1,101 @@
+"""Tests for Coworking PolicyService and its resolution of policies per role."""
+
+from datetime import timedelta
+from sqlalchemy.orm import Session
+
+from ....entities import user_role_table
+from ....entities.coworking import RolePolicyEntity
+from ....services import PermissionService, RoleService
+from ....services.coworking import PolicyService
+from ....services.coworking.policy_cache import (
+    DEFAULT_POLICY,
+    PolicyCache,
+    policy_cache,
+)
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import policy_svc
+
+# Insert fake data entities in database
+from ..core_data import setup_insert_data_fixture
+
+# Import the fake model data in a namespace for test assertions
+from ..core_data import user_data
+from .. import role_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _grant(session: Session, role_id: int, **policies) -> None:
+    session.add(RolePolicyEntity(role_id=role_id, **policies))
+    session.commit()
+
+
+def test_default_policy(policy_svc: PolicyService):
+    assert policy_svc.policy(user_data.user) == DEFAULT_POLICY
+    assert policy_svc.reservation_window(user_data.user) == timedelta(weeks=1)
+    assert policy_svc.maximum_party_size(user_data.user) == 6
+
+
+def test_role_policy(policy_svc: PolicyService, session: Session):
+    _grant(session, role_data.ambassador_role.id, reservation_window=timedelta(weeks=2))
+    assert policy_svc.reservation_window(user_data.ambassador) == timedelta(weeks=2)
+    assert (
+        policy_svc.walkin_window(user_data.ambassador) == DEFAULT_POLICY.walkin_window
+    )
+    assert policy_svc.reservation_window(user_data.user) == timedelta(weeks=1)
+
+
+def test_role_policy_most_generous(policy_svc: PolicyService, session: Session):
+    _grant(session, role_data.root_role.id, maximum_party_size=10)
+    _grant(session, role_data.ambassador_role.id, maximum_party_size=8)
+    session.execute(
+        user_role_table.insert().values(
+            role_id=role_data.ambassador_role.id, user_id=user_data.root.id
+        )
+    )
+    session.commit()
+    assert policy_svc.maximum_party_size(user_data.root) == 10
+
+
+def test_policy_resolved_once_per_request(policy_svc: PolicyService, session: Session):
+    """Later lookups by the same service do not reflect edits made meanwhile."""
+    policy = policy_svc.policy(user_data.ambassador)
+    _grant(session, role_data.ambassador_role.id, reservation_window=timedelta(weeks=2))
+    assert policy_svc.policy(user_data.ambassador) is policy
+
+
+def test_policy_shared_by_role_set(session: Session):
+    """Users with the same roles share a policy, resolved without querying again."""
+    cache = PolicyCache()
+    policy = PolicyService(session, cache).policy(user_data.ambassador)
+    assert PolicyService(None, cache).policy(user_data.ambassador) is policy  # type: ignore
+
+
+def test_policy_invalidated_by_role_policy_edit(session: Session):
+    cache = policy_cache()
+    cache.invalidate()
+    assert PolicyService(session, cache).reservation_window(
+        user_data.ambassador
+    ) == timedelta(weeks=1)
+    _grant(session, role_data.ambassador_role.id, reservation_window=timedelta(weeks=2))
+    assert PolicyService(session, cache).reservation_window(
+        user_data.ambassador
+    ) == timedelta(weeks=2)
+
+
+def test_policy_invalidated_by_role_membership(session: Session):
+    _grant(session, role_data.ambassador_role.id, reservation_window=timedelta(weeks=2))
+    cache = policy_cache()
+    cache.invalidate()
+    assert PolicyService(session, cache).reservation_window(
+        user_data.user
+    ) == timedelta(weeks=1)
+    RoleService(session, PermissionService(session)).add_member(
+        user_data.root, role_data.ambassador_role.id, user_data.user
+    )
+    assert PolicyService(session, cache).reservation_window(
+        user_data.user
+    ) == timedelta(weeks=2)
@@ -0,0 +1,206 @@
+"""ReservationArchiveService tests"""
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from .....entities import UserEntity
+from .....entities.coworking import (
+    ReservationArchiveEntity,
+    ReservationEntity,
+    SeatEntity,
+    reservation_seat_table,
+)
+from .....models.coworking import ReservationState, TimeRange
+from .....models.user import UserIdentity
+from .....services.coworking import ReservationArchiveService
+from .....services.coworking.reservation import ReservationException
+from .....services.exceptions import UserPermissionException
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from ..fixtures import archive_svc, permission_svc, seat_svc, seat_catalog_cache
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _terminal_reservations():
+    """The cancelled and checked out reservations of the fake data."""
+    return [reservation_data.reservation_2, reservation_data.reservation_3]
+
+
+def _archived_ids(session: Session) -> set[int]:
+    return set(session.scalars(select(ReservationArchiveEntity.id)))
+
+
+def test_archive(
+    session: Session, archive_svc: ReservationArchiveService, time: dict[str, datetime]
+):
+    """Cancelled and checked out reservations are moved, with their users and seats."""
+    assert archive_svc.archive(time[IN_ONE_HOUR]) == len(_terminal_reservations())
+
+    assert _archived_ids(session) == {
+        reservation.id for reservation in _terminal_reservations()
+    }
+    hot_ids = set(session.scalars(select(ReservationEntity.id)))
+    assert hot_ids.isdisjoint(
+        reservation.id for reservation in _terminal_reservations()
+    )
+    assert (
+        session.scalars(
+            select(reservation_seat_table.c.reservation_id).where(
+                reservation_seat_table.c.reservation_id.in_(
+                    [reservation.id for reservation in _terminal_reservations()]
+                )
+            )
+        ).first()
+        is None
+    )
+
+    archived = session.get(
+        ReservationArchiveEntity,
+        (reservation_data.reservation_2.id, reservation_data.reservation_2.start),
+    )
+    assert archived.state == ReservationState.CHECKED_OUT
+    assert archived.user_ids == [user_data.ambassador.id]
+    assert archived.seat_ids == [reservation_data.reservation_2.seats[0].id]
+
+
+def test_archive_leaves_active_reservations(
+    session: Session, archive_svc: ReservationArchiveService, time: dict[str, datetime]
+):
+    archive_svc.archive(time[TOMORROW] + ONE_DAY * 7)
+    hot_ids = set(session.scalars(select(ReservationEntity.id)))
+    for reservation in [
+        reservation_data.reservation_1,
+        reservation_data.reservation_4,
+        reservation_data.reservation_5,
+    ]:
+        assert reservation.id in hot_ids
+
+
+def test_archive_only_old_enough(
+    session: Session, archive_svc: ReservationArchiveService, time: dict[str, datetime]
+):
+    assert archive_svc.archive(time[NOW]) == 0
+    assert _archived_ids(session) == set()
+
+
+def test_archive_in_batches(
+    session: Session, archive_svc: ReservationArchiveService, time: dict[str, datetime]
+):
+    assert archive_svc.archive(time[IN_ONE_HOUR], batch_size=1) == len(
+        _terminal_reservations()
+    )
+    assert archive_svc.archive(time[IN_ONE_HOUR], batch_size=1) == 0
+    assert _archived_ids(session) == {
+        reservation.id for reservation in _terminal_reservations()
+    }
+
+
+def test_archive_partitions_by_month(
+    session: Session, archive_svc: ReservationArchiveService
+):
+    """Reservations are archived into a partition of the month they started."""
+    old = ReservationEntity(
+        start=datetime(2023, 1, 31, 23, 30),
+        end=datetime(2023, 2, 1, 0, 30),
+        state=ReservationState.CANCELLED,
+        walkin=False,
+        users=[session.get(UserEntity, user_data.user.id)],
+        seats=[session.scalars(select(SeatEntity)).first()],
+    )
+    session.add(old)
+    session.commit()
+    old_id = old.id
+
+    assert archive_svc.archive(datetime(2023, 3, 1)) == 1
+    partitions = session.execute(
+        text(
+            "SELECT tableoid::regclass::text FROM coworking__reservation_archive "
+            "WHERE id = :id"
+        ),
+        {"id": old_id},
+    ).scalar_one()
+    assert partitions == "coworking__reservation_archive_2023_01"
+
+
+def test_history_unions_hot_and_archived(
+    archive_svc: ReservationArchiveService, time: dict[str, datetime]
+):
+    """History of the ambassador includes both their archived and active reservations."""
+    archive_svc.archive(time[IN_ONE_HOUR])
+    window = TimeRange(start=time[A_WEEK_AGO], end=time[TOMORROW] + ONE_DAY)
+    history = archive_svc.history(
+        user_data.ambassador, UserIdentity(id=user_data.ambassador.id), window
+    )
+    assert [reservation.id for reservation in history] == [
+        reservation_data.reservation_4.id,
+        reservation_data.reservation_2.id,
+    ]
+    archived = history[1]
+    assert archived.state == ReservationState.CHECKED_OUT
+    assert [user.id for user in archived.users] == [user_data.ambassador.id]
+    assert [seat.id for seat in archived.seats] == [
+        reservation_data.reservation_2.seats[0].id
+    ]
+
+
+def test_history_limit(
+    archive_svc: ReservationArchiveService, time: dict[str, datetime]
+):
+    archive_svc.archive(time[IN_ONE_HOUR])
+    window = TimeRange(start=time[A_WEEK_AGO], end=time[TOMORROW] + ONE_DAY)
+    history = archive_svc.history(
+        user_data.ambassador, UserIdentity(id=user_data.ambassador.id), window, 1
+    )
+    assert [reservation.id for reservation in history] == [
+        reservation_data.reservation_4.id
+    ]
+    with pytest.raises(ReservationException):
+        archive_svc.history(
+            user_data.ambassador, UserIdentity(id=user_data.ambassador.id), window, 0
+        )
+
+
+def test_history_window(
+    archive_svc: ReservationArchiveService, time: dict[str, datetime]
+):
+    archive_svc.archive(time[IN_ONE_HOUR])
+    window = TimeRange(start=time[A_WEEK_AGO], end=time[AN_HOUR_AGO])
+    assert (
+        archive_svc.history(
+            user_data.ambassador, UserIdentity(id=user_data.ambassador.id), window
+        )
+        == []
+    )
+
+
+def test_history_of_another_user(
+    archive_svc: ReservationArchiveService, time: dict[str, datetime]
+):
+    window = TimeRange(start=time[A_WEEK_AGO], end=time[TOMORROW] + ONE_DAY)
+    history = archive_svc.history(
+        user_data.root, UserIdentity(id=user_data.ambassador.id), window
+    )
+    assert len(history) == 2
+    with pytest.raises(UserPermissionException):
+        archive_svc.history(
+            user_data.user, UserIdentity(id=user_data.ambassador.id), window
+        )
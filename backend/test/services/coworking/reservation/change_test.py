@@ -17,10 +17,13 @@ from .....models.coworking.reservation import ReservationPartial
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
 from ..fixtures import (
     reservation_svc,
+    availability_cache,
     permission_svc,
     seat_svc,
+    seat_catalog_cache,
     policy_svc,
     operating_hours_svc,
+    operating_hours_index,
 )
 from ..time import *
 
@@ -182,12 +185,11 @@ def test_change_reservation_change_start_not_implemented(
         )
 
 
-def test_change_reservation_change_end_not_implemented(
+def test_change_reservation_change_end_outside_extend_window(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
-    """This test is for 100% coverage but should be replaced with actual tests for when
-    changing a reservation end time has logic implemented."""
-    with pytest.raises(NotImplementedError):
+    """Reservations are extended just before they end. See extend_test.py."""
+    with pytest.raises(ReservationException):
         reservation_svc.change_reservation(
             user_data.ambassador,
             ReservationPartial(
@@ -0,0 +1,239 @@
+"""ReservationService#draft_reservations method tests"""
+
+import pytest
+from unittest.mock import create_autospec
+from sqlalchemy.orm import Session
+
+from .....services import PermissionService
+from .....services.coworking import ReservationService
+from .....services.coworking.reservation import (
+    MAXIMUM_BATCH_SIZE,
+    ReservationException,
+)
+from .....entities.coworking import ReservationEntity
+from .....models.coworking import ReservationState
+
+from .....models.user import UserIdentity
+from .....models.coworking.seat import SeatIdentity
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from ..fixtures import (
+    reservation_svc,
+    availability_cache,
+    permission_svc,
+    seat_svc,
+    seat_catalog_cache,
+    policy_svc,
+    operating_hours_svc,
+    operating_hours_index,
+)
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from .. import seat_data
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _all_seats() -> list[SeatIdentity]:
+    return [SeatIdentity(id=seat.id) for seat in seat_data.seats]
+
+
+def _request_for(user, seats: list[SeatIdentity] | None = None):
+    return reservation_data.test_request(
+        {
+            "users": [UserIdentity(id=user.id)],
+            "seats": seats if seats is not None else _all_seats(),
+        }
+    )
+
+
+def test_draft_reservations_assigns_distinct_seats(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Requests for the same seats are assigned different ones."""
+    results = reservation_svc.draft_reservations(
+        user_data.root,
+        [_request_for(user_data.root), _request_for(user_data.ambassador)],
+    )
+    assert all(result.error is None for result in results)
+    drafts = [result.reservation for result in results]
+    assert [draft.users[0].id for draft in drafts] == [
+        user_data.root.id,
+        user_data.ambassador.id,
+    ]
+    seat_ids = {draft.seats[0].id for draft in drafts}
+    assert len(seat_ids) == 2
+    assert reservation_data.reservation_1.seats[0].id not in seat_ids
+    for draft in drafts:
+        assert draft.id is not None
+        assert draft.state == ReservationState.DRAFT
+        assert_equal_times(time[NOW], draft.start)
+
+
+def test_draft_reservations_partial_failure(
+    session: Session, reservation_svc: ReservationService
+):
+    """A request that cannot be satisfied does not prevent the others from being drafted."""
+    results = reservation_svc.draft_reservations(
+        user_data.root,
+        [
+            _request_for(user_data.ambassador),
+            _request_for(user_data.user),
+            _request_for(user_data.root),
+        ],
+    )
+    assert results[0].reservation is not None
+    assert results[1].reservation is None
+    assert results[1].error is not None
+    assert results[2].reservation is not None
+
+    session.expire_all()
+    drafted = {
+        result.reservation.id for result in results if result.reservation is not None
+    }
+    persisted = {
+        entity.id
+        for entity in session.query(ReservationEntity).filter(
+            ReservationEntity.state == ReservationState.DRAFT
+        )
+    }
+    assert drafted <= persisted
+
+
+def test_draft_reservations_exhausts_seats(reservation_svc: ReservationService):
+    """Once the only requested seat is assigned, later requests for it fail."""
+    seats = [SeatIdentity(id=seat_data.monitor_seat_01.id)]
+    results = reservation_svc.draft_reservations(
+        user_data.root,
+        [
+            _request_for(user_data.ambassador, seats),
+            _request_for(user_data.root, seats),
+        ],
+    )
+    assert results[0].reservation.seats[0].id == seat_data.monitor_seat_01.id
+    assert results[1].reservation is None
+    assert results[1].error == "The requested seat(s) are no longer available."
+
+
+def test_draft_reservations_same_user_twice(reservation_svc: ReservationService):
+    """A user's draft earlier in the batch conflicts with their later requests."""
+    results = reservation_svc.draft_reservations(
+        user_data.root,
+        [_request_for(user_data.ambassador), _request_for(user_data.ambassador)],
+    )
+    assert results[0].reservation is not None
+    assert results[1].reservation is None
+    assert results[1].error == "Users may not have concurrent walk-in reservations."
+
+
+def test_draft_reservations_permissions_per_item(reservation_svc: ReservationService):
+    """A request the subject is not permitted to make is reported in its result."""
+    after_own_reservation = _request_for(user_data.user)
+    after_own_reservation.start = reservation_data.reservation_1.end
+    after_own_reservation.end = reservation_data.reservation_1.end + THIRTY_MINUTES
+    results = reservation_svc.draft_reservations(
+        user_data.user, [_request_for(user_data.root), after_own_reservation]
+    )
+    assert results[0].reservation is None
+    assert results[0].error is not None
+    assert results[1].reservation is not None
+
+
+def test_draft_reservations_permissions_checked_once_per_user(
+    reservation_svc: ReservationService,
+):
+    permission_svc = create_autospec(PermissionService)
+    permission_svc.enforce.return_value = None
+    reservation_svc._permission_svc = permission_svc
+    reservation_svc.draft_reservations(
+        user_data.root,
+        [_request_for(user_data.ambassador), _request_for(user_data.ambassador)],
+    )
+    permission_svc.enforce.assert_called_once_with(
+        user_data.root,
+        "coworking.reservation.manage",
+        f"user/{user_data.ambassador.id}",
+    )
+
+
+def test_draft_reservations_party(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """A party is seated together, as by draft_reservation, in distinct seats."""
+    party = reservation_data.test_request(
+        {
+            "users": [
+                UserIdentity(id=user_data.root.id),
+                UserIdentity(id=user_data.ambassador.id),
+            ],
+            "seats": _all_seats(),
+        }
+    )
+    results = reservation_svc.draft_reservations(user_data.root, [party])
+    assert results[0].error is None
+    draft = results[0].reservation
+    assert {user.id for user in draft.users} == {
+        user_data.root.id,
+        user_data.ambassador.id,
+    }
+    assert len({seat.id for seat in draft.seats}) == 2
+
+
+def test_draft_reservations_party_conflict(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """A party member drafted earlier in the batch conflicts with the party's request."""
+    party = reservation_data.test_request(
+        {
+            "users": [
+                UserIdentity(id=user_data.user.id),
+                UserIdentity(id=user_data.ambassador.id),
+            ],
+            "seats": _all_seats(),
+        }
+    )
+    results = reservation_svc.draft_reservations(
+        user_data.root, [_request_for(user_data.ambassador), party]
+    )
+    assert results[0].error is None
+    assert results[1].reservation is None
+    assert results[1].error is not None
+
+
+def test_draft_reservations_party_too_large(reservation_svc: ReservationService):
+    party_size = reservation_svc._policy_svc.maximum_party_size(user_data.root)
+    results = reservation_svc.draft_reservations(
+        user_data.root,
+        [
+            reservation_data.test_request(
+                {"users": [UserIdentity(id=user_data.root.id)] * (party_size + 1)}
+            )
+        ],
+    )
+    assert results[0].reservation is None
+    assert results[0].error is not None
+
+
+def test_draft_reservations_batch_size(reservation_svc: ReservationService):
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservations(user_data.root, [])
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservations(
+            user_data.root,
+            [_request_for(user_data.root)] * (MAXIMUM_BATCH_SIZE + 1),
+        )
@@ -0,0 +1,180 @@
+"""ReservationService#draft_reservation tests under concurrent walk-ins.
+
+Each simulated student drafts a walk-in from their own thread, database session and
+ReservationService, all released at once, as happens when a class lets out at the top of
+the hour."""
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from sqlalchemy import Engine, create_engine, select
+from sqlalchemy.orm import Session
+
+from .....entities import UserEntity
+from .....entities.coworking import SeatEntity
+from .....models import User
+from .....models.user import UserIdentity
+from .....models.coworking import Reservation, ReservationRequest, TimeRange
+from .....models.coworking.seat import SeatIdentity
+from .....services import PermissionService
+from .....services.coworking import (
+    OperatingHoursService,
+    PolicyService,
+    ReservationService,
+    SeatService,
+)
+from .....services.coworking.availability_cache import SeatAvailabilityCache
+from .....services.coworking.operating_hours_index import OperatingHoursIndex
+from .....services.coworking.policy_cache import PolicyCache
+from .....services.coworking.reservation import ReservationException
+from .....services.coworking.seat_catalog import SeatCatalogCache
+from .....services.coworking.upcoming_reservation_index import UpcomingReservationIndex
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from ..fixtures import (
+    reservation_svc,
+    availability_cache,
+    permission_svc,
+    seat_svc,
+    seat_catalog_cache,
+    policy_svc,
+    operating_hours_svc,
+    operating_hours_index,
+)
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from .. import room_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+STUDENTS = 50
+
+
+def _students(session: Session) -> list[User]:
+    entities = [
+        UserEntity(
+            pid=100000000 + i,
+            onyen=f"student{i}",
+            email=f"student{i}@unc.edu",
+            first_name="Student",
+            last_name=str(i),
+            pronouns="They / Them / Theirs",
+        )
+        for i in range(STUDENTS)
+    ]
+    session.add_all(entities)
+    session.commit()
+    return [entity.to_model() for entity in entities]
+
+
+def _add_seats(session: Session, count: int) -> None:
+    session.add_all(
+        SeatEntity(
+            title=f"Common Area {i}",
+            shorthand=f"C{i}",
+            reservable=False,
+            has_monitor=False,
+            sit_stand=False,
+            x=10 + i,
+            y=10,
+            room_id=room_data.the_xl.id,
+        )
+        for i in range(count)
+    )
+    session.commit()
+
+
+def _walk_in_burst(
+    test_engine: Engine, students: list[User], seats: list[SeatIdentity]
+) -> list[Reservation | ReservationException]:
+    """Drafts a walk-in for every student at once, returning each draft or exception."""
+    engine = create_engine(test_engine.url, pool_size=len(students))
+    operating_hours_index = OperatingHoursIndex()
+    seat_catalog_cache = SeatCatalogCache()
+    availability_cache = SeatAvailabilityCache()
+    start = Barrier(len(students))
+
+    def walk_in(student: User) -> Reservation | ReservationException:
+        with Session(engine) as session:
+            reservation_svc = ReservationService(
+                session,
+                PermissionService(session),
+                PolicyService(session, PolicyCache()),
+                OperatingHoursService(session, operating_hours_index),
+                SeatService(session, seat_catalog_cache),
+                availability_cache,
+                UpcomingReservationIndex(),
+            )
+            now = datetime.now()
+            request = ReservationRequest(
+                start=now,
+                end=now + THIRTY_MINUTES,
+                users=[UserIdentity(id=student.id)],
+                seats=seats,
+            )
+            start.wait()
+            try:
+                return reservation_svc.draft_reservation(student, request)
+            except ReservationException as e:
+                return e
+
+    try:
+        with ThreadPoolExecutor(len(students)) as pool:
+            return list(pool.map(walk_in, students))
+    finally:
+        engine.dispose()
+
+
+def _assert_no_double_assignment(drafts: list[Reservation]):
+    seat_ids = [draft.seats[0].id for draft in drafts]
+    assert len(seat_ids) == len(set(seat_ids))
+
+
+def test_draft_reservation_walk_in_burst(session: Session, test_engine: Engine):
+    """Every student gets a distinct seat when there are enough seats for all."""
+    students = _students(session)
+    _add_seats(session, STUDENTS)
+    seats = [SeatIdentity(id=id) for id in session.scalars(select(SeatEntity.id))]
+
+    results = _walk_in_burst(test_engine, students, seats)
+
+    drafts = [result for result in results if isinstance(result, Reservation)]
+    assert len(drafts) == STUDENTS
+    _assert_no_double_assignment(drafts)
+
+
+def test_draft_reservation_walk_in_burst_exhausts_seats(
+    session: Session,
+    test_engine: Engine,
+    reservation_svc: ReservationService,
+    seat_svc: SeatService,
+):
+    """When students outnumber seats, each available seat is drafted exactly once and the
+    remaining students are told no seat is available."""
+    students = _students(session)
+    now = datetime.now()
+    available = reservation_svc.seat_availability(
+        seat_svc.list(), TimeRange(start=now, end=now + THIRTY_MINUTES)
+    )
+    seats = [SeatIdentity(id=seat.id) for seat in seat_svc.list()]
+
+    results = _walk_in_burst(test_engine, students, seats)
+
+    drafts = [result for result in results if isinstance(result, Reservation)]
+    assert len(drafts) == len(available)
+    _assert_no_double_assignment(drafts)
+    assert all(
+        isinstance(result, (Reservation, ReservationException)) for result in results
+    )
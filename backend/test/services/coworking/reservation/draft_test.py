@@ -1,12 +1,14 @@
 """ReservationService#draft_reservation method tests"""
 
 import pytest
-from unittest.mock import create_autospec
+from unittest.mock import MagicMock, create_autospec
+from sqlalchemy.orm import Session
 
 from .....services import PermissionService
 from .....services.coworking import ReservationService
 from .....services.coworking.reservation import ReservationException
-from .....models.coworking import ReservationState
+from .....entities.coworking import ReservationEntity
+from .....models.coworking import ReservationState, SeatAvailability, TimeRange
 
 from .....models.user import UserIdentity
 from .....models.coworking.seat import SeatIdentity
@@ -15,10 +17,13 @@ from .....models.coworking.seat import SeatIdentity
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
 from ..fixtures import (
     reservation_svc,
+    availability_cache,
     permission_svc,
     seat_svc,
+    seat_catalog_cache,
     policy_svc,
     operating_hours_svc,
+    operating_hours_index,
 )
 from ..time import *
 
@@ -287,18 +292,184 @@ def test_draft_reservation_permissions(reservation_svc: ReservationService):
     )
 
 
-def test_draft_reservation_multiple_users_not_implemented(
+def test_draft_reservation_multiple_users(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Each member of a party is seated in a different seat for the same time."""
+    reservation = reservation_svc.draft_reservation(
+        user_data.ambassador,
+        reservation_data.test_request(
+            {
+                "users": [
+                    UserIdentity(id=user_data.root.id),
+                    UserIdentity(id=user_data.ambassador.id),
+                ],
+                "seats": [SeatIdentity(id=seat.id) for seat in seat_data.seats],
+            }
+        ),
+    )
+    assert {user.id for user in reservation.users} == {
+        user_data.root.id,
+        user_data.ambassador.id,
+    }
+    assert len(reservation.seats) == 2
+    assert len({seat.id for seat in reservation.seats}) == 2
+    assert reservation_data.reservation_1.seats[0].id not in {
+        seat.id for seat in reservation.seats
+    }
+    assert_equal_times(time[NOW], reservation.start)
+
+
+def test_draft_reservation_multiple_users_one_conflict_query(
+    reservation_svc: ReservationService,
+):
+    """The conflicts of every member of the party are found in a single query."""
+    get_active_reservations = MagicMock(
+        wraps=reservation_svc._get_active_reservations_for_users
+    )
+    reservation_svc._get_active_reservations_for_users = get_active_reservations
+    reservation_svc.draft_reservation(
+        user_data.ambassador,
+        reservation_data.test_request(
+            {
+                "users": [
+                    UserIdentity(id=user_data.root.id),
+                    UserIdentity(id=user_data.ambassador.id),
+                ],
+                "seats": [SeatIdentity(id=seat.id) for seat in seat_data.seats],
+            }
+        ),
+    )
+    get_active_reservations.assert_called_once()
+    assert set(get_active_reservations.call_args.args[0]) == {
+        user_data.root.id,
+        user_data.ambassador.id,
+    }
+
+
+def _party_request(start: datetime, end: datetime):
+    """A pre-reservation for the user and the ambassador, who shares reservation_4."""
+    return reservation_data.test_request(
+        {
+            "users": [
+                UserIdentity(id=user_data.user.id),
+                UserIdentity(id=user_data.ambassador.id),
+            ],
+            "seats": [SeatIdentity(id=seat.id) for seat in seat_data.reservable_seats],
+            "start": start,
+            "end": end,
+        }
+    )
+
+
+def test_draft_reservation_multiple_users_trims_end(
+    reservation_svc: ReservationService,
+):
+    """A member's reservation overlapping the end of the request trims its end."""
+    conflict = reservation_data.reservation_4
+    reservation = reservation_svc.draft_reservation(
+        user_data.ambassador,
+        _party_request(conflict.start - THIRTY_MINUTES, conflict.start + ONE_MINUTE),
+    )
+    assert_equal_times(conflict.start - THIRTY_MINUTES, reservation.start)
+    assert_equal_times(conflict.start, reservation.end)
+    assert len(reservation.seats) == 2
+
+
+def test_draft_reservation_multiple_users_trims_start(
     reservation_svc: ReservationService,
 ):
-    with pytest.raises(NotImplementedError):
+    """A member's reservation overlapping the start of the request trims its start."""
+    conflict = reservation_data.reservation_4
+    reservation = reservation_svc.draft_reservation(
+        user_data.ambassador,
+        _party_request(conflict.end - ONE_MINUTE, conflict.end + THIRTY_MINUTES),
+    )
+    assert_equal_times(conflict.end, reservation.start)
+    assert_equal_times(conflict.end + THIRTY_MINUTES, reservation.end)
+    assert len(reservation.seats) == 2
+
+
+def test_draft_reservation_multiple_users_conflict_within(
+    reservation_svc: ReservationService,
+):
+    """A member's reservation within the request would split it, which is rejected."""
+    conflict = reservation_data.reservation_4
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(
+            user_data.ambassador,
+            _party_request(conflict.start - FIVE_MINUTES, conflict.end + FIVE_MINUTES),
+        )
+
+
+def test_draft_reservation_multiple_users_too_few_seats(
+    reservation_svc: ReservationService,
+):
+    with pytest.raises(ReservationException):
         reservation_svc.draft_reservation(
             user_data.ambassador,
             reservation_data.test_request(
                 {
                     "users": [
-                        UserIdentity(**user_data.root.model_dump()),
-                        UserIdentity(**user_data.ambassador.model_dump()),
-                    ]
+                        UserIdentity(id=user_data.root.id),
+                        UserIdentity(id=user_data.ambassador.id),
+                    ],
                 }
             ),
         )
+
+
+def test_draft_reservation_multiple_users_party_size(
+    reservation_svc: ReservationService,
+):
+    party_size = reservation_svc._policy_svc.maximum_party_size(user_data.ambassador)
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(
+            user_data.ambassador,
+            reservation_data.test_request(
+                {"users": [UserIdentity(id=user_data.ambassador.id)] * (party_size + 1)}
+            ),
+        )
+
+
+def test_draft_reservation_seat_taken_concurrently(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """A seat reserved after its availability was read is rejected by the database."""
+    seat = reservation_data.reservation_1.seats[0]
+    stale_availability = SeatAvailability(
+        **seat.model_dump(),
+        availability=[TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES])],
+    )
+    reservation_svc.seat_availability = lambda *args, **kwargs: [stale_availability]
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(
+            user_data.ambassador,
+            reservation_data.test_request(
+                {"seats": [SeatIdentity(**seat.model_dump())]}
+            ),
+        )
+
+
+def test_draft_reservation_over_unswept_expired_draft(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """An expired draft the sweeper has yet to cancel does not hold its seat."""
+    expired = session.get(ReservationEntity, reservation_data.reservation_5.id)
+    expired.created_at = time[A_WEEK_AGO]
+    session.commit()
+
+    seat = reservation_data.reservation_5.seats[0]
+    reservation = reservation_svc.draft_reservation(
+        user_data.ambassador,
+        reservation_data.test_request(
+            {
+                "seats": [SeatIdentity(**seat.model_dump())],
+                "start": reservation_data.reservation_5.start,
+                "end": reservation_data.reservation_5.start + ONE_HOUR,
+            }
+        ),
+    )
+    assert reservation.seats[0].id == seat.id
+    session.refresh(expired)
+    assert expired.state == ReservationState.CANCELLED
@@ -0,0 +1,284 @@
+"""ReservationService#change_reservation extension tests, and of the upcoming reservation index"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from .....services.coworking import ReservationService
+from .....services.coworking.availability_cache import SeatAvailabilityCache
+from .....services.coworking.reservation import ReservationException
+from .....services.coworking.upcoming_reservation_index import UpcomingReservationIndex
+from .....entities import UserEntity
+from .....entities.coworking import (
+    OperatingHoursEntity,
+    ReservationEntity,
+    SeatEntity,
+)
+from .....models.coworking import ReservationPartial, ReservationState
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from ..fixtures import (
+    reservation_svc,
+    availability_cache,
+    permission_svc,
+    seat_svc,
+    seat_catalog_cache,
+    policy_svc,
+    operating_hours_svc,
+    operating_hours_index,
+)
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from .. import operating_hours_data, seat_data
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+TEN_MINUTES = timedelta(minutes=10)
+
+
+@pytest.fixture()
+def ending_soon(session: Session, time: dict[str, datetime]) -> ReservationEntity:
+    """reservation_1, checked in to monitor_seat_00, moved to end within its extend window."""
+    entity = session.get(ReservationEntity, reservation_data.reservation_1.id)
+    assert entity is not None
+    entity.end = time[NOW] + TEN_MINUTES
+    session.commit()
+    return entity
+
+
+def _reserve(
+    session: Session, seat_id: int, user_id: int, start: datetime, end: datetime
+) -> ReservationEntity:
+    entity = ReservationEntity(
+        state=ReservationState.CONFIRMED,
+        start=start,
+        end=end,
+        walkin=False,
+        room_id=None,
+        seats=[session.get(SeatEntity, seat_id)],
+        users=[session.get(UserEntity, user_id)],
+    )
+    session.add(entity)
+    session.commit()
+    return entity
+
+
+def _extend(
+    reservation_svc: ReservationService, entity: ReservationEntity, end: datetime
+):
+    return reservation_svc.change_reservation(
+        user_data.user, ReservationPartial(id=entity.id, start=entity.start, end=end)
+    )
+
+
+def test_extendable_until_outside_extend_window(reservation_svc: ReservationService):
+    reservation = reservation_svc.get_reservation(
+        user_data.user, reservation_data.reservation_1.id
+    )
+    assert not reservation.extendable
+    assert reservation.extendable_at == reservation_data.reservation_1.end - timedelta(
+        minutes=15
+    )
+    assert reservation.extendable_until is None
+
+
+def test_extendable_until_extend_duration(
+    reservation_svc: ReservationService, ending_soon: ReservationEntity
+):
+    reservation = reservation_svc.get_reservation(user_data.user, ending_soon.id)
+    assert reservation.extendable
+    assert reservation.extendable_until == ending_soon.end + ONE_HOUR
+
+
+def test_extendable_until_next_reservation(
+    reservation_svc: ReservationService,
+    session: Session,
+    ending_soon: ReservationEntity,
+):
+    next_start = ending_soon.end + THIRTY_MINUTES
+    _reserve(
+        session,
+        seat_data.monitor_seat_00.id,
+        user_data.root.id,
+        next_start,
+        next_start + ONE_HOUR,
+    )
+    reservation = reservation_svc.get_reservation(user_data.user, ending_soon.id)
+    assert reservation.extendable_until == next_start
+
+
+def test_extendable_until_closing(
+    reservation_svc: ReservationService,
+    session: Session,
+    ending_soon: ReservationEntity,
+):
+    closing = ending_soon.end + THIRTY_MINUTES
+    today = session.get(OperatingHoursEntity, operating_hours_data.today.id)
+    assert today is not None
+    today.end = closing
+    session.commit()
+    reservation = reservation_svc.get_reservation(user_data.user, ending_soon.id)
+    assert reservation.extendable_until == closing
+
+
+def test_extendable_until_in_current_reservations(
+    reservation_svc: ReservationService, ending_soon: ReservationEntity
+):
+    reservations = reservation_svc.get_current_reservations_for_user(
+        user_data.user, user_data.user
+    )
+    extended = [r for r in reservations if r.id == ending_soon.id]
+    assert extended[0].extendable_until == ending_soon.end + ONE_HOUR
+
+
+def test_extendable_until_not_active(reservation_svc: ReservationService):
+    reservation = reservation_svc.get_reservation(
+        user_data.root, reservation_data.reservation_3.id
+    )
+    assert not reservation.extendable
+    assert reservation.extendable_at is None
+
+
+def test_extend_reservation(
+    reservation_svc: ReservationService, ending_soon: ReservationEntity
+):
+    end = ending_soon.end + ONE_HOUR
+    reservation = _extend(reservation_svc, ending_soon, end)
+    assert reservation.end == end
+    assert reservation.state == ReservationState.CHECKED_IN
+
+
+def test_extendable_until_reloads_index_after_change(
+    reservation_svc: ReservationService,
+    availability_cache: SeatAvailabilityCache,
+    session: Session,
+    ending_soon: ReservationEntity,
+):
+    """The index is reloaded once a reservation change advances the availability generation."""
+    reservation_svc.get_reservation(user_data.user, ending_soon.id)
+    next_start = ending_soon.end + THIRTY_MINUTES
+    _reserve(
+        session,
+        seat_data.monitor_seat_00.id,
+        user_data.root.id,
+        next_start,
+        next_start + ONE_HOUR,
+    )
+    availability_cache.invalidate()
+    reservation = reservation_svc.get_reservation(user_data.user, ending_soon.id)
+    assert reservation.extendable_until == next_start
+
+
+def test_extend_reservation_beyond_extend_duration(
+    reservation_svc: ReservationService, ending_soon: ReservationEntity
+):
+    with pytest.raises(ReservationException):
+        _extend(reservation_svc, ending_soon, ending_soon.end + 2 * ONE_HOUR)
+
+
+def test_extend_reservation_into_next_reservation(
+    reservation_svc: ReservationService,
+    session: Session,
+    ending_soon: ReservationEntity,
+):
+    next_start = ending_soon.end + THIRTY_MINUTES
+    _reserve(
+        session,
+        seat_data.monitor_seat_00.id,
+        user_data.root.id,
+        next_start,
+        next_start + ONE_HOUR,
+    )
+    with pytest.raises(ReservationException):
+        _extend(reservation_svc, ending_soon, ending_soon.end + ONE_HOUR)
+
+
+def test_extend_reservation_party_conflict(
+    reservation_svc: ReservationService,
+    session: Session,
+    ending_soon: ReservationEntity,
+):
+    _reserve(
+        session,
+        seat_data.monitor_seat_11.id,
+        user_data.user.id,
+        ending_soon.end + THIRTY_MINUTES,
+        ending_soon.end + ONE_HOUR,
+    )
+    with pytest.raises(ReservationException):
+        _extend(reservation_svc, ending_soon, ending_soon.end + ONE_HOUR)
+
+
+def test_extend_reservation_not_active(reservation_svc: ReservationService):
+    with pytest.raises(ReservationException):
+        reservation_svc.change_reservation(
+            user_data.root,
+            ReservationPartial(
+                id=reservation_data.reservation_3.id,
+                start=reservation_data.reservation_3.start,
+                end=reservation_data.reservation_3.end + THIRTY_MINUTES,
+            ),
+        )
+
+
+def test_shorten_reservation_not_implemented(
+    reservation_svc: ReservationService, ending_soon: ReservationEntity
+):
+    with pytest.raises(NotImplementedError):
+        _extend(reservation_svc, ending_soon, ending_soon.end - FIVE_MINUTES)
+
+
+def test_upcoming_reservation_index_next_start(time: dict[str, datetime]):
+    index = UpcomingReservationIndex()
+    index.load(
+        time[NOW],
+        0,
+        [
+            (1, time[IN_TWO_HOURS]),
+            (1, time[IN_ONE_HOUR]),
+            (2, time[IN_THIRTY_MINUTES]),
+            ("SN135", time[IN_THIRTY_MINUTES]),
+        ],
+    )
+    until = time[IN_THREE_HOURS]
+    assert index.next_start([1], time[NOW], until, time[NOW], 0) == time[IN_ONE_HOUR]
+    assert (
+        index.next_start([1], time[IN_ONE_HOUR], until, time[NOW], 0)
+        == time[IN_ONE_HOUR]
+    )
+    assert (
+        index.next_start([1, 2], time[NOW], until, time[NOW], 0)
+        == time[IN_THIRTY_MINUTES]
+    )
+    assert (
+        index.next_start([1, 3], time[IN_TWO_HOURS] + ONE_MINUTE, until, time[NOW], 0)
+        == until
+    )
+    assert index.next_start([3], time[NOW], until, time[NOW], 0) == until
+
+
+def test_upcoming_reservation_index_stale(time: dict[str, datetime]):
+    index = UpcomingReservationIndex(horizon=timedelta(hours=2))
+    assert index.next_start([1], time[NOW], time[IN_ONE_HOUR], time[NOW], 0) is None
+
+    index.load(time[NOW], 0, [])
+    assert index.is_fresh(time[NOW], 0)
+    assert not index.is_fresh(time[NOW], 1)
+    assert not index.is_fresh(time[IN_THIRTY_MINUTES], 0)
+    assert index.next_start([1], time[NOW], time[IN_THREE_HOURS], time[NOW], 0) is None
+    assert index.next_start([1], time[NOW], time[IN_ONE_HOUR], time[NOW], 1) is None
@@ -8,10 +8,13 @@ from .....services.coworking import ReservationService
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
 from ..fixtures import (
     reservation_svc,
+    availability_cache,
     permission_svc,
     seat_svc,
+    seat_catalog_cache,
     policy_svc,
     operating_hours_svc,
+    operating_hours_index,
 )
 from ..time import *
 
@@ -1,9 +1,15 @@
 """ReservationService#get_seat_reservations tests."""
 
+import pytest
 from unittest.mock import create_autospec
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
 
+from .....entities.coworking import ReservationEntity, SeatEntity
 from .....models.coworking import (
     Reservation,
+    ReservationState,
     TimeRange,
 )
 from .....services.coworking import ReservationService
@@ -12,10 +18,13 @@ from .....services.coworking import ReservationService
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
 from ..fixtures import (
     reservation_svc,
+    availability_cache,
     permission_svc,
     seat_svc,
+    seat_catalog_cache,
     policy_svc,
     operating_hours_svc,
+    operating_hours_index,
 )
 from ..time import *
 
@@ -70,3 +79,85 @@ def test_get_seat_reservations_unreserved_seats(
         seat_data.unreservable_seats, current
     )
     assert len(reservations) == 0
+
+
+def test_get_seat_reservations_bulk_loaded(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Reservations are loaded in a fixed number of queries, sharing seat models by id."""
+    statements: list[str] = []
+
+    def count(_conn, _cursor, statement, _parameters, _context, _executemany):
+        statements.append(statement)
+
+    bounds = TimeRange(start=time[NOW], end=time[NOW] + ONE_DAY)
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        reservations = reservation_svc.get_seat_reservations(seat_data.seats, bounds)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    # The reservations, their users, seats, the seats' rooms and reservation rooms.
+    assert len(statements) <= 5
+    assert len(reservations) > 1
+    seats = {}
+    for reservation in reservations:
+        for seat in reservation.seats:
+            assert seats.setdefault(seat.id, seat) is seat
+            assert seat.room is not None
+
+
+def test_get_seat_reservations_no_duplicates(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """A reservation of several of the requested seats is returned once."""
+    reservations = reservation_svc.get_seat_reservations(
+        reservation_data.reservation_4.seats,
+        TimeRange(start=time[NOW], end=time[NOW] + ONE_DAY),
+    )
+    ids = [reservation.id for reservation in reservations]
+    assert ids.count(reservation_data.reservation_4.id) == 1
+
+
+def test_get_seat_reservations_index_served(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """The overlap query is answered by the GiST index of the seat exclusion constraint."""
+    queries: list[tuple] = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        queries.append((statement, parameters))
+
+    bounds = TimeRange(start=time[NOW], end=time[NOW] + ONE_DAY)
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        reservation_svc.get_seat_reservations(seat_data.seats, bounds)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    # The fixture tables are tiny, so sequential scans are disabled to observe the plan
+    # the index makes available.
+    statement, parameters = queries[0]
+    connection = session.connection()
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    plan = "\n".join(
+        row[0] for row in connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    )
+    assert "coworking__reservation_seat_no_overlap" in plan
+
+
+def test_reservation_seat_exclusion_constraint(session: Session, time):
+    """Two active reservations of a seat may not overlap."""
+    seat = session.get(SeatEntity, reservation_data.reservation_1.seats[0].id)
+    overlapping = ReservationEntity(
+        state=ReservationState.CONFIRMED,
+        start=time[NOW],
+        end=time[IN_ONE_HOUR],
+        walkin=False,
+        seats=[seat],
+    )
+    session.add(overlapping)
+    with pytest.raises(IntegrityError):
+        session.commit()
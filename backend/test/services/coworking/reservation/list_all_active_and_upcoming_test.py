@@ -1,18 +1,24 @@
-"""ReservationService#list_all_active_and_upcoming tests."""
+"""ReservationService#list_all_active_and_upcoming and #list_active_and_upcoming_page tests."""
 
+import pytest
 from unittest.mock import create_autospec
 
+from .....models.coworking import TimeRange
 from .....services import PermissionService
 from .....services.coworking import ReservationService
+from .....services.coworking.reservation import ReservationException
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
 from ..fixtures import (
     reservation_svc,
+    availability_cache,
     permission_svc,
     seat_svc,
+    seat_catalog_cache,
     policy_svc,
     operating_hours_svc,
+    operating_hours_index,
 )
 from ..time import *
 
@@ -52,3 +58,84 @@ def test_list_all_active_and_upcoming_permission(reservation_svc: ReservationSer
         "coworking.reservation.read",
         f"user/*",
     )
+
+
+def _window(time) -> TimeRange:
+    return TimeRange(start=time[A_WEEK_AGO], end=time[NOW] + 2 * ONE_DAY)
+
+
+def test_list_active_and_upcoming_page(reservation_svc: ReservationService, time):
+    page = reservation_svc.list_active_and_upcoming_page(
+        user_data.ambassador, _window(time)
+    )
+    assert page.next_cursor is None
+    assert {reservation.id for reservation in page.items} == {
+        reservation.id
+        for reservation in reservation_data.reservations
+        if reservation.state in ("CONFIRMED", "CHECKED_IN", "CHECKED_OUT")
+    }
+    assert [(r.start, r.id) for r in page.items] == sorted(
+        (r.start, r.id) for r in page.items
+    )
+
+
+def test_list_active_and_upcoming_page_window(
+    reservation_svc: ReservationService, time
+):
+    window = TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])
+    page = reservation_svc.list_active_and_upcoming_page(user_data.ambassador, window)
+    assert len(page.items) > 0
+    for reservation in page.items:
+        assert reservation.start < window.end and reservation.end > window.start
+
+
+def test_list_active_and_upcoming_page_follows_cursor(
+    reservation_svc: ReservationService, time
+):
+    everything = reservation_svc.list_active_and_upcoming_page(
+        user_data.ambassador, _window(time)
+    )
+    paged = []
+    cursor = None
+    while True:
+        page = reservation_svc.list_active_and_upcoming_page(
+            user_data.ambassador, _window(time), cursor, limit=1
+        )
+        assert len(page.items) <= 1
+        paged.extend(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert [r.id for r in paged] == [r.id for r in everything.items]
+
+
+def test_list_active_and_upcoming_page_invalid_cursor(
+    reservation_svc: ReservationService, time
+):
+    with pytest.raises(ReservationException):
+        reservation_svc.list_active_and_upcoming_page(
+            user_data.ambassador, _window(time), "not a cursor"
+        )
+
+
+def test_list_active_and_upcoming_page_invalid_limit(
+    reservation_svc: ReservationService, time
+):
+    with pytest.raises(ReservationException):
+        reservation_svc.list_active_and_upcoming_page(
+            user_data.ambassador, _window(time), limit=0
+        )
+
+
+def test_list_active_and_upcoming_page_permission(
+    reservation_svc: ReservationService, time
+):
+    permission_svc = create_autospec(PermissionService)
+    permission_svc.enforce.return_value = None
+    reservation_svc._permission_svc = permission_svc
+    reservation_svc.list_active_and_upcoming_page(user_data.ambassador, _window(time))
+    permission_svc.enforce.assert_called_once_with(
+        user_data.ambassador,
+        "coworking.reservation.read",
+        f"user/*",
+    )
@@ -0,0 +1,263 @@
+"""ReservationService#room_availability and room reservation drafting tests"""
+
+import pytest
+from sqlalchemy.orm import Session
+
+from .....services.coworking import ReservationService
+from .....services.coworking.availability_cache import SeatAvailabilityCache
+from .....services.coworking.reservation import ReservationException
+from .....entities.coworking import ReservationEntity
+from .....models.coworking import ReservationState, Room, TimeRange
+
+from .....models.user import UserIdentity
+from .....models.coworking.seat import SeatIdentity
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from ..fixtures import (
+    reservation_svc,
+    availability_cache,
+    permission_svc,
+    seat_svc,
+    seat_catalog_cache,
+    policy_svc,
+    operating_hours_svc,
+    operating_hours_index,
+)
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from .. import room_data, seat_data
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _reserve_room(
+    session: Session, room: Room, start: datetime, end: datetime
+) -> ReservationEntity:
+    entity = ReservationEntity(
+        state=ReservationState.CONFIRMED,
+        start=start,
+        end=end,
+        walkin=False,
+        room_id=room.id,
+    )
+    session.add(entity)
+    session.commit()
+    return entity
+
+
+def _room_request(room: Room, start: datetime, end: datetime, users=None):
+    return reservation_data.test_request(
+        {
+            "start": start,
+            "end": end,
+            "users": [UserIdentity(id=user.id) for user in users or [user_data.user]],
+            "seats": [],
+            "room": Room(id=room.id),
+        }
+    )
+
+
+def test_room_availability(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Every reservable room is available whenever the XL is open, smallest first."""
+    rooms = reservation_svc.room_availability(
+        TimeRange(start=time[NOW], end=time[IN_THREE_HOURS])
+    )
+    assert [room.id for room in rooms] == [
+        room_data.pair_a.id,
+        room_data.group_a.id,
+        room_data.group_b.id,
+        room_data.group_c.id,
+    ]
+    for room in rooms:
+        assert len(room.availability) == 1
+        assert room.availability[0].start >= time[NOW]
+        assert room.availability[0].end == time[IN_THREE_HOURS]
+
+
+def test_room_availability_excludes_reservations(
+    reservation_svc: ReservationService, session: Session, time: dict[str, datetime]
+):
+    _reserve_room(session, room_data.group_a, time[IN_ONE_HOUR], time[IN_TWO_HOURS])
+    rooms = {
+        room.id: room
+        for room in reservation_svc.room_availability(
+            TimeRange(start=time[NOW], end=time[IN_THREE_HOURS])
+        )
+    }
+    group_a = rooms[room_data.group_a.id]
+    assert len(group_a.availability) == 2
+    assert group_a.availability[0].end == time[IN_ONE_HOUR]
+    assert group_a.availability[1].start == time[IN_TWO_HOURS]
+    assert len(rooms[room_data.group_b.id].availability) == 1
+
+
+def test_room_availability_ignores_cancelled_reservations(
+    reservation_svc: ReservationService, session: Session, time: dict[str, datetime]
+):
+    entity = _reserve_room(
+        session, room_data.group_a, time[IN_ONE_HOUR], time[IN_TWO_HOURS]
+    )
+    entity.state = ReservationState.CANCELLED
+    session.commit()
+    rooms = reservation_svc.room_availability(
+        TimeRange(start=time[NOW], end=time[IN_THREE_HOURS]), [room_data.group_a]
+    )
+    assert len(rooms[0].availability) == 1
+
+
+def test_room_availability_outside_operating_hours(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    assert (
+        reservation_svc.room_availability(
+            TimeRange(
+                start=time[IN_THREE_HOURS] + ONE_HOUR,
+                end=time[IN_THREE_HOURS] + 2 * ONE_HOUR,
+            )
+        )
+        == []
+    )
+
+
+def test_room_availability_cached_with_seats(
+    reservation_svc: ReservationService,
+    availability_cache: SeatAvailabilityCache,
+    time: dict[str, datetime],
+):
+    """Room availability is served from the seat availability cache, apart from seats."""
+    bounds = TimeRange(start=time[NOW], end=time[IN_THREE_HOURS])
+    reservation_svc.seat_availability(seat_data.seats, bounds.model_copy())
+    reservation_svc.room_availability(bounds.model_copy())
+    assert availability_cache.stats().entries == 2
+
+    reservation_svc.room_availability(bounds.model_copy())
+    assert availability_cache.stats().hits == 1
+
+
+def test_draft_room_reservation(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    reservation = reservation_svc.draft_reservation(
+        user_data.user,
+        _room_request(room_data.group_a, time[IN_ONE_HOUR], time[IN_TWO_HOURS]),
+    )
+    assert reservation.state == ReservationState.DRAFT
+    assert reservation.room is not None
+    assert reservation.room.id == room_data.group_a.id
+    assert reservation.seats == []
+    assert reservation.start == time[IN_ONE_HOUR]
+    assert reservation.end == time[IN_TWO_HOURS]
+
+    rooms = reservation_svc.room_availability(
+        TimeRange(start=time[NOW], end=time[IN_THREE_HOURS]), [room_data.group_a]
+    )
+    assert rooms[0].availability[0].end == time[IN_ONE_HOUR]
+
+
+def test_draft_room_reservation_for_party(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    reservation = reservation_svc.draft_reservation(
+        user_data.root,
+        _room_request(
+            room_data.pair_a,
+            time[IN_ONE_HOUR],
+            time[IN_TWO_HOURS],
+            [user_data.root, user_data.user],
+        ),
+    )
+    assert {user.id for user in reservation.users} == {
+        user_data.root.id,
+        user_data.user.id,
+    }
+
+
+def test_draft_room_reservation_taken(
+    reservation_svc: ReservationService, session: Session, time: dict[str, datetime]
+):
+    _reserve_room(session, room_data.group_a, time[NOW], time[IN_THREE_HOURS])
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(
+            user_data.user,
+            _room_request(room_data.group_a, time[IN_ONE_HOUR], time[IN_TWO_HOURS]),
+        )
+
+
+def test_draft_room_reservation_trimmed_to_availability(
+    reservation_svc: ReservationService, session: Session, time: dict[str, datetime]
+):
+    """As with seats, a draft starts once the room is free within the requested time."""
+    _reserve_room(
+        session,
+        room_data.group_a,
+        time[IN_ONE_HOUR],
+        time[IN_ONE_HOUR] + THIRTY_MINUTES,
+    )
+    reservation = reservation_svc.draft_reservation(
+        user_data.user,
+        _room_request(room_data.group_a, time[IN_ONE_HOUR], time[IN_TWO_HOURS]),
+    )
+    assert reservation.start == time[IN_ONE_HOUR] + THIRTY_MINUTES
+    assert reservation.end == time[IN_TWO_HOURS]
+
+
+def test_draft_room_reservation_not_reservable(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(
+            user_data.user,
+            _room_request(room_data.the_xl, time[IN_ONE_HOUR], time[IN_TWO_HOURS]),
+        )
+
+
+def test_draft_room_reservation_with_seats(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    request = _room_request(room_data.group_a, time[IN_ONE_HOUR], time[IN_TWO_HOURS])
+    request.seats = [SeatIdentity(id=seat_data.reservable_seats[0].id)]
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(user_data.user, request)
+
+
+def test_draft_room_reservation_over_capacity(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(
+            user_data.root,
+            _room_request(
+                room_data.pair_a,
+                time[IN_ONE_HOUR],
+                time[IN_TWO_HOURS],
+                [user_data.root, user_data.user, user_data.ambassador],
+            ),
+        )
+
+
+def test_draft_reservations_rejects_rooms(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    results = reservation_svc.draft_reservations(
+        user_data.root,
+        [_room_request(room_data.group_a, time[IN_ONE_HOUR], time[IN_TWO_HOURS])],
+    )
+    assert results[0].reservation is None
+    assert results[0].error is not None
@@ -0,0 +1,153 @@
+"""ReservationService#seat_availability tests of the shared availability cache"""
+
+import pytest
+
+from .....services import PermissionService, UserPermissionException
+from .....services.coworking import ReservationService
+from .....services.coworking.availability_cache import SeatAvailabilityCache
+from .....models.coworking import TimeRange, ReservationPartial, ReservationState
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from ..fixtures import (
+    reservation_svc,
+    availability_cache,
+    permission_svc,
+    seat_svc,
+    seat_catalog_cache,
+    policy_svc,
+    operating_hours_svc,
+    operating_hours_index,
+)
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from .. import seat_data
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+
+def _availability(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+) -> dict[int, list[TimeRange]]:
+    bounds = TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES])
+    return {
+        seat.id: seat.availability  # type: ignore
+        for seat in reservation_svc.seat_availability(seat_data.seats, bounds)
+    }
+
+
+def test_seat_availability_cache_hit(
+    reservation_svc: ReservationService,
+    availability_cache: SeatAvailabilityCache,
+    time: dict[str, datetime],
+):
+    """Repeated requests for the same seats and bounds are served from the cache."""
+    first = _availability(reservation_svc, time)
+    second = _availability(reservation_svc, time)
+    assert first.keys() == second.keys()
+    stats = availability_cache.stats()
+    assert stats.misses == 1
+    assert stats.hits == 1
+    assert stats.entries == 1
+
+
+def test_seat_availability_cache_results_are_not_shared(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Modifying a result does not affect availability later served from the cache."""
+    first = _availability(reservation_svc, time)
+    for availability in first.values():
+        availability.clear()
+    second = _availability(reservation_svc, time)
+    assert all(len(availability) > 0 for availability in second.values())
+
+
+def test_seat_availability_cache_invalidated_by_draft(
+    reservation_svc: ReservationService,
+    availability_cache: SeatAvailabilityCache,
+    time: dict[str, datetime],
+):
+    """Drafting a reservation invalidates the cache so the drafted seat is unavailable."""
+    before = _availability(reservation_svc, time)
+    reservation = reservation_svc.draft_reservation(
+        user_data.ambassador, reservation_data.test_request()
+    )
+    after = _availability(reservation_svc, time)
+    assert availability_cache.stats().invalidations == 1
+    assert availability_cache.stats().hits == 0
+    assert reservation.seats[0].id in before
+    assert reservation.seats[0].id not in after
+
+
+def test_seat_availability_cache_invalidated_by_change(
+    reservation_svc: ReservationService,
+    availability_cache: SeatAvailabilityCache,
+    time: dict[str, datetime],
+):
+    """Checking out of a reservation invalidates the cache."""
+    _availability(reservation_svc, time)
+    reservation_svc.change_reservation(
+        user_data.user,
+        ReservationPartial(
+            id=reservation_data.reservation_1.id, state=ReservationState.CHECKED_OUT
+        ),
+    )
+    assert availability_cache.stats().invalidations == 1
+    assert availability_cache.stats().entries == 0
+
+
+def test_seat_availability_cache_expires(
+    availability_cache: SeatAvailabilityCache, time: dict[str, datetime]
+):
+    """Entries are not served after their expiration or the maximum age."""
+    window = availability_cache.window(
+        TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])
+    )
+    key = availability_cache.key([2, 1], window, None)
+    availability_cache.put(
+        key, {}, time[NOW], time[NOW] + ONE_MINUTE / 2, availability_cache.generation()
+    )
+    assert availability_cache.get(key, time[NOW]) == {}
+    assert availability_cache.get(key, time[NOW] + ONE_MINUTE) is None
+    availability_cache.put(
+        key, {}, time[NOW], time[TOMORROW], availability_cache.generation()
+    )
+    assert availability_cache.get(key, time[NOW] + 2 * ONE_MINUTE) is None
+
+
+def test_seat_availability_cache_put_after_invalidation_is_discarded(
+    availability_cache: SeatAvailabilityCache, time: dict[str, datetime]
+):
+    """A value computed concurrently with an invalidation is never stored."""
+    window = availability_cache.window(
+        TimeRange(start=time[NOW], end=time[IN_ONE_HOUR])
+    )
+    key = availability_cache.key([1], window, None)
+    generation = availability_cache.generation()
+    availability_cache.invalidate()
+    availability_cache.put(key, {}, time[NOW], time[TOMORROW], generation)
+    assert availability_cache.get(key, time[NOW]) is None
+
+
+def test_seat_availability_cache_stats_enforces_permission(
+    reservation_svc: ReservationService, permission_svc: PermissionService
+):
+    """Cache counters are only visible to staff who can read all reservations."""
+    stats = reservation_svc.seat_availability_cache_stats(user_data.ambassador)
+    assert stats.hits == 0
+    with pytest.raises(UserPermissionException):
+        reservation_svc.seat_availability_cache_stats(user_data.user)
@@ -1,18 +1,28 @@
-"""ReservationService#seat_availability tests"""
+"""ReservationService#seat_availability, #search_seat_availability and #seat_availability_grid tests"""
 
 from .....services.coworking import ReservationService, PolicyService
+import pytest
+from base64 import b64decode
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
 from .....models.coworking import (
+    SeatSearch,
     TimeRange,
 )
+from .....services.coworking.reservation import ReservationException
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
 from ..fixtures import (
     reservation_svc,
+    availability_cache,
     permission_svc,
     seat_svc,
+    seat_catalog_cache,
     policy_svc,
     operating_hours_svc,
+    operating_hours_index,
 )
 from ..time import *
 
@@ -145,3 +155,179 @@ def test_seat_availability_xl_closing_soon(
     )
     available_seats = reservation_svc.seat_availability(seat_data.seats, near_closing)
     assert len(available_seats) == 0
+
+
+def test_seat_availability_slot_grid_with_reservation(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Slot grid mode agrees with exact mode, quantized to slot boundaries."""
+    today = TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES])
+    available_seats = reservation_svc.seat_availability(
+        seat_data.reservable_seats, today, slot_width=FIVE_MINUTES
+    )
+    assert len(available_seats) == len(seat_data.reservable_seats) - 1
+    assert available_seats[0].id == seat_data.monitor_seat_10.id
+    for time_range in available_seats[0].availability:
+        assert time_range.start.minute % 5 == 0
+        assert time_range.start.second == 0
+        assert time_range.start.microsecond == 0
+        assert time_range.start >= time[NOW]
+        assert time_range.end <= time[IN_THIRTY_MINUTES]
+
+
+def test_seat_availability_slot_grid_near_requested_start(
+    reservation_svc: ReservationService,
+):
+    """Slots touched by a reservation are not available in slot grid mode."""
+    future = TimeRange(
+        start=operating_hours_data.today.end - THIRTY_MINUTES - FIVE_MINUTES,
+        end=operating_hours_data.today.end + FIVE_MINUTES,
+    )
+    available_seats = reservation_svc.seat_availability(
+        seat_data.reservable_seats, future, slot_width=FIVE_MINUTES
+    )
+    assert len(available_seats) == len(seat_data.reservable_seats)
+    for seat in available_seats:
+        assert seat.availability[0].start >= reservation_data.reservation_4.end
+        assert (
+            seat.availability[0].start - reservation_data.reservation_4.end
+            < FIVE_MINUTES
+        )
+        assert seat.availability[0].end <= operating_hours_data.today.end
+
+
+def test_seat_availability_slot_grid_all_reserved(reservation_svc: ReservationService):
+    future = TimeRange(
+        start=reservation_data.reservation_4.start,
+        end=reservation_data.reservation_4.end,
+    )
+    available_seats = reservation_svc.seat_availability(
+        seat_data.reservable_seats, future, slot_width=FIVE_MINUTES
+    )
+    assert len(available_seats) == 0
+
+
+def test_seat_availability_limit(reservation_svc: ReservationService):
+    """A limit selects the best available seats in the same order as a full sort."""
+    future = TimeRange(
+        start=operating_hours_data.today.end - THIRTY_MINUTES - FIVE_MINUTES,
+        end=operating_hours_data.today.end + FIVE_MINUTES,
+    )
+    everything = reservation_svc.seat_availability(seat_data.seats, future)
+    best = reservation_svc.seat_availability(seat_data.seats, future, limit=2)
+    assert len(best) == 2
+
+    def preference(seat):
+        availability = seat.availability[0]
+        return (
+            availability.start,
+            availability.start - availability.end,
+            seat.reservable,
+        )
+
+    assert [preference(seat) for seat in best] == sorted(
+        preference(seat) for seat in everything
+    )[:2]
+
+
+def test_search_seat_availability(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Only seats meeting the criteria are returned."""
+    today = TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES])
+    criteria = SeatSearch(has_monitor=True, reservable=False)
+    available_seats = reservation_svc.search_seat_availability(criteria, today)
+    assert len(available_seats) > 0
+    for seat in available_seats:
+        assert seat.has_monitor and not seat.reservable
+
+
+def test_search_seat_availability_limit(reservation_svc: ReservationService):
+    tomorrow = TimeRange(
+        start=operating_hours_data.future.start,
+        end=operating_hours_data.future.start + ONE_HOUR,
+    )
+    available_seats = reservation_svc.search_seat_availability(
+        SeatSearch(), tomorrow, limit=1
+    )
+    assert len(available_seats) == 1
+
+
+def test_search_seat_availability_invalid_limit(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    today = TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES])
+    with pytest.raises(ReservationException):
+        reservation_svc.search_seat_availability(SeatSearch(), today, limit=0)
+
+
+def test_search_seat_availability_no_matches_skips_database(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """When no seat meets the criteria, no availability is computed."""
+    reservation_svc._seat_svc.catalog()
+    statements: list[str] = []
+
+    def count(_conn, _cursor, statement, _parameters, _context, _executemany):
+        statements.append(statement)
+
+    today = TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES])
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        available_seats = reservation_svc.search_seat_availability(
+            SeatSearch(room_id="no such room"), today
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    assert available_seats == []
+    assert statements == []
+
+
+def _grid_bits(encoded: str) -> int:
+    return int.from_bytes(b64decode(encoded), "little")
+
+
+def test_seat_availability_grid_while_completely_open(
+    reservation_svc: ReservationService,
+):
+    """Every slot of every reservable seat is set while the XL is open and unreserved."""
+    bounds = TimeRange(
+        start=operating_hours_data.future.start,
+        end=operating_hours_data.future.start + 2 * ONE_HOUR,
+    )
+    grid = reservation_svc.seat_availability_grid(
+        SeatSearch(reservable=True), bounds, FIVE_MINUTES * 3
+    )
+    assert grid.slot_minutes == 15
+    assert grid.origin >= bounds.start
+    assert grid.origin - bounds.start < FIVE_MINUTES * 3
+    assert grid.origin + grid.slots * FIVE_MINUTES * 3 <= bounds.end
+    assert set(grid.seats) == {seat.id for seat in seat_data.reservable_seats}
+    for encoded in grid.seats.values():
+        assert len(b64decode(encoded)) == (grid.slots + 7) // 8
+        assert _grid_bits(encoded) == (1 << grid.slots) - 1
+
+
+def test_seat_availability_grid_with_reservation(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    """Slots overlapping a reservation are cleared."""
+    bounds = TimeRange(start=time[NOW], end=time[IN_TWO_HOURS])
+    grid = reservation_svc.seat_availability_grid(
+        SeatSearch(), bounds, FIVE_MINUTES * 3
+    )
+    reserved = reservation_data.reservation_1.seats[0].id
+    assert _grid_bits(grid.seats[reserved]) & 1 == 0
+    assert _grid_bits(grid.seats[seat_data.monitor_seat_01.id]) & 1 == 1
+
+
+def test_seat_availability_grid_invalid(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    bounds = TimeRange(start=time[NOW], end=time[IN_TWO_HOURS])
+    with pytest.raises(ReservationException):
+        reservation_svc.seat_availability_grid(SeatSearch(), bounds, ONE_MINUTE)
+    year = TimeRange(start=time[NOW], end=time[NOW] + 365 * ONE_DAY)
+    with pytest.raises(ReservationException):
+        reservation_svc.seat_availability_grid(SeatSearch(), year, FIVE_MINUTES)
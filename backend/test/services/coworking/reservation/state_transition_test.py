@@ -1,4 +1,4 @@
-"""ReservationService#_state_transition tests"""
+"""ReservationService#expire_reservations and ReservationExpirySweeper tests"""
 
 import pytest
 from unittest.mock import create_autospec
@@ -6,6 +6,7 @@ from unittest.mock import create_autospec
 from .....services import PermissionService, UserPermissionException
 from .....services.coworking import ReservationService, PolicyService
 from .....services.coworking.reservation import ReservationException
+from .....services.coworking.availability_cache import SeatAvailabilityCache
 from .....models.coworking import (
     Reservation,
     TimeRange,
@@ -16,17 +17,22 @@ from .....models.user import UserIdentity
 from .....models.coworking.seat import SeatIdentity
 
 # Some internal methods use SQLAlchemy layer and are tested here
+from sqlalchemy import Engine
 from sqlalchemy.orm import Session
 from .....entities.coworking import ReservationEntity
+from .....services.coworking.expiry_sweeper import ReservationExpirySweeper
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
 from ..fixtures import (
     reservation_svc,
+    availability_cache,
     permission_svc,
     seat_svc,
+    seat_catalog_cache,
     policy_svc,
     operating_hours_svc,
+    operating_hours_index,
 )
 from ..time import *
 
@@ -50,105 +56,143 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
-def test_state_transition_reservation_entities_by_time_noop(
+def _state(session: Session, reservation: Reservation) -> ReservationState:
+    return session.get(ReservationEntity, reservation.id, populate_existing=True).state
+
+
+def test_expire_reservations_noop(
     session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
 ):
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.active_reservations
-    ]
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        time[NOW], entities
-    )
-    assert collected is not entities
-    assert collected == entities
+    assert reservation_svc.expire_reservations(time[NOW]) == 0
+    for reservation in reservation_data.reservations:
+        assert _state(session, reservation) == reservation.state
 
 
-def test_state_transition_reservation_entities_by_time_expired_active(
+def test_expire_reservations_expired_active(
     session: Session, reservation_svc: ReservationService
 ):
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.active_reservations
-    ]
-    cutoff = entities[0].end
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
-
-    assert len(collected) == len(entities) - 1
-    reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CHECKED_OUT
+    reservation = reservation_data.active_reservations[0]
+    assert reservation_svc.expire_reservations(reservation.end) >= 1
+    assert _state(session, reservation) == ReservationState.CHECKED_OUT
 
 
-def test_state_transition_reservation_entities_by_time_active_draft(
+def test_expire_reservations_active_draft(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.draft_reservations
-    ]
-    cutoff = entities[0].created_at + policy_svc.reservation_draft_timeout()
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
-    assert len(collected) == len(entities)
-    assert collected[0].state == ReservationState.DRAFT
+    reservation = reservation_data.draft_reservations[0]
+    cutoff = reservation.created_at + policy_svc.reservation_draft_timeout()
+    reservation_svc.expire_reservations(cutoff)
+    assert _state(session, reservation) == ReservationState.DRAFT
 
 
-def test_state_transition_reservation_entities_by_time_expired_draft(
+def test_expire_reservations_expired_draft(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
     policy_mock = create_autospec(PolicyService)
     policy_mock.reservation_draft_timeout.return_value = (
         policy_svc.reservation_draft_timeout()
     )
+    policy_mock.reservation_checkin_timeout.return_value = (
+        policy_svc.reservation_checkin_timeout()
+    )
     reservation_svc._policy_svc = policy_mock
 
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.draft_reservations
-    ]
+    reservation = reservation_data.draft_reservations[0]
     cutoff = (
-        entities[0].created_at
+        reservation.created_at
         + policy_svc.reservation_draft_timeout()
         + timedelta(seconds=1)
     )
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
-    )
-    assert len(collected) == len(entities) - 1
-
-    reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CANCELLED
+    reservation_svc.expire_reservations(cutoff)
+    assert _state(session, reservation) == ReservationState.CANCELLED
 
     policy_mock.reservation_draft_timeout.assert_called_once()
 
 
-def test_state_transition_reservation_entities_by_time_checkin_timeout(
+def test_expire_reservations_checkin_timeout(
     session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
 ):
     policy_mock = create_autospec(PolicyService)
+    policy_mock.reservation_draft_timeout.return_value = (
+        policy_svc.reservation_draft_timeout()
+    )
     policy_mock.reservation_checkin_timeout.return_value = (
         policy_svc.reservation_checkin_timeout()
     )
     reservation_svc._policy_svc = policy_mock
 
-    entities: list[ReservationEntity] = [
-        session.get(ReservationEntity, reservation.id)
-        for reservation in reservation_data.confirmed_reservations
-    ]
+    reservation = reservation_data.confirmed_reservations[0]
     cutoff = (
-        entities[0].start
+        reservation.start
         + policy_svc.reservation_checkin_timeout()
         + timedelta(seconds=1)
     )
-    collected = reservation_svc._state_transition_reservation_entities_by_time(
-        cutoff, entities
+    reservation_svc.expire_reservations(cutoff)
+    assert _state(session, reservation) == ReservationState.CANCELLED
+
+    policy_mock.reservation_checkin_timeout.assert_called_once()
+
+
+def test_expire_reservations_invalidates_availability_cache(
+    reservation_svc: ReservationService, availability_cache: SeatAvailabilityCache
+):
+    reservation_svc.expire_reservations(reservation_data.active_reservations[0].end)
+    assert availability_cache.stats().invalidations == 1
+
+
+def test_unexpired_criteria_excludes_without_writing(
+    session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
+):
+    """Read paths exclude expired reservations but leave transitioning to the sweeper."""
+    reservation = reservation_data.draft_reservations[0]
+    cutoff = (
+        reservation.created_at
+        + policy_svc.reservation_draft_timeout()
+        + timedelta(seconds=1)
+    )
+    active_ids = {
+        entity.id
+        for entity in session.query(ReservationEntity).filter(
+            reservation_svc._unexpired_criteria(cutoff)
+        )
+    }
+    assert reservation.id not in active_ids
+    assert reservation_data.active_reservations[0].id in active_ids
+    assert not session.dirty
+    assert _state(session, reservation) == ReservationState.DRAFT
+
+
+def test_get_seat_reservations_excludes_expired_without_writing(
+    session: Session, reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    # The seat's current occupant leaves so that moving the start does not double book it.
+    occupant = session.get(
+        ReservationEntity, reservation_data.active_reservations[0].id
+    )
+    occupant.state = ReservationState.CHECKED_OUT
+    reservation = reservation_data.confirmed_reservations[0]
+    entity = session.get(ReservationEntity, reservation.id)
+    entity.start = time[THIRTY_MINUTES_AGO]
+    session.commit()
+
+    reservations = reservation_svc.get_seat_reservations(
+        reservation.seats, TimeRange(start=time[NOW], end=time[TOMORROW])
     )
-    assert len(collected) == len(entities) - 1
+    assert reservation.id not in {reservation.id for reservation in reservations}
+    assert _state(session, reservation) == ReservationState.CONFIRMED
 
-    reservation = session.get(ReservationEntity, entities[0].id, populate_existing=True)
-    assert reservation.state == ReservationState.CANCELLED
 
-    policy_mock.reservation_checkin_timeout.assert_called_once()
+def test_sweeper_sweep(test_engine: Engine, session: Session):
+    sweeper = ReservationExpirySweeper(lambda: Session(test_engine))
+    reservation = reservation_data.active_reservations[0]
+    assert sweeper.sweep(reservation.end) >= 1
+    assert _state(session, reservation) == ReservationState.CHECKED_OUT
+
+
+def test_sweeper_start_stop(test_engine: Engine):
+    sweeper = ReservationExpirySweeper(
+        lambda: Session(test_engine), timedelta(seconds=0.01)
+    )
+    sweeper.start()
+    sweeper.stop()
+    sweeper.stop()
@@ -1,17 +1,25 @@
 """Tests for Coworking Rooms Service."""
 
 from ....services.coworking import SeatService
-from ....models.coworking import SeatDetails
+from ....models.coworking import SeatDetails, SeatSearch
+from ....models.coworking.seat import SeatIdentity
+from ....entities.coworking import SeatEntity
+from ....services.coworking.seat_catalog import (
+    SeatCatalogCache,
+    seat_catalog_cache as process_seat_catalog_cache,
+)
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
-from .fixtures import seat_svc
+from .fixtures import seat_svc, seat_catalog_cache
 
 # Import the setup_teardown fixture explicitly to load entities in database
 from .room_data import fake_data_fixture as insert_room_fake_data
 from .seat_data import fake_data_fixture as insert_seat_fake_data
 
 # Import the fake model data in a namespace for test assertions
-from . import seat_data
+from . import room_data, seat_data
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -22,3 +30,77 @@ def test_list(seat_svc: SeatService):
     seats = seat_svc.list()
     assert len(seats) == len(seat_data.seats)
     assert isinstance(seats[0], SeatDetails)
+
+
+def test_list_served_from_catalog(seat_svc: SeatService):
+    """After the catalog loads, listing seats does not query the database."""
+    seats = seat_svc.list()
+    seat_svc._session = None
+    assert seat_svc.list() == seats
+
+
+def test_catalog_includes_rooms(seat_svc: SeatService):
+    catalog = seat_svc.catalog()
+    for seat in seat_data.seats:
+        assert catalog.by_id[seat.id].room.id == seat.room.id
+
+
+def test_catalog_reservable_rooms(seat_svc: SeatService):
+    catalog = seat_svc.catalog()
+    assert len(catalog.rooms) == len(room_data.rooms)
+    assert [room.id for room in catalog.reservable_rooms()] == [
+        room_data.pair_a.id,
+        room_data.group_a.id,
+        room_data.group_b.id,
+        room_data.group_c.id,
+    ]
+    assert catalog.rooms_by_id[room_data.group_a.id].capacity == 4
+
+
+def test_catalog_lookup(seat_svc: SeatService):
+    catalog = seat_svc.catalog()
+    seats = catalog.lookup(
+        [
+            SeatIdentity(id=seat_data.seats[1].id),
+            SeatIdentity(id=-1),
+            SeatIdentity(id=seat_data.seats[0].id),
+        ]
+    )
+    assert [seat.id for seat in seats] == [seat_data.seats[1].id, seat_data.seats[0].id]
+
+
+def test_catalog_search(seat_svc: SeatService):
+    catalog = seat_svc.catalog()
+    assert len(catalog.search(SeatSearch())) == len(seat_data.seats)
+    seats = catalog.search(SeatSearch(reservable=True, has_monitor=True))
+    assert [seat.id for seat in seats] == [
+        seat.id for seat in seat_data.seats if seat.reservable and seat.has_monitor
+    ]
+    assert catalog.search(SeatSearch(room_id="no such room")) == []
+
+
+def test_catalog_is_shared(seat_svc: SeatService, seat_catalog_cache: SeatCatalogCache):
+    assert seat_svc.catalog() is seat_svc.catalog()
+    seat_catalog_cache.invalidate()
+    catalog = seat_svc.catalog()
+    assert catalog is seat_svc.catalog()
+    assert catalog.version == 1
+
+
+def test_catalog_stale_after_seat_edit(session: Session):
+    """Committed edits to seats are reflected in the next catalog."""
+    catalog_cache = process_seat_catalog_cache()
+    before = catalog_cache.get(session, datetime.now())
+    entity = session.get(SeatEntity, seat_data.seats[0].id)
+    entity.title = "Renamed"
+    session.commit()
+    after = catalog_cache.get(session, datetime.now())
+    assert after is not before
+    assert after.by_id[entity.id].title == "Renamed"
+
+
+def test_catalog_expires(session: Session, seat_catalog_cache: SeatCatalogCache):
+    now = datetime.now()
+    catalog = seat_catalog_cache.get(session, now)
+    assert seat_catalog_cache.get(session, now + timedelta(minutes=1)) is catalog
+    assert seat_catalog_cache.get(session, now + timedelta(hours=1)) is not catalog
@@ -2,8 +2,12 @@
 
 from .fixtures import status_svc
 from ....services.coworking.status import StatusService
-from ....models.coworking.availability import SeatAvailability
+from ....services.coworking.status_snapshot import StatusSnapshot, StatusSnapshotCache
+from ....models.coworking import ReservationDetails
+from ....models.coworking.availability import RoomAvailability, SeatAvailability
 from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
 
 from ..core_data import user_data
 from . import operating_hours_data
@@ -21,9 +25,16 @@ from .reservation.reservation_data import fake_data_fixture as insert_order_4
 def test_status_dispatch(status_svc: StatusService):
     # Hard-wire mock responses to all dispatched methods
     # We test these methods elsewhere
-    status_svc._reservation_svc.get_current_reservations_for_user.return_value = [
-        reservation_data.reservation_1
+    my_reservations = [
+        ReservationDetails(
+            **dict(reservation_data.reservation_1),
+            extendable_at=reservation_data.reservation_1.end - timedelta(minutes=15),
+            extendable_until=None,
+        )
     ]
+    status_svc._reservation_svc.get_current_reservations_for_user.return_value = (
+        my_reservations
+    )
     status_svc._policies_svc.walkin_window.return_value = timedelta(minutes=15)
     status_svc._policies_svc.walkin_initial_duration.return_value = timedelta(hours=1)
     status_svc._policies_svc.reservation_window.return_value = timedelta(weeks=1)
@@ -44,6 +55,10 @@ def test_status_dispatch(status_svc: StatusService):
         )
     ]
     status_svc._reservation_svc.seat_availability.return_value = seat_availability
+    room_availability = [
+        RoomAvailability(id="SN135", nickname="Group A", availability=[])
+    ]
+    status_svc._reservation_svc.room_availability.return_value = room_availability
 
     # Call the method
     status = status_svc.get_coworking_status(user_data.root)
@@ -53,9 +68,108 @@ def test_status_dispatch(status_svc: StatusService):
         user_data.root, user_data.root
     )
     status_svc._reservation_svc.seat_availability.assert_called_once()
+    status_svc._reservation_svc.room_availability.assert_called_once()
     status_svc._operating_hours_svc.schedule.assert_called_once()
 
     # Look for expected RVs
-    assert status.my_reservations == [reservation_data.reservation_1]
+    assert status.my_reservations == my_reservations
     assert status.seat_availability == seat_availability
     assert status.operating_hours == [operating_hours_data.today]
+    assert status.room_availability == room_availability
+
+
+def _mock_dependencies(status_svc: StatusService):
+    status_svc._reservation_svc.get_current_reservations_for_user.return_value = []
+    status_svc._policies_svc.walkin_window.return_value = timedelta(minutes=15)
+    status_svc._policies_svc.walkin_initial_duration.return_value = timedelta(hours=1)
+    status_svc._policies_svc.reservation_window.return_value = timedelta(weeks=1)
+    status_svc._seat_svc.list.return_value = []
+    status_svc._operating_hours_svc.schedule.return_value = [operating_hours_data.today]
+    status_svc._reservation_svc.seat_availability.return_value = []
+    status_svc._reservation_svc.room_availability.return_value = []
+
+
+def test_status_snapshot_shared_across_users(status_svc: StatusService):
+    """Availability and operating hours are computed once per tick, reservations per user."""
+    _mock_dependencies(status_svc)
+    status_svc._snapshot_cache = StatusSnapshotCache(timedelta(hours=1))
+
+    status_svc.get_coworking_status(user_data.root)
+    status_svc.get_coworking_status(user_data.user)
+
+    assert status_svc._reservation_svc.get_current_reservations_for_user.call_count == 2
+    status_svc._reservation_svc.seat_availability.assert_called_once()
+    status_svc._reservation_svc.room_availability.assert_called_once()
+    status_svc._operating_hours_svc.schedule.assert_called_once()
+
+
+def test_status_snapshot_keyed_by_policy(status_svc: StatusService):
+    """Users with different policies do not share a snapshot."""
+    _mock_dependencies(status_svc)
+    status_svc._snapshot_cache = StatusSnapshotCache(timedelta(hours=1))
+
+    status_svc.get_coworking_status(user_data.root)
+    status_svc._policies_svc.reservation_window.return_value = timedelta(weeks=2)
+    status_svc.get_coworking_status(user_data.user)
+
+    assert status_svc._operating_hours_svc.schedule.call_count == 2
+
+
+def test_status_snapshot_recomputed_after_reservation_change(
+    status_svc: StatusService,
+):
+    """A change to reservations is reflected without waiting for the next tick."""
+    _mock_dependencies(status_svc)
+    status_svc._snapshot_cache = StatusSnapshotCache(timedelta(hours=1))
+
+    status_svc.get_coworking_status(user_data.root)
+    status_svc._availability_cache.invalidate()
+    status_svc.get_coworking_status(user_data.root)
+
+    assert status_svc._reservation_svc.seat_availability.call_count == 2
+
+
+def test_status_snapshot_single_flight():
+    """Concurrent requests in a tick wait on a single computation of the snapshot."""
+    snapshot_cache = StatusSnapshotCache(timedelta(hours=1))
+    now = datetime.now()
+    calls = 0
+
+    def compute() -> StatusSnapshot:
+        nonlocal calls
+        calls += 1
+        sleep(0.05)
+        return StatusSnapshot([], [])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        snapshots = list(
+            executor.map(lambda _: snapshot_cache.get(now, "key", compute), range(8))
+        )
+
+    assert calls == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert snapshot_cache.get(now + timedelta(hours=1), "key", compute) is not None
+    assert calls == 2
+
+
+def test_status_etag_stable(status_svc: StatusService):
+    """The ETag is unchanged while coworking state is unchanged."""
+    _mock_dependencies(status_svc)
+    etag = status_svc.etag(user_data.root)
+    assert etag.startswith('W/"')
+    assert status_svc.etag(user_data.root) == etag
+    status_svc._reservation_svc.seat_availability.assert_not_called()
+    status_svc._reservation_svc.get_current_reservations_for_user.assert_not_called()
+
+
+def test_status_etag_per_user(status_svc: StatusService):
+    _mock_dependencies(status_svc)
+    assert status_svc.etag(user_data.root) != status_svc.etag(user_data.user)
+
+
+def test_status_etag_changes_with_state(status_svc: StatusService):
+    """Reservation writes, expiry sweeps and operating hours edits advance the version."""
+    _mock_dependencies(status_svc)
+    etag = status_svc.etag(user_data.root)
+    status_svc._availability_cache.invalidate()
+    assert status_svc.etag(user_data.root) != etag
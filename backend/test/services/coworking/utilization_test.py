@@ -0,0 +1,207 @@
+"""Tests for the hourly utilization rollup and UtilizationService."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ....entities.coworking import UtilizationHourEntity
+from ....models.coworking import ReservationPartial, ReservationState, TimeRange
+from ....services.coworking import (
+    ReservationArchiveService,
+    ReservationService,
+    UtilizationService,
+)
+from ....services.coworking.utilization import utilization
+from ....services.exceptions import UserPermissionException
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from .fixtures import (
+    utilization_svc,
+    archive_svc,
+    reservation_svc,
+    availability_cache,
+    permission_svc,
+    seat_svc,
+    seat_catalog_cache,
+    policy_svc,
+    operating_hours_svc,
+    operating_hours_index,
+)
+from .time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .operating_hours_data import fake_data_fixture as insert_order_1
+from .room_data import fake_data_fixture as insert_order_2
+from .seat_data import fake_data_fixture as insert_order_3
+from .reservation.reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ..core_data import user_data
+from . import room_data
+from .reservation import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2023"
+__license__ = "MIT"
+
+XL = room_data.the_xl.id
+
+
+def _totals(session: Session) -> tuple[int, int, int]:
+    """Seat-seconds across the whole rollup as (reserved, checked in, no-show)."""
+    session.expire_all()
+    rows = session.scalars(select(UtilizationHourEntity)).all()
+    return (
+        sum(row.reserved_seat_seconds for row in rows),
+        sum(row.checked_in_seat_seconds for row in rows),
+        sum(row.no_show_seat_seconds for row in rows),
+    )
+
+
+def _rollup(session: Session) -> dict:
+    session.expire_all()
+    return {
+        (row.room_id, row.hour): (
+            row.reserved_seat_seconds,
+            row.checked_in_seat_seconds,
+            row.no_show_seat_seconds,
+        )
+        for row in session.scalars(select(UtilizationHourEntity))
+        if row.reserved_seat_seconds != 0
+    }
+
+
+def test_utilization_split_by_hour():
+    start = datetime(2023, 9, 1, 10, 30)
+    contribution = utilization(
+        ReservationState.CONFIRMED, start, start + timedelta(minutes=105), [XL, XL]
+    )
+    assert contribution == {
+        (XL, datetime(2023, 9, 1, 10)): (3600, 0, 0),
+        (XL, datetime(2023, 9, 1, 11)): (7200, 0, 0),
+        (XL, datetime(2023, 9, 1, 12)): (1800, 0, 0),
+    }
+
+
+def test_utilization_by_state():
+    start = datetime(2023, 9, 1, 10)
+    end = start + THIRTY_MINUTES
+    hour = (XL, start)
+    assert utilization(ReservationState.DRAFT, start, end, [XL]) == {}
+    assert utilization(ReservationState.CANCELLED, start, end, [XL]) == {}
+    assert utilization(ReservationState.CHECKED_IN, start, end, [XL]) == {
+        hour: (1800, 1800, 0)
+    }
+    assert utilization(ReservationState.CHECKED_OUT, start, end, [XL]) == {
+        hour: (1800, 1800, 0)
+    }
+    assert utilization(ReservationState.CANCELLED, start, end, [XL], no_show=True) == {
+        hour: (1800, 0, 1800)
+    }
+    assert utilization(ReservationState.CHECKED_OUT, end, start, [XL]) == {}
+
+
+def test_backfill(session: Session, utilization_svc: UtilizationService):
+    """Checked in, checked out and confirmed reservations are counted; the cancelled and
+    draft reservations are not."""
+    assert utilization_svc.backfill(batch_size=2) == len(reservation_data.reservations)
+    assert _totals(session) == (3600 + 3600 + 2 * 1800, 3600 + 3600, 0)
+
+
+def test_backfill_is_repeatable(session: Session, utilization_svc: UtilizationService):
+    utilization_svc.backfill()
+    rollup = _rollup(session)
+    utilization_svc.backfill()
+    assert _rollup(session) == rollup
+
+
+def test_backfill_after_archive(
+    session: Session,
+    utilization_svc: UtilizationService,
+    archive_svc: ReservationArchiveService,
+    time: dict[str, datetime],
+):
+    """Archived reservations still count toward the rebuilt rollup."""
+    utilization_svc.backfill()
+    rollup = _rollup(session)
+    assert archive_svc.archive(time[IN_ONE_HOUR]) > 0
+    assert utilization_svc.backfill() == len(reservation_data.reservations)
+    assert _rollup(session) == rollup
+
+
+def test_staff_checkin_records_checked_in(
+    session: Session,
+    utilization_svc: UtilizationService,
+    reservation_svc: ReservationService,
+):
+    utilization_svc.backfill()
+    reserved, checked_in, no_show = _totals(session)
+    reservation_svc.staff_checkin_reservation(
+        user_data.ambassador, reservation_data.reservation_4
+    )
+    assert _totals(session) == (reserved, checked_in + 2 * 1800, no_show)
+
+
+def test_cancel_records_unreserved(
+    session: Session,
+    utilization_svc: UtilizationService,
+    reservation_svc: ReservationService,
+):
+    """Cancelling a confirmed reservation before it starts removes it, consistent with a
+    rebuild of the rollup."""
+    utilization_svc.backfill()
+    reserved, checked_in, no_show = _totals(session)
+    reservation_svc.change_reservation(
+        user_data.root,
+        ReservationPartial(
+            id=reservation_data.reservation_4.id, state=ReservationState.CANCELLED
+        ),
+    )
+    assert _totals(session) == (reserved - 2 * 1800, checked_in, no_show)
+
+    incremental = _rollup(session)
+    utilization_svc.backfill()
+    assert _rollup(session) == incremental
+
+
+def test_expiry_records_no_show(
+    session: Session,
+    utilization_svc: UtilizationService,
+    reservation_svc: ReservationService,
+):
+    """A confirmed reservation cancelled by the sweeper stays reserved and is a no-show."""
+    utilization_svc.backfill()
+    reserved, checked_in, no_show = _totals(session)
+    reservation_svc.expire_reservations(
+        reservation_data.reservation_4.start + THIRTY_MINUTES
+    )
+    assert _totals(session) == (reserved, checked_in, no_show + 2 * 1800)
+
+
+def test_hourly(utilization_svc: UtilizationService, time: dict[str, datetime]):
+    utilization_svc.backfill()
+    window = TimeRange(start=time[AN_HOUR_AGO], end=time[IN_THREE_HOURS])
+    hours = utilization_svc.hourly(user_data.root, window)
+    assert len(hours) > 0
+    assert all(hour.room_id == XL for hour in hours)
+    assert hours == sorted(hours, key=lambda hour: (hour.hour, hour.room_id))
+    assert sum(hour.reserved_seat_minutes for hour in hours) == 60 + 60 + 2 * 30
+    assert sum(hour.checked_in_seat_minutes for hour in hours) == 60 + 60
+
+
+def test_hourly_room(utilization_svc: UtilizationService, time: dict[str, datetime]):
+    utilization_svc.backfill()
+    window = TimeRange(start=time[AN_HOUR_AGO], end=time[IN_THREE_HOURS])
+    assert utilization_svc.hourly(user_data.root, window, room_data.group_a.id) == []
+
+
+def test_hourly_enforces_permission(
+    utilization_svc: UtilizationService, time: dict[str, datetime]
+):
+    window = TimeRange(start=time[AN_HOUR_AGO], end=time[IN_THREE_HOURS])
+    with pytest.raises(UserPermissionException):
+        utilization_svc.hourly(user_data.ambassador, window)
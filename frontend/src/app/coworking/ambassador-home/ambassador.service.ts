@@ -4,9 +4,17 @@ import { Observable, map } from 'rxjs';
 import {
   Reservation,
   ReservationJSON,
-  parseReservationJSON
+  TimeRangeJSON,
+  parseReservationJSON,
+  parseTimeRange
 } from '../coworking.models';
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpParams } from '@angular/common/http';
+
+interface ReservationPageJSON {
+  items: ReservationJSON[];
+  window: TimeRangeJSON;
+  next_cursor: string | null;
+}
 
 @Injectable({ providedIn: 'root' })
 export class AmbassadorService {
@@ -15,11 +23,27 @@ export class AmbassadorService {
 
   constructor(private http: HttpClient) {}
 
+  /** Loads the reservations of the next hour, followed by any later pages. */
   fetchReservations(): void {
+    this.fetchPage(new HttpParams(), []);
+  }
+
+  private fetchPage(params: HttpParams, loaded: Reservation[]): void {
     this.http
-      .get<ReservationJSON[]>('/api/coworking/ambassador')
-      .subscribe((reservations) => {
-        this.reservations.set(reservations.map(parseReservationJSON));
+      .get<ReservationPageJSON>('/api/coworking/ambassador', { params })
+      .subscribe((page) => {
+        const reservations = loaded.concat(
+          page.items.map(parseReservationJSON)
+        );
+        this.reservations.set(reservations);
+        if (page.next_cursor !== null) {
+          const window = parseTimeRange(page.window);
+          const next = new HttpParams()
+            .set('start', window.start.toISOString())
+            .set('end', window.end.toISOString())
+            .set('cursor', page.next_cursor);
+          this.fetchPage(next, reservations);
+        }
       });
   }
 